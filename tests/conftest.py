@@ -0,0 +1,6 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path_factory, monkeypatch):
+    """Points the CLIs run by the tests at a throwaway result cache instead of the developer's."""
+    monkeypatch.setenv("TESTFORGE_CACHE", str(tmp_path_factory.mktemp("cache") / "validation_cache.sqlite"))
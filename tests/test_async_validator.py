@@ -0,0 +1,74 @@
+import asyncio
+import gzip
+
+from utils.core.async_validator import RecordSplitter, validate_stream
+from utils.core.validator import ValidationProgress, compile_schema, iter_validation_errors
+
+SCHEMA = {"columns": [
+    {"name": "id", "type": "int", "constraints": {"unique": True}},
+    {"name": "note", "type": "str"},
+]}
+CSV = b'id,note\n1,"two\nlines"\n\n2,""\nx,"a ""quoted"" value"\n1,last'
+
+async def chunked(data, size):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+def run(data, size=3, **kwargs):
+    return asyncio.run(validate_stream(chunked(data, size), compile_schema(SCHEMA), **kwargs))
+
+def test_record_splitter_keeps_quoted_line_breaks():
+    splitter = RecordSplitter()
+    parts = [splitter.feed(CSV[i:i + 2]) for i in range(0, len(CSV), 2)] + [splitter.flush()]
+    records = b"".join(parts)
+    assert records == CSV
+    assert all(part.endswith(b"\n") for part in parts[:-1] if part)
+    assert not any(part.startswith(b"lines") for part in parts)
+
+def test_matches_file_validation(tmp_path):
+    csv_path = tmp_path / "upload.csv"
+    csv_path.write_bytes(CSV)
+    expected = list(iter_validation_errors(csv_path, SCHEMA))
+    progress = ValidationProgress()
+
+    assert [issue.code for issue in expected] == ["empty_string", "type", "unique"]
+    for size in (1, 3, 64):
+        assert run(CSV, size) == expected
+    assert run(CSV, block_size=1, progress=progress) == expected
+    assert (progress.rows, progress.bytes_read) == (4, len(CSV))
+
+def test_offload_and_compressed_stream():
+    expected = run(CSV)
+    assert run(gzip.compress(CSV), 5) == expected
+    assert run(CSV, offload=True, block_size=1) == expected
+
+def test_max_errors_truncates(tmp_path):
+    csv_path = tmp_path / "upload.csv"
+    csv_path.write_bytes(CSV)
+    progress = ValidationProgress()
+    issues = run(CSV, max_errors=1, progress=progress, block_size=1)
+    assert [issue.code for issue in issues] == ["empty_string"]
+    assert (progress.rows, progress.bytes_read, progress.truncated) == (2, CSV.index(b"x,"), True)
+
+    for max_errors in (1, 2, 3):
+        expected = ValidationProgress()
+        list(iter_validation_errors(csv_path, SCHEMA, max_errors=max_errors, progress=expected))
+        for size, block_size, offload in ((1, 1, False), (3, 64, True), (64, 1 << 20, False)):
+            progress = ValidationProgress()
+            run(CSV, size, max_errors=max_errors, progress=progress, block_size=block_size, offload=offload)
+            assert (progress.rows, progress.bytes_read, progress.truncated) == (
+                expected.rows, expected.bytes_read, expected.truncated)
+    # The last error is on the last row: nothing was left unchecked.
+    assert not expected.truncated
+
+def test_empty_stream_and_bad_schema():
+    assert run(b"")[0].code == "header_mismatch"
+    issues = asyncio.run(validate_stream(chunked(CSV, 3), {"nope": []}))
+    assert [issue.code for issue in issues] == ["schema"]
+
+def test_cr_only_line_endings():
+    data = CSV.replace(b"\n", b"\r")
+    splitter = RecordSplitter()
+    assert splitter.feed(data[:9]) == b"id,note\r"
+    assert splitter.newline == b"\r"
+    assert run(data, 4) == run(CSV)
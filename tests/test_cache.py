@@ -0,0 +1,141 @@
+import json
+import os
+from utils.core import cache as cache_module
+from utils.core.cache import ValidationCache
+from utils.core.validator import compile_schema, iter_validation_errors, ValidationIssue
+from utils.devtools.batch_tests import batch_runner
+
+SCHEMA = {"columns": [{"name": "age", "type": "int", "constraints": {"max": 120}}]}
+
+def _run(cache, csv_path, plan):
+    calls = []
+
+    def run():
+        calls.append(csv_path)
+        return iter_validation_errors(csv_path, plan)
+
+    issues, hit = cache.cached_issues(csv_path, plan, run)
+    return list(issues), hit, len(calls)
+
+def test_cache_replays_unchanged_file(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("age\n30\n150\nabc\n")
+    plan = compile_schema(SCHEMA)
+
+    with ValidationCache(tmp_path / "cache.sqlite") as cache:
+        first, hit, calls = _run(cache, csv_path, plan)
+        assert not hit and calls == 1
+        second, hit, calls = _run(cache, csv_path, plan)
+
+    assert hit and calls == 0
+    assert second == first
+    assert all(isinstance(issue, ValidationIssue) for issue in second)
+    assert [issue.message for issue in second] == [
+        "Row 2: Field 'age' above max 120",
+        "Row 3: Field 'age' expected int but got 'abc'",
+    ]
+
+def test_cache_misses_on_changed_file_or_schema(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("age\n30\n")
+    plan = compile_schema(SCHEMA)
+
+    with ValidationCache(tmp_path / "cache.sqlite") as cache:
+        _run(cache, csv_path, plan)
+
+        csv_path.write_text("age\n300\n")
+        os.utime(csv_path, ns=(0, 1))
+        issues, hit, _ = _run(cache, csv_path, plan)
+        assert not hit
+        assert [issue.code for issue in issues] == ["max"]
+
+        other = compile_schema({"columns": [{"name": "age", "type": "int"}]})
+        issues, hit, _ = _run(cache, csv_path, other)
+        assert not hit and issues == []
+
+def test_cache_misses_after_validator_change(tmp_path, monkeypatch):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("age\n30\n")
+    plan = compile_schema(SCHEMA)
+
+    with ValidationCache(tmp_path / "cache.sqlite") as cache:
+        _run(cache, csv_path, plan)
+        monkeypatch.setattr(cache_module, "CACHE_VERSION", "1.0.0+changed")
+        assert not _run(cache, csv_path, plan)[1]
+
+def test_cache_hits_on_identical_content_elsewhere(tmp_path):
+    plan = compile_schema(SCHEMA)
+    first = tmp_path / "a.csv"
+    copy = tmp_path / "b.csv"
+    first.write_text("age\n30\n")
+    copy.write_text("age\n30\n")
+
+    with ValidationCache(tmp_path / "cache.sqlite") as cache:
+        _run(cache, first, plan)
+        _, hit, _ = _run(cache, copy, plan)
+    assert hit
+
+def test_cache_skips_partially_consumed_runs(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("age\nx\ny\n")
+    plan = compile_schema(SCHEMA)
+
+    with ValidationCache(tmp_path / "cache.sqlite") as cache:
+        issues, _ = cache.cached_issues(csv_path, plan, lambda: iter_validation_errors(csv_path, plan))
+        next(issues)
+        issues.close()
+        _, hit, _ = _run(cache, csv_path, plan)
+    assert not hit
+
+def test_cache_skips_runs_with_too_many_issues(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("age\nx\ny\nz\n")
+    plan = compile_schema(SCHEMA)
+
+    with ValidationCache(tmp_path / "cache.sqlite", max_issues=2) as cache:
+        issues, hit, _ = _run(cache, csv_path, plan)
+        assert len(issues) == 3 and not hit
+        assert not _run(cache, csv_path, plan)[1]
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    plan = compile_schema(SCHEMA)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"data{i}.csv"
+        path.write_text("age\n" + "\n".join(f"x{i}{n}" for n in range(200)) + "\n")
+        paths.append(path)
+
+    with ValidationCache(tmp_path / "cache.sqlite") as cache:
+        _run(cache, paths[0], plan)
+        size = cache._db.execute("SELECT nbytes FROM results").fetchone()[0]
+        cache.max_bytes = size * 2 + size // 2
+        _run(cache, paths[1], plan)
+        _run(cache, paths[0], plan)  # hit, so paths[1] is now least recently used
+        _run(cache, paths[2], plan)
+
+        assert _run(cache, paths[0], plan)[1]
+        assert _run(cache, paths[2], plan)[1]
+        assert not _run(cache, paths[1], plan)[1]
+
+def test_validate_batch_uses_cache(tmp_path, monkeypatch):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps(SCHEMA))
+    csv_dir = tmp_path / "csvs"
+    output_dir = tmp_path / "output"
+    csv_dir.mkdir()
+    output_dir.mkdir()
+    (csv_dir / "good.csv").write_text("age\n30\n")
+    (csv_dir / "bad.csv").write_text("age\n300\n")
+    cache_path = tmp_path / "cache.sqlite"
+
+    first = batch_runner.validate_batch(csv_dir, schema_path, output_dir, cache_path=cache_path)
+    (output_dir / "bad_validation.log").unlink()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached file was validated again")
+
+    monkeypatch.setattr(batch_runner, "iter_validation_errors", fail)
+    second = batch_runner.validate_batch(csv_dir, schema_path, output_dir, cache_path=cache_path)
+
+    assert second == first
+    assert "above max 120" in (output_dir / "bad_validation.log").read_text()
@@ -0,0 +1,56 @@
+from utils.core.checkpoint import Checkpoint, iter_appended_issues
+from utils.core.validator import ValidationProgress, compile_schema, iter_validation_errors
+
+PLAN = compile_schema({"columns": [{"name": "id", "type": "int"}, {"name": "name", "type": "str"}]})
+
+def clean_run(csv_path):
+    progress = ValidationProgress()
+    assert list(iter_validation_errors(csv_path, PLAN, progress=progress)) == []
+    return Checkpoint.create(csv_path, PLAN, progress)
+
+def test_resumes_after_checkpoint(tmp_path):
+    csv_path = tmp_path / "feed.csv"
+    csv_path.write_text("id,name\n1,a\n2,b\n")
+    clean_run(csv_path).save(csv_path)
+
+    with open(csv_path, "a") as f:
+        f.write("x,c\n4,\n")
+    checkpoint = Checkpoint.load(csv_path)
+    progress = ValidationProgress()
+
+    assert checkpoint.mismatch(csv_path, PLAN) is None
+    issues = list(iter_appended_issues(csv_path, PLAN, checkpoint, progress=progress))
+    assert issues == list(iter_validation_errors(csv_path, PLAN))
+    assert [issue.row for issue in issues] == [3, 4]
+    assert (progress.rows, progress.bytes_read) == (4, csv_path.stat().st_size)
+
+def test_checkpoint_mismatches(tmp_path):
+    csv_path = tmp_path / "feed.csv"
+    csv_path.write_text("id,name\n1,a\n2,b\n")
+    checkpoint = clean_run(csv_path)
+
+    other_plan = compile_schema({"columns": [{"name": "id", "type": "int"}]})
+    assert checkpoint.mismatch(csv_path, other_plan) == "schema changed"
+    csv_path.write_text("id,name\n1,a\n")
+    assert checkpoint.mismatch(csv_path, PLAN) == "file shrank"
+    csv_path.write_text("id,label\n1,a\n2,b\n")
+    assert checkpoint.mismatch(csv_path, PLAN) == "header changed"
+    csv_path.write_text("id,name\n7,a\n2,b\n3,c\n")
+    assert checkpoint.mismatch(csv_path, PLAN) == "validated rows changed"
+
+def test_checkpoint_catches_edit_in_middle_of_large_prefix(tmp_path):
+    csv_path = tmp_path / "feed.csv"
+    csv_path.write_text("id,name\n" + "".join(f"{i},a\n" for i in range(400_000)))
+    checkpoint = clean_run(csv_path)
+
+    data = bytearray(csv_path.read_bytes())
+    middle = data.index(b"\n200000,a\n") + 1
+    data[middle] = ord("x")
+    csv_path.write_bytes(data)
+    assert checkpoint.mismatch(csv_path, PLAN) == "validated rows changed"
+
+def test_no_checkpoint_for_unfinished_last_line(tmp_path):
+    csv_path = tmp_path / "feed.csv"
+    csv_path.write_text("id,name\n1,a\n2,b")
+
+    assert clean_run(csv_path) is None
@@ -1,6 +1,9 @@
 import csv
-from pathlib import Path
-from utils.devtools.generators import csv_generator
+import json
+import re
+import pytest
+from utils.core.validator import validate_csv
+from utils.devtools.generators import csv_generator, values
 
 def test_generate_csv(tmp_path):
     # Create a fake template CSV with common headers
@@ -22,4 +25,119 @@ def test_generate_csv(tmp_path):
         assert reader[0] == headers             # Header row
         assert len(reader) == 6                 # 1 header + 5 rows
         for row in reader[1:]:
-            assert len(row) == len(headers)     # Each row has all fields
\ No newline at end of file
+            assert len(row) == len(headers)     # Each row has all fields
+
+SCHEMA = {
+    "columns": [
+        {"name": "age", "type": "int", "constraints": {"min": 18, "max": 99}},
+        {"name": "price", "type": "float", "constraints": {"min": 0.5, "max": 2}},
+        {"name": "email", "type": "str", "constraints": {"regex": r"^[\w\.-]+@[\w\.-]+\.\w{2,}$"}},
+        {"name": "sku", "type": "str", "constraints": {"regex": r"^(AB|C\d)-[0-9]{3,5}x?$"}},
+        {"name": "color", "type": "str", "constraints": {"enum": ["red", "blue", "green"]}},
+        {"name": "note", "type": "str"},
+    ]
+}
+
+def test_generate_csv_from_schema_passes_validation(tmp_path):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps(SCHEMA))
+    output_path = tmp_path / "output.csv"
+
+    csv_generator.generate_csv(schema_path, output_path, rows=500, seed=7)
+
+    with open(output_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 500
+    assert {row["color"] for row in rows} == {"red", "blue", "green"}
+    assert all(18 <= int(row["age"]) <= 99 for row in rows)
+    assert validate_csv(output_path, schema_path) == []
+
+def test_generate_blocks_is_reproducible_and_block_sized():
+    first = list(csv_generator.generate_blocks(SCHEMA["columns"], 250, seed=3, block_rows=100))
+    second = list(csv_generator.generate_blocks(SCHEMA["columns"], 250, seed=3, block_rows=100))
+
+    assert [len(block) for block in first] == [100, 100, 50]
+    assert first == second
+    assert first != list(csv_generator.generate_blocks(SCHEMA["columns"], 250, seed=4, block_rows=100))
+
+def test_regex_generator_matches_pattern():
+    rng = values.BlockRandom(0)
+    for pattern in [r"\d{3}-\d{4}", r"(ab|c[^a-z])+x*", r"[A-F0-9]{8}", r"(?:foo|ba[rz])?\.\w+"]:
+        for value in values.regex_generator(pattern)(200, rng):
+            assert re.fullmatch(pattern, value), (pattern, value)
+
+def test_column_generator_rejects_impossible_columns():
+    for col in [
+        {"name": "n", "type": "int", "constraints": {"min": 5, "max": 4}},
+        {"name": "neg", "type": "int", "constraints": {"min": -5, "max": -1}},
+        {"name": "s", "type": "str", "constraints": {"regex": r"(a)\1"}},
+    ]:
+        with pytest.raises(ValueError, match=f"Field '{col['name']}'"):
+            values.column_generator(col)
+
+def test_generate_from_schema_generator_output(tmp_path):
+    schema_path = tmp_path / "inferred.json"
+    schema_path.write_text(json.dumps([{"name": "id", "type": "int"}, {"name": "mail", "type": "email"}]))
+    output_path = tmp_path / "output.csv"
+
+    csv_generator.generate_csv(schema_path, output_path, rows=3)
+
+    with open(output_path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id", "mail"]
+    assert all(row[0].isdigit() and "@" in row[1] for row in rows[1:])
+
+def test_sharded_output_does_not_depend_on_workers(tmp_path):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps(SCHEMA))
+
+    serial = csv_generator.generate_csv(schema_path, tmp_path / "serial.csv", 101, seed=5, shards=4, concat=True)
+    parallel = csv_generator.generate_csv(
+        schema_path, tmp_path / "parallel.csv", 101, seed=5, shards=4, workers=2, concat=True
+    )
+
+    assert serial[0].read_bytes() == parallel[0].read_bytes()
+    assert not list(tmp_path.glob("*.part*"))
+    with open(parallel[0], newline="") as f:
+        assert len(list(csv.reader(f))) == 102
+
+def test_shards_are_written_to_numbered_files(tmp_path):
+    template_path = tmp_path / "template.csv"
+    template_path.write_text("user_id,name\n")
+
+    paths = csv_generator.generate_csv(template_path, tmp_path / "out.csv", 10, seed=1, shards=3, workers=2)
+    again = csv_generator.generate_csv(template_path, tmp_path / "again.csv", 10, seed=1, shards=3)
+
+    assert [p.name for p in paths] == ["out-00000.csv", "out-00001.csv", "out-00002.csv"]
+    assert [p.read_text().count("\n") for p in paths] == [5, 4, 4]  # header + 4/3/3 rows
+    assert [p.read_bytes() for p in paths] == [p.read_bytes() for p in again]
+    assert csv_generator.shard_seed(1, 0) != csv_generator.shard_seed(1, 1)
+
+def test_parse_size():
+    assert csv_generator.parse_size("512") == 512
+    assert csv_generator.parse_size("10GB") == 10 * 1024**3
+    assert csv_generator.parse_size("1.5m") == 1536 * 1024
+    assert csv_generator.parse_size("2KiB") == 2048
+    with pytest.raises(ValueError):
+        csv_generator.parse_size("ten gigs")
+
+def test_size_budget_stops_at_row_boundary(tmp_path):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps(SCHEMA))
+    budget = 20000
+
+    single = csv_generator.generate_csv(schema_path, tmp_path / "single.csv", None, seed=2, size=budget)[0]
+    data = single.read_bytes()
+    assert budget - 200 < len(data) <= budget
+    assert data.endswith(b"\r\n")
+    assert validate_csv(single, schema_path) == []
+
+    serial = csv_generator.generate_csv(schema_path, tmp_path / "a.csv", None, seed=2, shards=3, concat=True, size=budget)
+    parallel = csv_generator.generate_csv(
+        schema_path, tmp_path / "b.csv", None, seed=2, shards=3, workers=2, concat=True, size=budget
+    )
+    assert serial[0].read_bytes() == parallel[0].read_bytes()
+    assert len(serial[0].read_bytes()) <= budget
+
+    capped = csv_generator.generate_csv(schema_path, tmp_path / "c.csv", 5, seed=2, size=budget)[0]
+    assert capped.read_bytes().count(b"\n") == 6
@@ -45,4 +45,69 @@ def test_csv_generator_missing_template():
         capture_output=True, text=True
     )
     assert result.returncode == 0
-    assert "❌ Template file not found" in result.stdout
\ No newline at end of file
+    assert "❌ Template file not found" in result.stdout
+
+def test_csv_generator_from_schema(tmp_path):
+    schema = tmp_path / "schema.json"
+    output = tmp_path / "out.csv"
+    schema.write_text('{"columns": [{"name": "age", "type": "int", "constraints": {"min": 18, "max": 20}}]}')
+
+    result = subprocess.run(
+        ["csv-generator", str(schema), str(output), "--rows", "5", "--seed", "1"],
+        capture_output=True, text=True
+    )
+
+    assert result.returncode == 0
+    with open(output, newline="") as f:
+        reader = list(csv.reader(f))
+    assert reader[0] == ["age"]
+    assert len(reader) == 6
+    assert all(row[0] in {"18", "19", "20"} for row in reader[1:])
+
+
+def test_csv_generator_shards(tmp_path):
+    template = tmp_path / "template.csv"
+    template.write_text("user_id,email\n")
+
+    result = subprocess.run(
+        ["csv-generator", str(template), str(tmp_path / "out.csv"), "--rows", "7",
+         "--shards", "2", "--workers", "2", "--seed", "3"],
+        capture_output=True, text=True
+    )
+
+    assert result.returncode == 0
+    assert "✅ Generated 2 CSV shards at:" in result.stdout
+    assert (tmp_path / "out-00000.csv").exists() and (tmp_path / "out-00001.csv").exists()
+
+
+def test_csv_generator_size_budget(tmp_path):
+    template = tmp_path / "template.csv"
+    output = tmp_path / "out.csv"
+    template.write_text("user_id,email\n")
+
+    result = subprocess.run(
+        ["csv-generator", str(template), str(output), "--size", "4KB"],
+        capture_output=True, text=True
+    )
+
+    assert result.returncode == 0
+    assert 3000 < output.stat().st_size <= 4096
+
+
+def test_csv_generator_to_stdout(tmp_path):
+    template = tmp_path / "template.csv"
+    template.write_text("user_id,email\n")
+
+    results = [
+        subprocess.run(
+            ["csv-generator", str(template), "-", "--rows", "9", "--seed", "4", "--shards", "3", "--concat", *extra],
+            capture_output=True, text=True
+        )
+        for extra in ([], ["--workers", "2"])
+    ]
+
+    assert results[0].stdout == results[1].stdout
+    rows = list(csv.reader(results[0].stdout.splitlines()))
+    assert rows[0] == ["user_id", "email"]
+    assert len(rows) == 10
+    assert "✅ Generated CSV on stdout with 9 rows." in results[0].stderr
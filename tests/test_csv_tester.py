@@ -1,5 +1,6 @@
 import json
 import csv
+import gzip
 from pathlib import Path
 from utils.devtools.batch_tests import batch_runner
 
@@ -42,4 +43,72 @@ def test_validate_batch(tmp_path):
     # === Assert results contain correct error counts ===
     result_dict = dict(results)
     assert result_dict["valid.csv"] == 0
-    assert result_dict["invalid.csv"] > 0
\ No newline at end of file
+    assert result_dict["invalid.csv"] > 0
+
+def test_validate_batch_jobs(tmp_path):
+    schema_path = tmp_path / "schema.json"
+    csv_dir = tmp_path / "csvs"
+    output_dir = tmp_path / "output"
+    csv_dir.mkdir()
+    output_dir.mkdir()
+
+    schema_path.write_text(json.dumps({"columns": [{"name": "id", "type": "int"}]}))
+    (csv_dir / "small.csv").write_text("id\n1\n")
+    (csv_dir / "large.csv").write_text("id\n" + "x\n" * 500)
+    (csv_dir / "medium.csv").write_text("id\n" + "2\ny\n" * 10)
+
+    serial = batch_runner.validate_batch(csv_dir, schema_path, output_dir)
+    parallel = batch_runner.validate_batch(csv_dir, schema_path, output_dir, jobs=2)
+
+    assert parallel == serial
+    assert dict(parallel) == {"small.csv": 0, "large.csv": 500, "medium.csv": 10}
+    assert (output_dir / "large_validation.log").exists()
+
+def test_validate_batch_picks_up_compressed_files(tmp_path):
+    schema_path = tmp_path / "schema.json"
+    csv_dir = tmp_path / "csvs"
+    output_dir = tmp_path / "output"
+    csv_dir.mkdir()
+    output_dir.mkdir()
+
+    schema_path.write_text(json.dumps({"columns": [{"name": "id", "type": "int"}]}))
+    with gzip.open(csv_dir / "drop.csv.gz", "wt") as f:
+        f.write("id\n1\nx\n")
+
+    results = batch_runner.validate_batch(csv_dir, schema_path, output_dir)
+
+    assert results == [("drop.csv.gz", 1)]
+    assert (output_dir / "drop_validation.log").exists()
+
+def test_validate_batch_report_format(tmp_path):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"columns": [{"name": "age", "type": "int"}]}))
+    csv_dir = tmp_path / "csvs"
+    csv_dir.mkdir()
+    (csv_dir / "people.csv").write_text("age\nold\n")
+
+    results = batch_runner.validate_batch(csv_dir, schema_path, tmp_path, jobs=2, report_format="jsonl")
+
+    assert results == [("people.csv", 1)]
+    record = json.loads((tmp_path / "people_validation.jsonl").read_text())
+    assert (record["row"], record["code"]) == (1, "type")
+
+def test_validate_batch_foreign_key(tmp_path):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"columns": [
+        {"name": "order_id", "type": "int"},
+        {"name": "customer_id", "type": "string",
+         "constraints": {"foreign_key": {"file": "customers.csv", "column": "id"}}},
+    ]}))
+    csv_dir = tmp_path / "csvs"
+    csv_dir.mkdir()
+    (csv_dir / "customers.csv").write_text("id,name\n1,Ann\n2,Bob\n")
+    (csv_dir / "orders_a.csv").write_text("order_id,customer_id\n10,1\n11,3\n12,2\n")
+    (csv_dir / "orders_b.csv").write_text("order_id,customer_id\n20,2\n21,\n")
+    (csv_dir / "orders_c.csv").write_text("order_id,customer_id\n30,4\n31,5\n")
+
+    results = batch_runner.validate_batch(csv_dir, schema_path, tmp_path, jobs=2)
+
+    assert sorted(results) == [("orders_a.csv", 1), ("orders_b.csv", 0), ("orders_c.csv", 2)]
+    log = (tmp_path / "orders_a_validation.log").read_text()
+    assert "Row 2: Field 'customer_id' has no match in column 'id' of customers.csv" in log
@@ -0,0 +1,53 @@
+import pickle
+import pytest
+from utils.core.keyindex import KeyIndex, KeySet
+
+class CollidingKey(str):
+    """A key whose hash collides with every other CollidingKey."""
+
+    def __hash__(self):
+        return 42
+
+def test_reports_first_row_of_duplicates():
+    index = KeyIndex(capacity=4)
+    first_rows = [index.add(f"k{i % 100}", i) for i in range(1, 1001)]
+
+    assert len(index) == 100
+    assert first_rows[:100] == [None] * 100
+    assert first_rows[100:] == [(i % 100) or 100 for i in range(101, 1001)]
+
+def test_hash_collisions_are_confirmed_on_the_keys():
+    index = KeyIndex()
+
+    assert index.add(CollidingKey("a"), 1) is None
+    assert index.add(CollidingKey("b"), 2) is None
+    assert index.add(CollidingKey("a"), 3) == 1
+    assert index.add(CollidingKey("b"), 4) == 2
+    assert len(index) == 2
+
+@pytest.mark.parametrize("key", ["", "ü", "\udcff", "x" * 10_000])
+def test_keys_round_trip(key):
+    index = KeyIndex()
+    assert index.add(key, 7) is None
+    assert index.add(key, 8) == 7
+
+def test_spills_to_disk_past_memory_limit(tmp_path):
+    with KeyIndex(memory_limit=64 * 1024, directory=tmp_path) as index:
+        for i in range(20_000):
+            assert index.add(f"key-{i}", i) is None
+        assert index.spilled
+        assert index.add("key-0", 20_000) == 0
+        assert index.add(CollidingKey("key-19999"), 20_001) is None
+        assert index.add("key-19999", 20_002) == 19_999
+        assert len(index) == 20_001
+
+def test_key_set_membership_and_pickling(tmp_path):
+    key_set = KeySet.build((str(i) for i in range(0, 1000, 2)), directory=tmp_path)
+
+    assert len(key_set) == 500
+    assert "10" in key_set and "11" not in key_set
+
+    copy = pickle.loads(pickle.dumps(key_set))
+    assert copy.path == key_set.path and copy.digest == key_set.digest
+    assert all((str(i) in copy) == (i % 2 == 0) for i in range(1000))
+    assert "x" not in KeySet.build([], directory=tmp_path)
@@ -1,3 +1,4 @@
+import gzip
 import subprocess
 from pathlib import Path
 import json
@@ -49,7 +50,8 @@ def test_valid_csv_validation(tmp_path):
     code, out, err = run_cli([
         "csv-validator",
         str(csv_path),
-        "--schema", str(schema_path)
+        "--schema", str(schema_path),
+        "--output", str(tmp_path)
     ])
 
     assert code == 0
@@ -76,7 +78,8 @@ def test_invalid_csv(tmp_path):
     code, out, err = run_cli([
         "csv-validator",
         str(csv_path),
-        "--schema", str(schema_path)
+        "--schema", str(schema_path),
+        "--output", str(tmp_path)
     ])
 
     assert code == 1, f"Expected CLI to fail due to invalid CSV, but got exit code {code}\nstdout:\n{out}\nstderr:\n{err}"
@@ -116,10 +119,101 @@ def test_markdown_and_html_report(tmp_path):
     schema_path.write_text(json.dumps(schema))
 
     result = subprocess.run(
-        ["csv-validator", str(csv_path), "--schema", str(schema_path), "--markdown", "--html"],
+        ["csv-validator", str(csv_path), "--schema", str(schema_path), "--output", str(tmp_path), "--markdown", "--html"],
         capture_output=True, text=True
     )
 
     assert result.returncode == 0
     assert "📝 Markdown report saved to:" in result.stdout
-    assert "🌐 HTML report saved to:" in result.stdout
\ No newline at end of file
+    assert "🌐 HTML report saved to:" in result.stdout
+
+def test_fail_fast_stops_at_first_error(tmp_path):
+    csv_path = tmp_path / "bad.csv"
+    schema_path = tmp_path / "schema.json"
+
+    csv_path.write_text("id\nabc\ndef\nghi\n")
+    schema_path.write_text(json.dumps({"columns": [{"name": "id", "type": "int"}]}))
+
+    code, out, err = run_cli([
+        "csv-validator", str(csv_path), "--schema", str(schema_path),
+        "--output", str(tmp_path), "--fail-fast"
+    ])
+
+    assert code == 1
+    assert "Found 1 error(s)" in out
+    assert "Stopped early after 1 row(s)" in out
+    log_content = next(tmp_path.glob("validation_*.log")).read_text()
+    assert "Row 1: Field 'id' expected int but got 'abc'" in log_content
+    assert "Row 2" not in log_content
+
+def test_validates_standard_input(tmp_path):
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"columns": [{"name": "age", "type": "int", "constraints": {"max": 99}}]}))
+    data = b"age\n30\n150\n"
+
+    for payload in (data, gzip.compress(data)):
+        result = subprocess.run(
+            ["csv-validator", "-", "--schema", str(schema_path), "--output", str(tmp_path), "--workers", "2"],
+            input=payload, capture_output=True
+        )
+        assert result.returncode == 1
+        log_path = Path(result.stdout.decode().split("Report written to: ")[1].split("\n")[0].strip())
+        assert "Row 2: Field 'age' above max 99" in log_path.read_text()
+
+def test_summary_report(tmp_path):
+    csv_path = tmp_path / "bad.csv"
+    schema_path = tmp_path / "schema.json"
+    csv_path.write_text("id\n" + "abc\n" * 200)
+    schema_path.write_text(json.dumps({"columns": [{"name": "id", "type": "int"}]}))
+
+    code, out, err = run_cli([
+        "csv-validator", str(csv_path), "--schema", str(schema_path), "--output", str(tmp_path), "--summary"
+    ])
+
+    assert code == 1
+    assert "Found 200 error(s)" in out
+    log_content = next(tmp_path.glob("validation_*.log")).read_text()
+    assert "[200] Row 1: Field 'id' expected int but got 'abc' (and 199 more, through row 200)" in log_content
+    assert "Row 2:" not in log_content
+
+def test_unique_constraint_with_workers_and_key_memory(tmp_path):
+    csv_path = tmp_path / "ids.csv"
+    schema_path = tmp_path / "schema.json"
+    csv_path.write_text("id\n" + "".join(f"{i}\n" for i in range(50_000)) + "17\n")
+    schema_path.write_text(json.dumps({"columns": [{"name": "id", "type": "int", "constraints": {"unique": True}}]}))
+
+    code, out, err = run_cli([
+        "csv-validator", str(csv_path), "--schema", str(schema_path), "--output", str(tmp_path),
+        "--workers", "2", "--key-memory", "1", "--no-cache"
+    ])
+
+    assert code == 1
+    assert "Found 1 error(s)" in out
+    log_content = next(tmp_path.glob("validation_*.log")).read_text()
+    assert "Row 50001: Field 'id' is a duplicate of row 18" in log_content
+
+def test_incremental_validation(tmp_path):
+    csv_path = tmp_path / "feed.csv"
+    schema_path = tmp_path / "schema.json"
+    csv_path.write_text("id\n1\n2\n")
+    schema_path.write_text(json.dumps({"columns": [{"name": "id", "type": "int"}]}))
+    args = ["csv-validator", str(csv_path), "--schema", str(schema_path), "--output", str(tmp_path), "--incremental"]
+
+    code, out, err = run_cli(args)
+    assert code == 0
+    assert "Checkpoint saved to:" in out
+    assert (tmp_path / "feed.csv.checkpoint.json").exists()
+
+    with open(csv_path, "a") as f:
+        f.write("x\n")
+    code, out, err = run_cli(args)
+    assert code == 1
+    assert "Resuming after row 2" in out
+    assert "Checkpoint saved to:" not in out
+    log_path = Path(out.split("Report written to: ")[1].split("\n")[0].strip())
+    assert "Row 3: Field 'id' expected int but got 'x'" in log_path.read_text()
+
+    csv_path.write_text("id\n5\n2\n3\n")
+    code, out, err = run_cli(args)
+    assert code == 0
+    assert "Validating the whole file: validated rows changed" in out
@@ -0,0 +1,98 @@
+import csv
+import json
+import subprocess
+from utils.core.parallel import iter_validation_errors_parallel, split_records
+from utils.core.validator import iter_validation_errors, ValidationProgress
+
+SCHEMA = {
+    "columns": [
+        {"name": "id", "type": "int", "constraints": {"min": 10}},
+        {"name": "note", "type": "str"},
+    ]
+}
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "note"])
+        writer.writerows(rows)
+
+def test_split_records_respects_quoted_newlines(tmp_path):
+    csv_path = tmp_path / "quoted.csv"
+    data = b'a\n"x\ny\nz"\n1\n"\n\n"\n2\n'
+    csv_path.write_bytes(data)
+
+    ranges = split_records(csv_path, 2, len(data), parts=6)
+
+    assert ranges[0][0] == 2 and ranges[-1][1] == len(data)
+    for start, end in ranges:
+        chunk = data[start:end]
+        assert chunk.endswith(b"\n")
+        assert chunk.count(b'"') % 2 == 0
+
+def test_parallel_matches_sequential(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    rows = [[str(i % 40), "multi\nline" if i % 7 == 0 else ("" if i % 5 == 0 else "ok")] for i in range(2000)]
+    write_csv(csv_path, rows)
+
+    sequential = list(iter_validation_errors(csv_path, SCHEMA))
+    progress = ValidationProgress()
+    parallel = list(iter_validation_errors_parallel(csv_path, SCHEMA, workers=2, progress=progress, min_chunk_size=1024))
+
+    assert parallel == sequential
+    assert progress.rows == 2000
+    assert progress.bytes_read == csv_path.stat().st_size
+
+def test_parallel_cr_only_line_endings(tmp_path):
+    csv_path = tmp_path / "mac.csv"
+    csv_path.write_bytes(b"id,note\r" + b"".join(b"%d,ok\r" % (i % 40) for i in range(2000)))
+
+    sequential = list(iter_validation_errors(csv_path, SCHEMA))
+    progress = ValidationProgress()
+    parallel = list(iter_validation_errors_parallel(csv_path, SCHEMA, workers=2, progress=progress, min_chunk_size=1024))
+
+    assert parallel == sequential
+    assert len(sequential) == 500
+    assert (progress.rows, progress.bytes_read) == (2000, csv_path.stat().st_size)
+
+def test_parallel_max_errors(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    write_csv(csv_path, [["1", "ok"]] * 5000)
+
+    progress = ValidationProgress()
+    issues = list(iter_validation_errors_parallel(csv_path, SCHEMA, workers=2, max_errors=3, progress=progress, min_chunk_size=1024))
+
+    assert [issue.row for issue in issues] == [1, 2, 3]
+    assert progress.truncated
+    assert progress.rows == 3
+
+def test_parallel_max_errors_progress_matches_sequential(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    write_csv(csv_path, [[str(i % 50), "ok"] for i in range(3000)])
+    # Trailing blank lines end up in a chunk of their own.
+    with open(csv_path, "a") as f:
+        f.write("\n" * 2000)
+
+    def run(validate, **kwargs):
+        progress = ValidationProgress()
+        issues = list(validate(csv_path, SCHEMA, max_errors=max_errors, progress=progress, **kwargs))
+        return issues, (progress.rows, progress.bytes_read, progress.truncated)
+
+    for max_errors in (1, 12, 299, 600, 601):
+        parallel = run(iter_validation_errors_parallel, workers=2, min_chunk_size=1024)
+        assert parallel == run(iter_validation_errors)
+    assert parallel[1][2] is False
+
+def test_cli_workers(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    schema_path = tmp_path / "schema.json"
+    write_csv(csv_path, [["42", "ok"], ["x", "ok"]])
+    schema_path.write_text(json.dumps(SCHEMA))
+
+    result = subprocess.run(
+        ["csv-validator", str(csv_path), "--schema", str(schema_path), "--output", str(tmp_path), "--workers", "2"],
+        capture_output=True, text=True
+    )
+
+    assert result.returncode == 1
+    assert "Found 1 error(s)" in result.stdout
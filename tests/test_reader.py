@@ -0,0 +1,94 @@
+import bz2
+import gzip
+import lzma
+import mmap
+import pytest
+from utils.core.reader import CountingLineReader, MappedLineReader, csv_stem, detect_compression, open_lines, read_rows
+from utils.core.validator import iter_validation_errors
+
+def test_mapped_reader_reads_byte_range(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    # Put the range past the first allocation granule to exercise offset mapping.
+    head = b"id\n" + b"1\n" * (mmap.ALLOCATIONGRANULARITY // 2 + 7)
+    csv_path.write_bytes(head + b"2\n3\n4\n")
+
+    reader = MappedLineReader(csv_path, start=len(head), end=len(head) + 4)
+    try:
+        assert list(reader) == ["2\n", "3\n"]
+        assert reader.bytes_read == 4
+    finally:
+        reader.close()
+
+def test_open_lines_matches_buffered_reader(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_bytes('name,note\r\n"Zoë","multi\r\nline"\r\n\r\nBob,ok\r\n'.encode())
+
+    with open_lines(csv_path) as lines:
+        header, rows = read_rows(lines)
+        mapped = (header, list(rows), lines.bytes_read)
+    with open(csv_path, "rb") as f:
+        lines = CountingLineReader(f)
+        header, rows = read_rows(lines)
+        buffered = (header, list(rows), lines.bytes_read)
+
+    assert mapped == buffered
+    assert mapped[1] == [["Zoë", "multi\r\nline"], ["Bob", "ok"]]
+    assert mapped[2] == csv_path.stat().st_size
+
+def test_open_lines_empty_file(tmp_path):
+    csv_path = tmp_path / "empty.csv"
+    csv_path.write_bytes(b"")
+
+    with open_lines(csv_path) as lines:
+        header, rows = read_rows(lines)
+        assert header is None
+        assert list(rows) == []
+        assert lines.bytes_read == 0
+
+@pytest.mark.parametrize("opener", [gzip.open, bz2.open, lzma.open])
+def test_open_lines_decompresses_by_magic_bytes(tmp_path, opener):
+    data = b"id,name\n1,Alice\n2,Bob\n"
+    # The suffix is deliberately misleading: detection uses the content.
+    csv_path = tmp_path / "data.csv"
+    with opener(csv_path, "wb") as f:
+        f.write(data)
+
+    assert detect_compression(csv_path) is not None
+    with open_lines(csv_path) as lines:
+        header, rows = read_rows(lines)
+        assert header == ["id", "name"]
+        assert list(rows) == [["1", "Alice"], ["2", "Bob"]]
+        assert lines.bytes_read == len(data)
+
+def test_compressed_file_validates_like_plain(tmp_path):
+    data = "id\n" + "".join(f"{i if i % 3 else 'x'}\n" for i in range(1, 5000))
+    plain = tmp_path / "plain.csv"
+    packed = tmp_path / "packed.csv.gz"
+    plain.write_text(data)
+    with gzip.open(packed, "wt") as f:
+        f.write(data)
+    schema = {"columns": [{"name": "id", "type": "int"}]}
+
+    assert list(iter_validation_errors(packed, schema)) == list(iter_validation_errors(plain, schema))
+
+def test_counting_reader_splits_lone_carriage_returns(tmp_path):
+    csv_path = tmp_path / "mac.csv"
+    csv_path.write_bytes(b'id,note\r1,"a\rb"\rx,\r')
+
+    with open(csv_path, "rb") as f:
+        lines = CountingLineReader(f)
+        header, rows = read_rows(lines)
+        assert header == ["id", "note"]
+        assert list(rows) == [["1", "a\rb"], ["x", ""]]
+        assert lines.bytes_read == csv_path.stat().st_size
+
+def test_cr_only_file_validates(tmp_path):
+    csv_path = tmp_path / "mac.csv"
+    csv_path.write_bytes(b"id\r1\rx\r")
+    schema = {"columns": [{"name": "id", "type": "int"}]}
+
+    assert [(issue.row, issue.code) for issue in iter_validation_errors(csv_path, schema)] == [(2, "type")]
+
+def test_csv_stem():
+    assert csv_stem("dir/data.csv.gz") == "data"
+    assert csv_stem("data.csv") == "data"
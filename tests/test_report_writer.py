@@ -1,5 +1,8 @@
+import json
 from pathlib import Path
+from xml.etree import ElementTree
 from utils.core import report as report_writer
+from utils.core.validator import ValidationIssue, ValidationProgress
 
 def test_write_validation_report(tmp_path):
     output_file = tmp_path / "test_report.log"
@@ -32,4 +35,135 @@ def test_generate_markdown_report():
 def test_generate_markdown_report_clean():
     md = report_writer.generate_markdown_report([])
 
-    assert "✅ No errors found." in md
\ No newline at end of file
+    assert "✅ No errors found." in md
+def test_write_validation_report_consumes_generator(tmp_path):
+    output_file = tmp_path / "streamed.log"
+    md_file = tmp_path / "streamed.md"
+    html_file = tmp_path / "streamed.html"
+    errors = (f"Row {i}: bad" for i in range(1, 4))
+
+    count = report_writer.write_validation_report(output_file, errors, markdown_file=md_file, html_file=html_file)
+
+    assert count == 3
+    assert "Row 3: bad" in output_file.read_text()
+    assert md_file.read_text() == report_writer.generate_markdown_report([f"Row {i}: bad" for i in range(1, 4)])
+    assert "<h2>Errors:</h2>\n<ul>\n<li>Row 1: bad</li>" in html_file.read_text()
+
+ISSUES = [
+    ValidationIssue(None, None, "header_mismatch", None, "Header mismatch: ['a'] vs ['b']"),
+    ValidationIssue(3, "name", "regex", 'x<&"y', "does not match pattern"),
+]
+
+def test_write_jsonl_report(tmp_path):
+    output_file = tmp_path / "report.jsonl"
+    progress = ValidationProgress()
+    progress.truncated = True
+
+    count = report_writer.write_validation_report(output_file, iter(ISSUES), progress, report_format="jsonl")
+
+    records = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert count == 2
+    assert records[1] == {
+        "row": 3, "column": "name", "code": "regex", "value": 'x<&"y',
+        "detail": "does not match pattern", "message": "Row 3: Field 'name' does not match pattern",
+    }
+    assert records[2]["code"] == "truncated"
+
+def test_write_junit_report(tmp_path):
+    output_file = tmp_path / "report.xml"
+
+    report_writer.write_validation_report(output_file, ISSUES + ["plain message"], report_format="junit", source="data.csv")
+
+    suite = ElementTree.parse(output_file).getroot().find("testsuite")
+    cases = suite.findall("testcase")
+    assert suite.get("name") == "data.csv"
+    assert [case.get("name") for case in cases] == ["header_mismatch", "row 3: regex", "error"]
+    assert cases[1].find("failure").get("message") == "Row 3: Field 'name' does not match pattern"
+
+    report_writer.write_validation_report(output_file, [], report_format="junit")
+    cases = ElementTree.parse(output_file).getroot().find("testsuite").findall("testcase")
+    assert len(cases) == 1 and cases[0].find("failure") is None
+
+def test_write_sarif_report(tmp_path):
+    output_file = tmp_path / "report.sarif"
+
+    count = report_writer.write_validation_report(output_file, ISSUES, report_format="sarif", source=Path("data.csv"))
+
+    run = json.loads(output_file.read_text())["runs"][0]
+    assert count == 2
+    assert run["tool"]["driver"]["name"] == "testforge"
+    assert [result["ruleId"] for result in run["results"]] == ["header_mismatch", "regex"]
+    assert run["results"][1]["locations"][0]["physicalLocation"] == {
+        "artifactLocation": {"uri": "data.csv"}, "region": {"startLine": 4}
+    }
+    assert run["properties"] == {"truncated": False}
+
+    report_writer.write_validation_report(output_file, [], report_format="sarif")
+    assert json.loads(output_file.read_text())["runs"][0]["results"] == []
+
+def test_summarize_groups_issues_by_column_and_check():
+    from utils.core.summary import HISTOGRAM_LIMIT, SAMPLE_SIZE, summarize
+
+    issues = [ValidationIssue(row, "age", "type", f"v{row % 20}", f"expected int but got 'v{row % 20}'")
+              for row in range(1, 1001)]
+    issues.insert(10, ValidationIssue(11, "name", "empty_string", "", "is an empty string"))
+    summary = summarize(issues)
+
+    age, name = summary
+    assert summary.total == 1001 and len(summary) == 2
+    assert (age.count, age.first_row, age.last_row) == (1000, 1, 1000)
+    assert len(age.samples) == SAMPLE_SIZE
+    assert len(age.histogram) == HISTOGRAM_LIMIT
+    assert sum(age.histogram.values()) + age.other == 1000
+    assert age.message == "Row 1: Field 'age' expected int but got 'v1' (and 999 more, through row 1000)"
+    assert name.message == "Row 11: Field 'name' is an empty string"
+
+def test_write_summary_reports(tmp_path):
+    issues = [ValidationIssue(row, "age", "type", "x", "expected int but got 'x'") for row in range(1, 501)]
+    output_file = tmp_path / "summary.log"
+
+    count = report_writer.write_validation_report(
+        output_file, iter(issues), markdown_file=tmp_path / "summary.md", summary=True
+    )
+
+    log = output_file.read_text()
+    assert count == 500
+    assert "[500] Row 1: Field 'age' expected int but got 'x' (and 499 more, through row 500)" in log
+    assert "values: 'x' ×500" in log
+    assert len(log.splitlines()) < 10
+    assert "| age | type | 500 | 1–500 |" in (tmp_path / "summary.md").read_text()
+
+    report_writer.write_validation_report(output_file, iter(issues), report_format="jsonl", summary=True)
+    groups = [json.loads(line) for line in output_file.read_text().splitlines()]
+    assert len(groups) == 1
+    assert groups[0]["count"] == 500 and groups[0]["histogram"] == {"x": 500}
+
+
+def test_write_all_report_formats_in_one_pass(tmp_path):
+    consumed = []
+
+    def errors():
+        for issue in ISSUES:
+            consumed.append(issue)
+            yield issue
+
+    paths = {name: tmp_path / f"report.{name}" for name in ("log", "md", "html", "jsonl")}
+    count = report_writer.write_validation_report(
+        paths["log"], errors(), markdown_file=paths["md"], html_file=paths["html"], json_file=paths["jsonl"]
+    )
+
+    assert count == 2 and consumed == ISSUES
+    assert "Row 3: Field 'name' does not match pattern" in paths["log"].read_text()
+    assert "- Row 3: Field 'name' does not match pattern" in paths["md"].read_text()
+    assert "<li>Header mismatch: ['a'] vs ['b']</li>" in paths["html"].read_text()
+    assert [json.loads(line)["code"] for line in paths["jsonl"].read_text().splitlines()] == ["header_mismatch", "regex"]
+
+def test_html_report_escapes_messages(tmp_path):
+    html_file = tmp_path / "report.html"
+    issue = ValidationIssue(1, "name", "enum", "<b>", "not in allowed values: ['<b>&']")
+
+    report_writer.write_validation_report(tmp_path / "report.log", [issue], html_file=html_file)
+
+    html = html_file.read_text()
+    assert "&lt;b&gt;&amp;" in html
+    assert "<b>" not in html
@@ -1,7 +1,9 @@
 import csv
+import json
 import subprocess
 from pathlib import Path
 from utils.core import schema as schema_generator
+from utils.core.validator import validate_csv
 
 def test_infer_schema_typing(tmp_path):
     csv_path = tmp_path / "mixed.csv"
@@ -80,11 +82,20 @@ def test_infer_schema_type_resolution_conflict(tmp_path):
         writer.writerow(["user@example.com"]) # email
         writer.writerow(["3"])                # int again
 
-    schema = schema_generator.infer_schema(csv_path)
+    # Only string holds every value; by majority, int appears twice and wins.
+    assert schema_generator.infer_schema(csv_path) == [{"name": "conflict", "type": "string"}]
+    assert schema_generator.infer_schema(csv_path, majority=True) == [{"name": "conflict", "type": "int"}]
 
-    # int appears twice, so it should win
-    expected = [{"name": "conflict", "type": "int"}]
-    assert schema == expected
+def test_infer_schema_widens_int_to_float(tmp_path):
+    csv_path = tmp_path / "amounts.csv"
+    csv_path.write_text("amount,contact\n1,a@x.com\n2,b@x.com\n3,c@x.com\n4.5,d@x.com\n5,e@x.com\n6,f@x.com\n")
+
+    schema = schema_generator.infer_schema(csv_path, sample_size=None)
+    assert schema == [{"name": "amount", "type": "float"}, {"name": "contact", "type": "email"}]
+
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"columns": schema}))
+    assert validate_csv(csv_path, schema_path) == []
 
 def test_schema_generator_fails_on_headerless_csv(tmp_path):
     csv_path = tmp_path / "broken.csv"
@@ -117,4 +128,202 @@ def test_cli_success(tmp_path):
 
     assert result.returncode == 0
     assert "🧬 Schema generated and saved to:" in result.stdout
-    assert out_path.exists()
\ No newline at end of file
+    assert out_path.exists()
+
+def test_infer_schema_full_scan_sees_whole_file(tmp_path):
+    csv_path = tmp_path / "sorted.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["code", "note"])
+        for i in range(10):
+            writer.writerow([str(i), "x"])
+        for i in range(50):
+            writer.writerow([f"A{i}", "y"])
+        writer.writerow(["1"])  # short row: missing cells count as empty
+
+    assert schema_generator.infer_schema(csv_path)[0]["type"] == "int"
+    full = schema_generator.infer_schema(csv_path, sample_size=None)
+    assert full == [{"name": "code", "type": "string"}, {"name": "note", "type": "string"}]
+
+    profile = schema_generator.profile_csv(csv_path)[0]
+    assert profile.type_counts == {"int": 11, "string": 50}
+    assert schema_generator.profile_csv(csv_path)[1].nulls == 1
+
+def test_infer_schema_examples_are_bounded_reservoir(tmp_path):
+    csv_path = tmp_path / "values.csv"
+    values = [f"v{i}" for i in range(1000)]
+    csv_path.write_text("value\n" + "\n".join(values) + "\n")
+
+    first = schema_generator.infer_schema(csv_path, sample_size=None, examples=5)
+    second = schema_generator.infer_schema(csv_path, sample_size=None, examples=5)
+
+    examples = first[0]["examples"]
+    assert len(examples) == 5
+    assert set(examples) <= set(values)
+    assert examples != values[:5]
+    assert first == second  # sampling is seeded, so output is reproducible
+
+def test_infer_type_matches_int_and_float_parsing():
+    for value in ["12", " 7 ", "-3", "1_000", "٣"]:
+        assert schema_generator.infer_type(value) == "int"
+    for value in ["1.5", "1e3", "inf", "-Infinity", " nan "]:
+        assert schema_generator.infer_type(value) == "float"
+    assert schema_generator.infer_type("information") == "string"
+    assert schema_generator.infer_type("a@b.c") == "email"
+
+def test_cli_full_scan(tmp_path):
+    csv_path = tmp_path / "template.csv"
+    out_path = tmp_path / "schema.json"
+    csv_path.write_text("id\n" + "\n".join(str(i) for i in range(20)) + "\nlate\nlater\n" * 20)
+
+    result = subprocess.run(
+        ["schema-generator", str(csv_path), str(out_path), "--full", "--examples", "2"],
+        capture_output=True, text=True
+    )
+
+    assert result.returncode == 0
+    schema = json.loads(out_path.read_text())
+    assert schema[0]["type"] == "string"
+    assert len(schema[0]["examples"]) == 2
+
+def _summary(profile):
+    summary = profile.to_dict()
+    summary.pop("examples")
+    return summary
+
+def test_profile_csv_parallel_matches_sequential(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "price", "note"])
+        for i in range(3000):
+            writer.writerow([i - 100, f"{i / 7:.3f}" if i % 5 else "", f"line {i % 40}\nsecond \"part\""])
+
+    sequential = schema_generator.profile_csv(csv_path, examples=4)
+    parallel = schema_generator.profile_csv_parallel(csv_path, workers=2, examples=4, min_chunk_size=4096)
+
+    assert [_summary(p) for p in parallel] == [_summary(p) for p in sequential]
+    assert all(len(p.samples) == 4 for p in parallel)
+    id_profile = parallel[0].to_dict()
+    assert (id_profile["min"], id_profile["max"]) == (-100, 2899)
+    assert abs(id_profile["distinct"] - 3000) < 300
+    assert parallel[1].nulls == 600
+    assert parallel[2].to_dict()["distinct"] == 40
+
+def test_distinct_sketch_estimates_and_merges():
+    left, right = schema_generator.DistinctSketch(), schema_generator.DistinctSketch()
+    for i in range(20000):
+        left.add(f"a{i}")
+        right.add(f"a{i + 10000}")
+    left.merge(right)
+    assert abs(left.estimate() - 30000) < 30000 * 0.2
+
+    small = schema_generator.DistinctSketch()
+    for value in ["x", "y", "x", "z"]:
+        small.add(value)
+    assert small.estimate() == 3
+
+def test_profile_round_trips_through_dict(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("n\n1\n5\n\n2.5\nabc\n")
+    profile = schema_generator.profile_csv(csv_path, examples=2)[0]
+
+    restored = schema_generator.ColumnProfile.from_dict(json.loads(json.dumps(profile.to_dict())))
+    restored.merge(profile)
+
+    assert restored.type_counts == {"int": 4, "float": 2, "string": 2}
+    assert (restored.min, restored.max, restored.max_length) == (1, 5, 3)
+    assert restored.distinct.estimate() == 4
+
+def test_cli_workers_and_profile(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    out_path = tmp_path / "schema.json"
+    csv_path.write_text("id,name\n" + "".join(f"{i},n{i}\n" for i in range(100)))
+
+    result = subprocess.run(
+        ["schema-generator", str(csv_path), str(out_path), "--workers", "2", "--profile"],
+        capture_output=True, text=True
+    )
+
+    assert result.returncode == 0
+    assert json.loads(out_path.read_text()) == [{"name": "id", "type": "int"}, {"name": "name", "type": "string"}]
+    profiles = json.loads((tmp_path / "schema.profile.json").read_text())
+    assert profiles[0]["max"] == 99 and profiles[1]["distinct"] == 100
+    assert "📊 Column profiles saved to:" in result.stdout
+
+def test_infer_constraints_from_profile(tmp_path):
+    csv_path = tmp_path / "feed.csv"
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["age", "price", "country", "sku", "name"])
+        for i in range(100):
+            writer.writerow([18 + i % 50, f"{i * 1.5:.1f}", ["US", "UK", "BG"][i % 3], f"AB-{i:04d}", f"Name{i}"])
+        writer.writerow(["", "", "", "", "lower"])
+
+    schema = schema_generator.infer_schema(csv_path, sample_size=None, constraints=True)
+    constraints = {column["name"]: column.get("constraints") for column in schema}
+
+    assert constraints["age"] == {"min": 18, "max": 67}
+    assert constraints["price"] == {"min": 0.0, "max": 148.5}
+    # Blank cells seen in the column stay allowed.
+    assert constraints["country"] == {"enum": ["BG", "UK", "US", ""]}
+    assert constraints["sku"] == {"regex": "^(?:[A-Z]{2}\\-[0-9]{4})?$"}
+    assert constraints["name"] is None  # two shapes and too many distinct values
+
+    # The inferred constraints accept the data they were inferred from, as inferred.
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"columns": schema}))
+    csv_path.write_text(csv_path.read_text().replace(",,,,lower\n", ""))
+    assert validate_csv(csv_path, schema_path) == []
+
+    # Text columns with blank cells round-trip too, blanks included.
+    csv_path = tmp_path / "tickets.csv"
+    csv_path.write_text("code,status\nAB-01,open\n,closed\nCD-02,open\nEF-03,\nGH-04,closed\n")
+    schema = schema_generator.infer_schema(csv_path, sample_size=None, constraints=True)
+    assert [column["constraints"] for column in schema] == [
+        {"regex": "^(?:[A-Z]{2}\\-[0-9]{2})?$"},
+        {"enum": ["closed", "open", ""]},
+    ]
+    schema_path.write_text(json.dumps({"columns": schema}))
+    assert validate_csv(csv_path, schema_path) == []
+
+def test_inferred_regex_is_enforced(tmp_path):
+    csv_path = tmp_path / "skus.csv"
+    csv_path.write_text("sku\n" + "".join(f"AB-{i:03d}\n" for i in range(50)))
+    schema = schema_generator.infer_schema(csv_path, sample_size=None, constraints=True)
+    assert schema == [{"name": "sku", "type": "string", "constraints": {"regex": "^[A-Z]{2}\\-[0-9]{3}$"}}]
+
+    schema_path = tmp_path / "schema.json"
+    schema_path.write_text(json.dumps({"columns": schema}))
+    csv_path.write_text("sku\nAB-123\nzzzzzz\n")
+    assert validate_csv(csv_path, schema_path) == ["Row 2: Field 'sku' does not match pattern"]
+
+def test_bounded_counters_give_up_and_merge(tmp_path):
+    many = schema_generator.ColumnProfile("v")
+    for i in range(schema_generator.ENUM_LIMIT + 1):
+        many.add(f"v{i}")
+    assert many.values is None
+    assert many.constraints() == {"regex": "^[a-z][0-9]{1,2}$"}
+
+    few = schema_generator.ColumnProfile("v")
+    for value in ["x", "x", "y", "y"]:
+        few.add(value)
+    other = schema_generator.ColumnProfile("v")
+    for value in ["z1", "z1", "z1"]:
+        other.add(value)
+    few.merge(other)
+    assert few.values == {"x": 2, "y": 2, "z1": 3}
+    assert few.constraints() == {"enum": ["x", "y", "z1"]}
+    few.merge(many)
+    assert few.values is None
+    assert few.constraints() == {}  # "a" and "a9" shapes
+
+def test_cli_reads_stdin_and_writes_stdout():
+    result = subprocess.run(
+        ["schema-generator", "-", "-", "--full"],
+        input="id,name\n1,Alice\n2,Bob\n", capture_output=True, text=True
+    )
+
+    assert result.returncode == 0
+    assert json.loads(result.stdout) == [{"name": "id", "type": "int"}, {"name": "name", "type": "string"}]
+    assert "🧬 Schema generated" in result.stderr
@@ -0,0 +1,85 @@
+import gzip
+import http.client
+import json
+import subprocess
+import threading
+import time
+import pytest
+from utils.core.server import SchemaRegistry, UnixHTTPConnection, make_server
+
+SCHEMA = {"columns": [
+    {"name": "id", "type": "int", "constraints": {"unique": True}},
+    {"name": "email", "type": "str", "constraints": {"regex": r"^[^@]+@[^@]+$"}},
+]}
+CSV = b"id,email\n1,a@x\n2,nope\n1,b@x\n"
+
+@pytest.fixture
+def server(tmp_path):
+    schema_path = tmp_path / "users.json"
+    schema_path.write_text(json.dumps(SCHEMA))
+    server = make_server(SchemaRegistry({"users": schema_path}), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def request(conn, method, path, body=None, **kwargs):
+    conn.request(method, path, body=body, **kwargs)
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+def connect(server):
+    return http.client.HTTPConnection(*server.server_address, timeout=10)
+
+def test_validate_request_body(server):
+    status, result = request(connect(server), "POST", "/validate?schema=users", CSV)
+
+    assert status == 200
+    assert result["schema"] == "users"
+    assert (result["valid"], result["error_count"], result["rows"], result["bytes"]) == (False, 2, 3, len(CSV))
+    assert [issue["message"] for issue in result["issues"]] == [
+        "Row 2: Field 'email' does not match pattern",
+        "Row 3: Field 'id' is a duplicate of row 1",
+    ]
+
+def test_validate_chunked_compressed_body(server):
+    data = gzip.compress(CSV)
+    chunks = (data[i:i + 7] for i in range(0, len(data), 7))
+
+    status, result = request(connect(server), "POST", "/validate?summary=1&max_errors=1", chunks,
+                             encode_chunked=True)
+
+    assert status == 200
+    assert result["truncated"] is True
+    assert [(group["code"], group["count"]) for group in result["groups"]] == [("regex", 1)]
+
+def test_errors_and_metadata(server):
+    assert request(connect(server), "POST", "/validate?schema=nope", CSV)[0] == 404
+    assert request(connect(server), "POST", "/validate?max_errors=0", CSV)[0] == 400
+    assert request(connect(server), "GET", "/missing")[0] == 404
+    status, health = request(connect(server), "GET", "/health")
+    assert status == 200 and health["status"] == "ok"
+    assert list(request(connect(server), "GET", "/schemas")[1]["schemas"]) == ["users"]
+
+def test_serve_command_on_unix_socket(tmp_path):
+    schema_path = tmp_path / "users.json"
+    schema_path.write_text(json.dumps(SCHEMA))
+    socket_path = tmp_path / "testforge.sock"
+    process = subprocess.Popen(
+        ["testforge", "serve", "--socket", str(socket_path), "--schema", f"users={schema_path}", "--workers", "2"],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    try:
+        assert "testforge serving 1 schema(s)" in process.stdout.readline()
+        deadline = time.monotonic() + 10
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        results = [request(UnixHTTPConnection(socket_path, timeout=10), "POST", "/validate", CSV) for _ in range(4)]
+
+        assert all(status == 200 and result["error_count"] == 2 for status, result in results)
+    finally:
+        process.terminate()
+        assert process.wait(timeout=10) == 0
+    assert not socket_path.exists()
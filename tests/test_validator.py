@@ -1,7 +1,8 @@
 import csv
 import json
 from pathlib import Path
-from utils.core.validator import validate_csv
+import pytest
+from utils.core.validator import validate_csv, compile_schema, iter_validation_errors, ValidationProgress
 
 def write_schema(path: Path, columns: list[dict]):
     path.write_text(json.dumps({"columns": columns}, indent=2))
@@ -108,4 +109,136 @@ def test_regex_validation_failure(tmp_path):
 
     schema_path.write_text(json.dumps({"columns": schema}))
     errors = validate_csv(csv_path, schema_path)
-    assert any("does not match pattern" in e for e in errors)
\ No newline at end of file
+    assert any("does not match pattern" in e for e in errors)
+
+def test_compile_schema_plan_reused_across_headers():
+    plan = compile_schema({"columns": [
+        {"name": "id", "type": "int", "constraints": {"min": 10}},
+        {"name": "color", "type": "str", "constraints": {"enum": ["red"]}},
+    ]})
+    assert plan.expected_fields == ["id", "color"]
+
+    check = plan.row_checker(["color", "id"])
+    assert check(["red", "42"], 1) == []
+    assert [str(issue) for issue in check(["blue", "5"], 2)] == [
+        "Row 2: Field 'id' below min 10",
+        "Row 2: Field 'color' not in allowed values: ['red']",
+    ]
+
+    # Missing columns and short rows are checked as empty strings.
+    check = plan.row_checker(["id"])
+    assert [str(issue) for issue in check([], 3)] == [
+        "Row 3: Field 'id' expected int but got ''",
+        "Row 3: Field 'color' is an empty string",
+        "Row 3: Field 'color' not in allowed values: ['red']",
+    ]
+
+def test_compile_schema_missing_columns():
+    with pytest.raises(ValueError, match="missing 'columns'"):
+        compile_schema({"oops": []})
+
+def test_invalid_regex_reported_once(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    schema_path = tmp_path / "schema.json"
+
+    csv_path.write_text("code\nabc\ndef\nghi\n")
+    write_schema(schema_path, [{"name": "code", "type": "str", "constraints": {"regex": "^[a-z"}}])
+
+    errors = validate_csv(csv_path, schema_path)
+    assert len(errors) == 1
+    assert "Field 'code' has an invalid regex" in errors[0]
+
+def test_max_errors_stops_early_and_reports_progress(tmp_path):
+    csv_path = tmp_path / "bad.csv"
+    schema_path = tmp_path / "schema.json"
+
+    csv_path.write_text("id\n1\nx\ny\nz\n")
+    write_schema(schema_path, [{"name": "id", "type": "int"}])
+
+    progress = ValidationProgress()
+    errors = validate_csv(csv_path, schema_path, max_errors=2, progress=progress)
+    assert errors == [
+        "Row 2: Field 'id' expected int but got 'x'",
+        "Row 3: Field 'id' expected int but got 'y'",
+    ]
+    assert progress.truncated
+    assert progress.rows == 3
+    assert progress.bytes_read == len("id\n1\nx\ny\n")
+
+def test_max_errors_not_reached(tmp_path):
+    csv_path = tmp_path / "ok.csv"
+    schema_path = tmp_path / "schema.json"
+
+    csv_path.write_text("id\n1\nx\n")
+    write_schema(schema_path, [{"name": "id", "type": "int"}])
+
+    progress = ValidationProgress()
+    errors = validate_csv(csv_path, schema_path, max_errors=5, progress=progress)
+    assert len(errors) == 1
+    assert not progress.truncated
+    assert progress.rows == 2
+    assert progress.bytes_read == csv_path.stat().st_size
+
+def test_iter_validation_errors_yields_structured_issues(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("id,color\nabc,red\n7,pink\n")
+    schema = {"columns": [
+        {"name": "id", "type": "int"},
+        {"name": "color", "type": "str", "constraints": {"enum": ["red"]}},
+    ]}
+
+    issues = iter_validation_errors(csv_path, schema)
+    assert not isinstance(issues, list)
+
+    first, second = list(issues)
+    assert (first.row, first.column, first.code, first.value) == (1, "id", "type", "abc")
+    assert str(first) == "Row 1: Field 'id' expected int but got 'abc'"
+    assert (second.row, second.column, second.code, second.value) == (2, "color", "enum", "pink")
+
+def test_iter_validation_errors_header_issues(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    csv_path.write_text("name\nAlice\n")
+
+    issues = list(iter_validation_errors(csv_path, {"columns": [{"name": "id", "type": "string"}]}))
+    assert [issue.code for issue in issues] == ["header_mismatch", "missing_field", "extra_field"]
+    assert all(issue.row is None for issue in issues)
+
+def test_unique_and_primary_key_constraints(tmp_path):
+    csv_path = tmp_path / "keys.csv"
+    csv_path.write_text("id,email\n1,a@x\n2,\n1,b@x\n,\n3,a@x\n1,\n")
+    schema = {"columns": [
+        {"name": "id", "type": "string", "constraints": {"primary_key": True}},
+        {"name": "email", "type": "string", "constraints": {"unique": True}},
+    ]}
+
+    messages = [issue.message for issue in iter_validation_errors(csv_path, schema)]
+
+    assert messages == [
+        "Row 3: Field 'id' is a duplicate of row 1",
+        "Row 4: Field 'id' is an empty primary key",
+        "Row 5: Field 'email' is a duplicate of row 1",
+        "Row 6: Field 'id' is a duplicate of row 1",
+    ]
+
+def test_unique_keys_are_not_shared_between_runs(tmp_path):
+    csv_path = tmp_path / "keys.csv"
+    csv_path.write_text("id\n1\n2\n")
+    plan = compile_schema({"columns": [{"name": "id", "type": "int", "constraints": {"unique": True}}]})
+
+    assert list(iter_validation_errors(csv_path, plan)) == []
+    assert list(iter_validation_errors(csv_path, plan)) == []
+
+def test_foreign_key_constraint(tmp_path):
+    (tmp_path / "customers.csv").write_text("id,name\n1,Ann\n2,Bob\n")
+    csv_path = tmp_path / "orders.csv"
+    csv_path.write_text("customer_id\n1\n7\n\n2\n")
+    schema = {"columns": [{"name": "customer_id", "type": "int",
+                           "constraints": {"foreign_key": {"file": "customers.csv", "column": "id"}}}]}
+
+    messages = [issue.message for issue in iter_validation_errors(csv_path, schema)]
+    assert messages == ["Row 2: Field 'customer_id' has no match in column 'id' of customers.csv"]
+
+    schema["columns"][0]["constraints"]["foreign_key"]["column"] = "email"
+    issues = list(iter_validation_errors(csv_path, schema))
+    assert [issue.code for issue in issues] == ["schema"]
+    assert "references missing column 'email'" in issues[0].message
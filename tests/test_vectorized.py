@@ -0,0 +1,87 @@
+import csv
+import json
+import subprocess
+import pytest
+from utils.core import vectorized
+from utils.core.validator import iter_validation_errors, ValidationProgress
+
+SCHEMA = {
+    "columns": [
+        {"name": "id", "type": "int", "constraints": {"min": 10, "max": 90}},
+        {"name": "price", "type": "float", "constraints": {"min": 0}},
+        {"name": "email", "type": "str", "constraints": {"regex": r"^[^@]+@[^@]+\.[^@]+$"}},
+        {"name": "color", "type": "str", "constraints": {"enum": ["red", "blue"]}},
+        {"name": "label", "type": "string", "constraints": {"min": "b"}},
+    ]
+}
+
+VALUES = ["", "  ", "5", "42", "150", "abc", "1.5", "-3", "a@b.co", "red", "blue", "x\ny", "nan"]
+
+def write_rows(path, count):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "price", "email", "color"])  # "label" missing
+        for i in range(count):
+            writer.writerow([VALUES[(i * k) % len(VALUES)] for k in (1, 3, 5, 7)][: 4 - (i % 9 == 0)])
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(vectorized, "BLOCK_ROWS", 16)
+
+def test_vectorized_matches_standard(tmp_path, small_blocks):
+    pytest.importorskip("numpy")
+    csv_path = tmp_path / "data.csv"
+    write_rows(csv_path, 200)
+
+    standard = list(iter_validation_errors(csv_path, SCHEMA))
+    fast = list(iter_validation_errors(csv_path, SCHEMA, engine="vectorized"))
+
+    assert fast == standard
+    assert len(standard) > 200
+
+def test_vectorized_max_errors(tmp_path, small_blocks):
+    pytest.importorskip("numpy")
+    csv_path = tmp_path / "data.csv"
+    write_rows(csv_path, 200)
+
+    expected_progress = ValidationProgress()
+    expected = list(iter_validation_errors(csv_path, SCHEMA, max_errors=25, progress=expected_progress))
+    progress = ValidationProgress()
+    issues = list(iter_validation_errors(csv_path, SCHEMA, max_errors=25, progress=progress, engine="vectorized"))
+
+    assert issues == expected
+    assert (progress.rows, progress.truncated) == (expected_progress.rows, True)
+
+def test_vectorized_falls_back_without_numpy(tmp_path, monkeypatch):
+    monkeypatch.setattr(vectorized, "np", None)
+    csv_path = tmp_path / "data.csv"
+    write_rows(csv_path, 20)
+
+    assert not vectorized.vectorized_available()
+    assert list(iter_validation_errors(csv_path, SCHEMA, engine="vectorized")) == list(iter_validation_errors(csv_path, SCHEMA))
+
+def test_cli_engine_flag(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    schema_path = tmp_path / "schema.json"
+    csv_path.write_text("id,price,email,color,label\n42,1.5,a@b.co,red,zed\n")
+    schema_path.write_text(json.dumps(SCHEMA))
+
+    result = subprocess.run(
+        ["csv-validator", str(csv_path), "--schema", str(schema_path), "--output", str(tmp_path), "--engine", "vectorized"],
+        capture_output=True, text=True
+    )
+
+    assert result.returncode == 0
+    assert "✅ CSV is valid!" in result.stdout
+
+def test_vectorized_unique_matches_standard(tmp_path, small_blocks):
+    pytest.importorskip("numpy")
+    csv_path = tmp_path / "data.csv"
+    write_rows(csv_path, 200)
+    schema = {"columns": [dict(col, constraints={**col.get("constraints", {}), "unique": True})
+                          for col in SCHEMA["columns"]]}
+
+    standard = list(iter_validation_errors(csv_path, schema))
+
+    assert list(iter_validation_errors(csv_path, schema, engine="vectorized")) == standard
+    assert any(issue.code == "unique" for issue in standard)
@@ -6,9 +6,13 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
-from utils.core.validator import validate_csv
-from utils.core.report import write_validation_report
-from utils.core.report import generate_markdown_report
+from utils.core.cache import CACHE_ENV, CACHE_PATH, ValidationCache
+from utils.core.checkpoint import CHECKPOINT_SUFFIX, Checkpoint, iter_appended_issues
+from utils.core.validator import iter_validation_errors, load_schema, prepare_plan, ValidationProgress
+from utils.core.parallel import iter_validation_errors_parallel
+from utils.core.reader import is_stdio
+from utils.core.report import REPORT_FORMATS, report_suffix, write_validation_report
+from utils.core.vectorized import vectorized_available
 
 VERSION = "1.0.0"
 
@@ -16,14 +20,32 @@ def parse_args():
     parser = argparse.ArgumentParser(
         description="🧪 Validate a CSV file against a JSON schema with support for constraints, Markdown, and HTML reporting."
     )
-    parser.add_argument("csv_file", type=Path, help="Path to the CSV file to validate.")
+    parser.add_argument("csv_file", type=Path, help="Path to the CSV file to validate, or - for standard input.")
     parser.add_argument("--schema", type=Path, default=Path(__file__).resolve().parent.parent / "schema_definition.json",
                         help="Path to the schema JSON file (default: schema_definition.json).")
     parser.add_argument("--output", type=Path, default=Path(__file__).resolve().parent.parent / "reports" / "validation_logs",
                         help="Directory to save the validation log (default: reports/validation_logs/).")
+    parser.add_argument("--format", choices=list(REPORT_FORMATS), default="text", dest="report_format",
+                        help="Report format: plaintext log, JSON Lines, JUnit XML or SARIF (default: text).")
+    parser.add_argument("--summary", action="store_true",
+                        help="Group errors by column and check, with counts, row spans and common values, instead of one line per error.")
     parser.add_argument("--markdown", action="store_true", help="Also generate a Markdown (.md) version of the validation report.")
     parser.add_argument("--html", action="store_true", help="Also generate an HTML (.html) version of the validation report.")
-    parser.add_argument("--fail-fast", action="store_true", help="(Placeholder) Stop at first validation error (not yet implemented).")
+    parser.add_argument("--json", action="store_true", help="Also generate a JSON Lines (.jsonl) version of the validation report.")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop at the first validation error (same as --max-errors 1).")
+    parser.add_argument("--max-errors", type=int, default=None, metavar="N",
+                        help="Stop validating after N errors.")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Validate chunks of the file in N parallel processes (default: 1).")
+    parser.add_argument("--engine", choices=["standard", "vectorized"], default="standard",
+                        help="Validation engine; 'vectorized' needs NumPy (default: standard).")
+    parser.add_argument("--key-memory", type=int, default=None, metavar="MB",
+                        help="Memory for unique/primary_key indexes before they spill to temporary files (default: no limit).")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"Only validate rows appended since the last clean run, tracked in a {CHECKPOINT_SUFFIX} file next to the CSV. "
+                             "The already-validated bytes are hashed in full; any change to them validates the whole file again.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Always validate, ignoring and not updating the result cache ({CACHE_PATH.name}, or ${CACHE_ENV}).")
     parser.add_argument("--version", action="version", version=f"%(prog)s {VERSION}")
     return parser.parse_args()
 
@@ -34,44 +56,92 @@ def main():
     schema_file = args.schema
     output_dir = args.output
 
-    if not csv_file.exists():
+    if not is_stdio(csv_file) and not csv_file.exists():
         print(f"❌ CSV file not found: {csv_file}")
         sys.exit(1)
     if not schema_file.exists():
         print(f"❌ Schema file not found: {schema_file}")
         sys.exit(1)
 
+    max_errors = 1 if args.fail_fast else args.max_errors
+    if max_errors is not None and max_errors < 1:
+        print("❌ --max-errors must be at least 1")
+        sys.exit(1)
+
+    if args.engine == "vectorized" and not vectorized_available():
+        print("⚠️ NumPy is not installed; using the standard engine.")
+
     print(f"🔍 Validating '{csv_file}' using schema '{schema_file}'...")
-    errors = validate_csv(csv_file, schema_file)
+    progress = ValidationProgress()
+    schema = load_schema(schema_file)
+    # A schema that does not compile is passed on as is and reported as an error.
+    try:
+        plan = prepare_plan(schema, csv_file)
+        if args.key_memory is not None:
+            plan.key_memory = args.key_memory * 1024 * 1024
+    except ValueError:
+        plan = None
+
+    def run():
+        source = schema if plan is None else plan
+        if args.workers > 1:
+            return iter_validation_errors_parallel(csv_file, source, args.workers, max_errors=max_errors,
+                                                   progress=progress, engine=args.engine)
+        return iter_validation_errors(csv_file, source, max_errors=max_errors, progress=progress, engine=args.engine)
+
+    incremental = args.incremental and plan is not None and not is_stdio(csv_file)
+    checkpoint = Checkpoint.load(csv_file) if incremental else None
+    if checkpoint is not None:
+        reason = checkpoint.mismatch(csv_file, plan)
+        if reason is not None:
+            print(f"🔁 Validating the whole file: {reason} since the last checkpoint.")
+            checkpoint = None
+
+    # Only complete runs of files are cached, so --max-errors/--fail-fast and
+    # standard input bypass the cache. Incremental runs need the row and byte
+    # counts of a real run for their checkpoint, so they bypass it too.
+    cache = None
+    if not args.no_cache and max_errors is None and not is_stdio(csv_file) and plan is not None and not incremental:
+        cache = ValidationCache()
+
+    if checkpoint is not None:
+        print(f"⏩ Resuming after row {checkpoint.rows}; validating only the rows appended since.")
+        issues = iter_appended_issues(csv_file, plan, checkpoint, max_errors, progress, args.engine)
+    elif cache is None:
+        issues = run()
+    else:
+        issues, hit = cache.cached_issues(csv_file, plan, run)
+        if hit:
+            print("♻️ File and schema unchanged since the last run; replaying the cached report.")
 
     timestamp = datetime.now().strftime("%Y-%m-%d_%H%M")
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_file = output_dir / f"validation_{timestamp}.log"
+    output_file = output_dir / f"validation_{timestamp}{report_suffix(args.report_format)}"
+    md_path = output_file.with_suffix(".md") if args.markdown else None
+    html_path = output_file.with_suffix(".html") if args.html else None
+    json_path = output_file.with_suffix(".jsonl") if args.json and args.report_format != "jsonl" else None
 
-    write_validation_report(output_file, errors)
+    error_count = write_validation_report(output_file, issues, progress, md_path, html_path,
+                                          args.report_format, csv_file, summary=args.summary, json_file=json_path)
+    if cache is not None:
+        cache.close()
     print(f"✅ Report written to: {output_file}")  # <-- test relies on this line
 
-    if args.markdown:
-        md_str = generate_markdown_report(errors)
-        md_path = output_file.with_suffix(".md")
-        with open(md_path, "w") as f:
-            f.write(md_str)
+    if md_path:
         print(f"📝 Markdown report saved to: {md_path}")
-
-    if args.html:
-        md_str = generate_markdown_report(errors)
-        html_path = output_file.with_suffix(".html")
-        html_str = (
-            "<html><head><title>Validation Report</title></head><body>\n"
-            + md_str.replace("\n", "<br>").replace("## ", "<h2>").replace("# ", "<h1>")
-            + "\n</body></html>"
-        )
-        with open(html_path, "w") as f:
-            f.write(html_str)
+    if html_path:
         print(f"🌐 HTML report saved to: {html_path}")
+    if json_path:
+        print(f"🧾 JSON report saved to: {json_path}")
+
+    # The checkpoint only advances past rows that validated cleanly.
+    if incremental and not error_count:
+        new_checkpoint = Checkpoint.create(csv_file, plan, progress)
+        if new_checkpoint is not None:
+            print(f"📍 Checkpoint saved to: {new_checkpoint.save(csv_file)}")
 
-    if errors:
-        print(f"❗ Found {len(errors)} error(s). See report: {output_file}")
+    if error_count:
+        print(f"❗ Found {error_count} error(s). See report: {output_file}")
         sys.exit(1)
     else:
         print("✅ CSV is valid!")
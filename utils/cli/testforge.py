@@ -0,0 +1,78 @@
+# MIT License
+# Copyright (c) 2025 Vlad
+
+import argparse
+import sys
+from pathlib import Path
+
+from utils.core.cache import TESTFORGE_VERSION
+from utils.core.server import SchemaRegistry, make_server, serve
+
+
+def _schema_arg(value: str) -> tuple[str, Path]:
+    name, sep, path = value.partition("=")
+    if not sep or not name or not path:
+        raise argparse.ArgumentTypeError(f"expected NAME=PATH, got '{value}'")
+    return name, Path(path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="testforge", description="🧪 testforge tools.")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {TESTFORGE_VERSION}")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser(
+        "serve",
+        help="Run a validation server that keeps schemas compiled in memory.",
+        description="🚀 Serve CSV validation over localhost HTTP or a Unix socket. "
+                    "POST a CSV to /validate?schema=NAME and get the result as JSON.",
+    )
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1).")
+    serve_parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on; 0 picks a free one (default: 8765).")
+    serve_parser.add_argument("--socket", type=Path, default=None, metavar="PATH",
+                              help="Listen on this Unix socket instead of TCP.")
+    serve_parser.add_argument("--schema", type=_schema_arg, action="append", default=[], metavar="NAME=PATH",
+                              help="Register a schema under NAME; repeatable.")
+    serve_parser.add_argument("--schema-dir", type=Path, default=None, metavar="DIR",
+                              help="Register every *.json schema in DIR under its file name.")
+    serve_parser.add_argument("--workers", type=int, default=1, metavar="N",
+                              help="Serve from N processes sharing the socket (default: 1).")
+    return parser.parse_args(argv)
+
+
+def run_serve(args) -> int:
+    registry = SchemaRegistry(dict(args.schema))
+    if args.schema_dir is not None:
+        if not args.schema_dir.is_dir():
+            print(f"❌ Schema directory not found: {args.schema_dir}")
+            return 1
+        registry.add_directory(args.schema_dir)
+    if not registry.paths:
+        print("❌ Register at least one schema with --schema NAME=PATH or --schema-dir DIR")
+        return 1
+    if args.workers < 1:
+        print("❌ --workers must be at least 1")
+        return 1
+
+    for name, error in registry.warm().items():
+        print(f"⚠️ {error}")
+
+    server = make_server(registry, args.host, args.port, args.socket)
+    if args.socket is not None:
+        address = f"unix:{args.socket}"
+    else:
+        host, port = server.server_address[:2]
+        address = f"http://{host}:{port}"
+    print(f"🚀 testforge serving {len(registry.paths)} schema(s) on {address} with {args.workers} worker(s)", flush=True)
+    serve(server, args.workers)
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == "serve":
+        sys.exit(run_serve(args))
+
+
+if __name__ == "__main__":
+    main()
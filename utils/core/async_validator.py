@@ -0,0 +1,317 @@
+# MIT License
+# Copyright (c) 2025 Vlad
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND...
+
+import asyncio
+import bz2
+import csv
+import io
+import lzma
+import zlib
+from pathlib import Path
+
+from utils.core.reader import ENCODING, _compression_of
+from utils.core.validator import ValidationIssue, ValidationProgress, _as_plan
+
+# Complete records are buffered up to this many bytes before they are checked.
+BLOCK_SIZE = 256 * 1024
+
+_DECOMPRESSORS = {
+    "gzip": lambda: zlib.decompressobj(wbits=16 + zlib.MAX_WBITS),
+    "bz2": bz2.BZ2Decompressor,
+    "xz": lzma.LZMADecompressor,
+}
+# Bytes needed to recognise every format in _DECOMPRESSORS.
+_MAGIC_SIZE = 6
+
+
+class RecordSplitter:
+    """
+    Cuts a CSV byte stream that arrives in arbitrary chunks into runs of
+    complete records.
+
+    A line break ends a record only when the number of quote characters
+    before it, counted from the last record boundary, is even, so quoted
+    fields with line breaks are never split. Each byte is scanned once,
+    however many chunks a long quoted field spans. Records end at ``\n``,
+    or at ``\r`` if the first line ends with a lone ``\r``.
+    """
+
+    def __init__(self):
+        self._buf = bytearray()
+        self._scanned = 0
+        self._odd = False
+        self.newline = None
+
+    def _detect_newline(self) -> bytes | None:
+        buf = self._buf
+        cr, lf = buf.find(b"\r"), buf.find(b"\n")
+        if cr == -1 or lf != -1 and lf < cr:
+            return b"\n" if lf != -1 else None
+        if cr + 1 == len(buf):
+            # Wait for the next byte: \r\n or a lone \r.
+            return None
+        return b"\n" if buf[cr + 1:cr + 2] == b"\n" else b"\r"
+
+    def feed(self, data: bytes) -> bytes:
+        """Adds ``data`` and returns the complete records buffered so far (possibly none)."""
+        buf = self._buf
+        buf += data
+        if self.newline is None:
+            self.newline = self._detect_newline()
+            if self.newline is None:
+                return b""
+        newline = self.newline
+        pos, odd, end = self._scanned, self._odd, 0
+        if not odd and buf.find(b'"', pos) == -1:
+            # No quotes to track: everything up to the last line break is complete.
+            end = buf.rfind(newline, pos) + 1
+            pos = len(buf)
+        else:
+            while True:
+                n = buf.find(newline, pos)
+                if n == -1:
+                    odd ^= bool(buf.count(b'"', pos) & 1)
+                    pos = len(buf)
+                    break
+                odd ^= bool(buf.count(b'"', pos, n) & 1)
+                if not odd:
+                    end = n + 1
+                pos = n + 1
+        records = bytes(buf[:end])
+        del buf[:end]
+        self._scanned = pos - end
+        self._odd = odd
+        return records
+
+    def flush(self) -> bytes:
+        """Returns what is left at the end of the stream: a last record without a line break, if any."""
+        rest = bytes(self._buf)
+        self._buf.clear()
+        self._scanned = 0
+        self._odd = False
+        return rest
+
+
+class _BlockChecker:
+    """
+    Checks blocks of complete records in stream order. Keeps the row count,
+    the error budget and the plan's per-run state (such as the index of a
+    ``unique`` column) from one block to the next.
+    """
+
+    def __init__(self, plan, max_errors: int | None, progress: ValidationProgress):
+        self.plan = plan
+        self.remaining = max_errors
+        self.progress = progress
+        self.check = None
+
+    @property
+    def done(self) -> bool:
+        return self.remaining == 0
+
+    def _limit(self, issues: list[ValidationIssue]) -> list[ValidationIssue]:
+        if self.remaining is None:
+            return issues
+        if len(issues) > self.remaining:
+            self.progress.truncated = True
+            issues = issues[:self.remaining]
+        self.remaining -= len(issues)
+        return issues
+
+    def _counted(self, lines):
+        # Counts the characters csv.reader has taken, to know where it stopped.
+        for line in lines:
+            self._chars += len(line)
+            yield line
+
+    def __call__(self, block: bytes) -> list[ValidationIssue]:
+        if self.done:
+            # Nothing of this block was checked: leave progress where it stopped.
+            return []
+        progress = self.progress
+        text = block.decode(ENCODING)
+        # Like a text file opened with newline='': lines end at \n, \r\n or \r.
+        lines = io.StringIO(text, newline="")
+        self._chars = 0
+        if self.remaining is not None:
+            lines = self._counted(lines)
+        reader = csv.reader(lines)
+        issues = []
+        stopped_at = None
+        if self.check is None:
+            header = next(reader, None)
+            issues += self._limit(self.plan.check_header(header))
+            self.check = self.plan.row_checker(header)
+            if self.done:
+                stopped_at = self._chars
+        # csv.DictReader skips blank lines; keep the same row numbering.
+        rows = filter(None, reader)
+        check = self.check
+        row_num = progress.rows
+        try:
+            if stopped_at is None:
+                for row in rows:
+                    row_num += 1
+                    found = check(row, row_num)
+                    if found:
+                        issues += self._limit(found)
+                        if self.done:
+                            stopped_at = self._chars
+                            break
+            if stopped_at is not None and next(rows, None) is not None:
+                progress.truncated = True
+        finally:
+            progress.rows = row_num
+            if stopped_at is None:
+                progress.bytes_read += len(block)
+            else:
+                progress.bytes_read += len(text[:stopped_at].encode(ENCODING))
+        return issues
+
+
+def _has_rows(block: bytes) -> bool:
+    """Whether ``block`` holds a non-blank row."""
+    rows = csv.reader(io.StringIO(block.decode(ENCODING), newline=""))
+    return next(filter(None, rows), None) is not None
+
+
+async def aiter_issues(
+    chunks,
+    plan,
+    max_errors: int | None = None,
+    progress: ValidationProgress | None = None,
+    offload: bool = False,
+    executor=None,
+    base_dir: str | Path | None = None,
+    block_size: int = BLOCK_SIZE,
+):
+    """
+    Validates a CSV that arrives as an async iterable of byte ``chunks``, such
+    as an upload being received, and yields its ValidationIssues in file order.
+
+    ``plan`` may be a ValidationPlan, a loaded schema dict or a schema path;
+    ``foreign_key`` files are resolved against ``base_dir``. Chunks are cut
+    into complete records as they arrive (see RecordSplitter) and checked in
+    blocks of about ``block_size`` bytes, handing control back to the event
+    loop after each block. With ``offload``, blocks are checked on
+    ``executor`` (the loop's default executor if None) while the next chunks
+    are received; it must be a thread pool, as the checks keep per-run state.
+    gzip, bz2 and xz streams are decompressed on the fly. See
+    ValidationPlan.iter_issues for ``max_errors`` and ``progress``.
+    """
+    if progress is None:
+        progress = ValidationProgress()
+    try:
+        plan = _as_plan(plan)
+        plan.load_references(base_dir)
+    except ValueError as e:
+        yield ValidationIssue(None, None, "schema", None, str(e))
+        return
+
+    loop = asyncio.get_running_loop()
+    checker = _BlockChecker(plan, max_errors, progress)
+    splitter = RecordSplitter()
+    decompressor = None
+    # The first bytes, until there are enough to recognise compressed data.
+    head = bytearray()
+    pending = bytearray()
+    running = None
+    stopped = False
+
+    async def check(block: bytes) -> list[ValidationIssue]:
+        if offload:
+            return await loop.run_in_executor(executor, checker, block)
+        issues = checker(block)
+        await asyncio.sleep(0)
+        return issues
+
+    async def submit(block: bytes | None) -> list[ValidationIssue]:
+        # Waits for the block in flight, then starts the next one unless the
+        # budget is used up; then only whether it holds a row matters.
+        nonlocal running, stopped
+        issues = await running if running is not None else []
+        running = None
+        stopped = checker.done
+        if block is not None:
+            if stopped:
+                progress.truncated = progress.truncated or _has_rows(block)
+            else:
+                running = asyncio.ensure_future(check(block))
+        return issues
+
+    def records(data: bytes) -> None:
+        if decompressor is not None:
+            data = decompressor.decompress(data)
+        pending.extend(splitter.feed(data))
+
+    try:
+        async for chunk in chunks:
+            if head is not None:
+                head += chunk
+                if len(head) < _MAGIC_SIZE:
+                    continue
+                chunk, head = bytes(head), None
+                decompressor = _decompressor(chunk)
+            records(chunk)
+            if stopped:
+                # Read on only until a row shows that rows were left unchecked.
+                progress.truncated = progress.truncated or _has_rows(bytes(pending))
+                pending.clear()
+                if progress.truncated:
+                    return
+            elif len(pending) >= block_size:
+                block = bytes(pending)
+                pending.clear()
+                for issue in await submit(block):
+                    yield issue
+                if stopped and progress.truncated:
+                    return
+
+        if head is not None:
+            decompressor = _decompressor(head)
+            records(bytes(head))
+        if hasattr(decompressor, "flush"):
+            # zlib holds back the end of the data until flushed.
+            pending += splitter.feed(decompressor.flush())
+        pending += splitter.flush()
+        for issue in await submit(bytes(pending)):
+            yield issue
+        for issue in await submit(None):
+            yield issue
+    finally:
+        if running is not None:
+            running.cancel()
+
+
+def _decompressor(head: bytes):
+    compression = _compression_of(head)
+    return _DECOMPRESSORS[compression]() if compression is not None else None
+
+
+async def validate_stream(
+    chunks,
+    plan,
+    max_errors: int | None = None,
+    progress: ValidationProgress | None = None,
+    offload: bool = False,
+    executor=None,
+    base_dir: str | Path | None = None,
+    block_size: int = BLOCK_SIZE,
+) -> list[ValidationIssue]:
+    """
+    Validates a CSV that arrives as an async iterable of byte ``chunks`` and
+    returns its ValidationIssues. A list-building wrapper around aiter_issues.
+    """
+    return [
+        issue
+        async for issue in aiter_issues(chunks, plan, max_errors, progress, offload, executor, base_dir, block_size)
+    ]
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from utils.core.validator import ValidationIssue, ValidationPlan
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "reports" / "validation_cache.sqlite"
+# Overrides CACHE_PATH, e.g. to keep test runs away from the real cache.
+CACHE_ENV = "TESTFORGE_CACHE"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Larger results are not cached: they would have to be held in memory while
+# the issues stream past, and are cheap to recompute relative to their size.
+DEFAULT_MAX_ISSUES = 10_000
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Modules whose code decides which issues a validation run reports.
+VALIDATOR_MODULES = ("validator.py", "reader.py", "keyindex.py", "vectorized.py", "parallel.py")
+
+try:
+    TESTFORGE_VERSION = version("testforge")
+except PackageNotFoundError:
+    TESTFORGE_VERSION = "unknown"
+
+
+def validator_fingerprint() -> str:
+    """
+    A digest of the source of VALIDATOR_MODULES. The package version is not
+    bumped for every change to the checks, so cached results are keyed on
+    the code itself.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for name in VALIDATOR_MODULES:
+        digest.update((Path(__file__).parent / name).read_bytes())
+    return digest.hexdigest()
+
+
+# The validator part of a cache key: the package version and the code.
+CACHE_VERSION = f"{TESTFORGE_VERSION}+{validator_fingerprint()}"
+
+
+def default_cache_path() -> Path:
+    """The cache file: ``$TESTFORGE_CACHE`` if set, else CACHE_PATH."""
+    return Path(os.environ.get(CACHE_ENV) or CACHE_PATH)
+
+
+class ValidationCache:
+    """
+    Persistent cache of validation results in a SQLite file.
+
+    Results are keyed by the CSV's content digest, the compiled schema's
+    digest and CACHE_VERSION, so moving or touching a file does not
+    invalidate its entry but any change to data, schema or validator code does.
+    Content digests are remembered per path together with size and mtime, and
+    only recomputed when those change. Entries are evicted least recently
+    used first once the stored (compressed) results exceed ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_issues: int = DEFAULT_MAX_ISSUES,
+    ):
+        self.path = Path(path) if path is not None else default_cache_path()
+        self.max_bytes = max_bytes
+        self.max_issues = max_issues
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "digest TEXT, schema_digest TEXT, version TEXT, issues BLOB, "
+                "nbytes INTEGER, last_used REAL, "
+                "PRIMARY KEY (digest, schema_digest, version))"
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def file_digest(self, csv_path: str | Path) -> str:
+        csv_path = Path(csv_path).resolve()
+        stat = csv_path.stat()
+        row = self._db.execute(
+            "SELECT digest FROM files WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (str(csv_path), stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hashlib.blake2b(digest_size=20)
+        with open(csv_path, "rb") as f:
+            while block := f.read(HASH_BLOCK_SIZE):
+                digest.update(block)
+        digest = digest.hexdigest()
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                (str(csv_path), stat.st_size, stat.st_mtime_ns, digest),
+            )
+        return digest
+
+    def key(self, csv_path: str | Path, plan: ValidationPlan) -> tuple[str, str, str]:
+        return self.file_digest(csv_path), plan.digest, CACHE_VERSION
+
+    def get(self, key: tuple[str, str, str]) -> list[ValidationIssue] | None:
+        row = self._db.execute(
+            "SELECT issues FROM results WHERE digest = ? AND schema_digest = ? AND version = ?", key
+        ).fetchone()
+        if row is None:
+            return None
+        with self._db:
+            self._db.execute(
+                "UPDATE results SET last_used = ? WHERE digest = ? AND schema_digest = ? AND version = ?",
+                (time.time(), *key),
+            )
+        return [ValidationIssue(*issue) for issue in json.loads(zlib.decompress(row[0]))]
+
+    def put(self, key: tuple[str, str, str], issues: list[ValidationIssue]) -> None:
+        blob = zlib.compress(json.dumps([list(issue) for issue in issues]).encode())
+        if len(blob) > self.max_bytes:
+            return
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, blob, len(blob), time.time()),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(nbytes), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT digest, schema_digest, version, nbytes FROM results ORDER BY last_used"
+        ).fetchall()
+        for digest, schema_digest, result_version, nbytes in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute(
+                "DELETE FROM results WHERE digest = ? AND schema_digest = ? AND version = ?",
+                (digest, schema_digest, result_version),
+            )
+            total -= nbytes
+
+    def record(self, key: tuple[str, str, str], issues):
+        """
+        Passes ``issues`` through and stores them under ``key`` once they have
+        been consumed completely. Runs with more than ``max_issues`` issues are
+        not kept, so the memory held while recording stays bounded.
+        """
+        kept = []
+        for issue in issues:
+            if kept is not None:
+                kept.append(issue)
+                if len(kept) > self.max_issues:
+                    kept = None
+            yield issue
+        if kept is not None:
+            self.put(key, kept)
+
+    def cached_issues(self, csv_path: str | Path, plan: ValidationPlan, run):
+        """
+        Returns ``(issues, hit)``. On a hit, ``issues`` is the stored list and
+        ``run`` is not called; otherwise ``issues`` wraps ``run()``, the
+        validation generator, and is stored once fully consumed.
+        """
+        key = self.key(csv_path, plan)
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        return self.record(key, run()), False
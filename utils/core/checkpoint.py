@@ -0,0 +1,155 @@
+# MIT License
+# Copyright (c) 2025 Vlad
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND...
+
+import csv
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from utils.core.cache import CACHE_VERSION
+from utils.core.reader import BLOCK_SIZE, detect_compression, is_stdio, open_lines
+from utils.core.validator import ValidationPlan, ValidationProgress, issue_iterator
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+
+
+def checkpoint_path(csv_path: str | Path) -> Path:
+    """The sidecar file next to ``csv_path`` that holds its checkpoint."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + CHECKPOINT_SUFFIX)
+
+
+def header_fingerprint(header) -> str:
+    return hashlib.sha256(json.dumps(header).encode()).hexdigest()
+
+
+def prefix_fingerprint(csv_path: str | Path, offset: int) -> str:
+    """
+    Hashes the first ``offset`` bytes of the file, so that any change to the
+    rows already validated, wherever it is, is caught. Hashing is a
+    sequential read and far cheaper than parsing and checking those rows.
+    """
+    digest = hashlib.blake2b(str(offset).encode(), digest_size=16)
+    with open(csv_path, "rb") as f:
+        remaining = offset
+        while remaining > 0:
+            block = f.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest.hexdigest()
+
+
+def _read_header(csv_path: str | Path):
+    with open_lines(csv_path) as lines:
+        return next(csv.reader(lines), None)
+
+
+class Checkpoint:
+    """
+    How far a clean validation run of an append-only CSV got: the byte
+    ``offset`` and data ``rows`` it validated, plus fingerprints of the header,
+    of the validated prefix and of the compiled schema, to tell whether the
+    next run can skip that prefix.
+    """
+
+    def __init__(self, offset: int, rows: int, header: str, prefix: str, schema: str, version: str = CACHE_VERSION):
+        self.offset = offset
+        self.rows = rows
+        self.header = header
+        self.prefix = prefix
+        self.schema = schema
+        self.version = version
+
+    @classmethod
+    def create(cls, csv_path: str | Path, plan: ValidationPlan, progress: ValidationProgress) -> "Checkpoint | None":
+        """
+        The checkpoint at the end of a complete run described by ``progress``,
+        or None if the run cannot be resumed from: it was stopped early, read
+        standard input or a compressed file, or the file does not end with a
+        line break, so its last record may still be growing.
+        """
+        if progress.truncated or is_stdio(csv_path) or detect_compression(csv_path):
+            return None
+        offset = progress.bytes_read
+        if offset == 0:
+            return None
+        with open(csv_path, "rb") as f:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                return None
+        header = _read_header(csv_path)
+        return cls(offset, progress.rows, header_fingerprint(header), prefix_fingerprint(csv_path, offset), plan.digest)
+
+    @classmethod
+    def load(cls, csv_path: str | Path) -> "Checkpoint | None":
+        try:
+            with open(checkpoint_path(csv_path)) as f:
+                return cls(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, csv_path: str | Path) -> Path:
+        path = checkpoint_path(csv_path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.__dict__, indent=2))
+        os.replace(tmp, path)
+        return path
+
+    def mismatch(self, csv_path: str | Path, plan: ValidationPlan) -> str | None:
+        """
+        Why the run cannot resume from this checkpoint, or None if it can.
+        """
+        if self.version != CACHE_VERSION:
+            return "testforge or validator code changed"
+        if self.schema != plan.digest:
+            return "schema changed"
+        if plan.key_columns:
+            return "unique/primary_key columns need every row"
+        if is_stdio(csv_path) or detect_compression(csv_path):
+            return "input cannot be resumed"
+        if os.path.getsize(csv_path) < self.offset:
+            return "file shrank"
+        if header_fingerprint(_read_header(csv_path)) != self.header:
+            return "header changed"
+        if prefix_fingerprint(csv_path, self.offset) != self.prefix:
+            return "validated rows changed"
+        return None
+
+
+def iter_appended_issues(
+    csv_path: str | Path,
+    plan: ValidationPlan,
+    checkpoint: Checkpoint,
+    max_errors: int | None = None,
+    progress: ValidationProgress | None = None,
+    engine: str = "standard",
+):
+    """
+    Validates only the rows after ``checkpoint`` and yields their
+    ValidationIssues, numbered as in a full run. ``progress`` covers the
+    whole file, the checkpointed prefix included.
+    """
+    if progress is None:
+        progress = ValidationProgress()
+    tail = ValidationProgress()
+    header = _read_header(csv_path)
+    try:
+        with open_lines(csv_path, checkpoint.offset) as lines:
+            for issue in issue_iterator(plan, engine)(lines, max_errors, tail, header):
+                yield issue._replace(row=checkpoint.rows + issue.row)
+    finally:
+        progress.rows = checkpoint.rows + tail.rows
+        progress.bytes_read = checkpoint.offset + tail.bytes_read
+        progress.truncated = tail.truncated
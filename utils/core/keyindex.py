@@ -0,0 +1,231 @@
+# MIT License
+# Copyright (c) 2025 Vlad
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND...
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import weakref
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+INITIAL_CAPACITY = 1024
+# The table doubles once more than 7 in 10 slots are taken.
+MAX_LOAD = 0.7
+_HASH_MASK = 2**64 - 1
+# Each stored key is prefixed with the row it was first seen in and its length.
+_RECORD = struct.Struct("<QI")
+
+
+class KeyIndex:
+    """
+    A set of string keys that remembers the row each key was first seen in,
+    for ``unique`` and ``primary_key`` constraints.
+
+    Keys live in an open-addressing table of 64-bit hashes with linear
+    probing, stored as two unsigned 64-bit integers per slot (the hash and a
+    reference to the key) in one flat buffer, not as Python objects. The key
+    bytes are appended to a separate store and only read back when two hashes
+    match, to confirm that the keys are really equal.
+
+    With ``memory_limit`` set, the index moves to temporary files in
+    ``directory`` once the table and key store outgrow that many bytes: the
+    table is then memory-mapped and the key store is read from disk, so the
+    index can hold more keys than fit in RAM.
+    """
+
+    def __init__(self, memory_limit: int | None = None, directory: str | None = None,
+                 capacity: int = INITIAL_CAPACITY):
+        self.memory_limit = memory_limit
+        self.directory = directory
+        self.count = 0
+        self.spilled = False
+        self._capacity = max(1 << (capacity - 1).bit_length(), 2)
+        self._slots, self._slot_store = self._new_slots(self._capacity)
+        self._keys = bytearray()
+        self._key_file = None
+        self._key_size = 0
+
+    def add(self, key: str, row: int) -> int | None:
+        """
+        Adds ``key``, first seen in ``row``. Returns None for a new key and the
+        row the key was first seen in for a duplicate.
+        """
+        h = hash(key) & _HASH_MASK or 1
+        data = key.encode("utf-8", "surrogatepass")
+        slots = self._slots
+        mask = self._capacity - 1
+        i = h & mask
+        while True:
+            ref = slots[2 * i + 1]
+            if not ref:
+                break
+            if slots[2 * i] == h:
+                first_row, stored = self._read(ref - 1)
+                if stored == data:
+                    return first_row
+            i = (i + 1) & mask
+
+        slots[2 * i] = h
+        slots[2 * i + 1] = self._append(row, data) + 1
+        self.count += 1
+        if self.count > self._capacity * MAX_LOAD:
+            self._grow()
+        if self.memory_limit is not None and not self.spilled and self.nbytes > self.memory_limit:
+            self._spill()
+        return None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes taken by the table and the key store."""
+        return 16 * self._capacity + self._key_size
+
+    def _new_slots(self, capacity: int):
+        if not self.spilled:
+            return memoryview(bytearray(16 * capacity)).cast("Q"), None
+        f = tempfile.TemporaryFile(dir=self.directory)
+        f.truncate(16 * capacity)
+        mm = mmap.mmap(f.fileno(), 16 * capacity)
+        return memoryview(mm).cast("Q"), (f, mm)
+
+    def _release_slots(self, slots, store):
+        slots.release()
+        if store is not None:
+            f, mm = store
+            mm.close()
+            f.close()
+
+    def _grow(self):
+        old_slots, old_store, old_capacity = self._slots, self._slot_store, self._capacity
+        self._capacity *= 2
+        self._slots, self._slot_store = self._new_slots(self._capacity)
+        self._rehash(old_slots, old_capacity)
+        self._release_slots(old_slots, old_store)
+
+    def _rehash(self, old_slots, old_capacity: int):
+        slots = self._slots
+        mask = self._capacity - 1
+        for j in range(old_capacity):
+            ref = old_slots[2 * j + 1]
+            if not ref:
+                continue
+            h = old_slots[2 * j]
+            i = h & mask
+            while slots[2 * i + 1]:
+                i = (i + 1) & mask
+            slots[2 * i] = h
+            slots[2 * i + 1] = ref
+
+    def _spill(self):
+        self.spilled = True
+        self._key_file = tempfile.TemporaryFile(dir=self.directory)
+        self._key_file.write(self._keys)
+        self._keys = bytearray()
+        old_slots, old_store = self._slots, self._slot_store
+        self._slots, self._slot_store = self._new_slots(self._capacity)
+        self._slots[:] = old_slots
+        self._release_slots(old_slots, old_store)
+
+    def _append(self, row: int, data: bytes) -> int:
+        offset = self._key_size
+        record = _RECORD.pack(row, len(data)) + data
+        if self._key_file is None:
+            self._keys += record
+        else:
+            self._key_file.write(record)
+        self._key_size += len(record)
+        return offset
+
+    def _read(self, offset: int) -> tuple[int, bytes]:
+        if self._key_file is None:
+            row, length = _RECORD.unpack_from(self._keys, offset)
+            start = offset + _RECORD.size
+            return row, bytes(self._keys[start:start + length])
+        self._key_file.flush()
+        fd = self._key_file.fileno()
+        row, length = _RECORD.unpack(os.pread(fd, _RECORD.size, offset))
+        return row, os.pread(fd, length, offset + _RECORD.size)
+
+    def close(self):
+        """Releases the table and removes the temporary files of a spilled index."""
+        if self._slots is not None:
+            self._release_slots(self._slots, self._slot_store)
+            self._slots = self._slot_store = None
+        if self._key_file is not None:
+            self._key_file.close()
+            self._key_file = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def key_hash(key: str) -> int:
+    """A 64-bit hash of ``key`` that, unlike hash(), is the same in every process."""
+    digest = hashlib.blake2b(key.encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class KeySet:
+    """
+    A read-only set of keys, stored as the sorted array of their 64-bit
+    key_hash values in a file that is memory-mapped, for ``foreign_key``
+    constraints.
+
+    Lookups are a binary search over the mapped array, so processes that open
+    the same file share one copy of it through the page cache. A KeySet pickles
+    as its path, which lets a pool's workers receive it through their
+    initializer without copying the keys. Membership is decided on the hashes
+    alone; a missing key is wrongly accepted only if its hash collides with
+    one of the ``len(self)`` stored hashes (odds about ``len(self)`` in 2**64).
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._hashes = memoryview(self._map).cast("Q") if self._map is not None else array("Q")
+        self.digest = hashlib.blake2b(self._map if self._map is not None else b"", digest_size=16).hexdigest()
+
+    @classmethod
+    def build(cls, keys, directory: str | None = None) -> "KeySet":
+        """
+        Hashes ``keys``, writes the sorted, de-duplicated hashes to a temporary
+        file in ``directory`` and opens it. The file is removed when the
+        returned KeySet is garbage collected or the process exits.
+        """
+        hashes = array("Q", sorted(set(map(key_hash, keys))))
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".keys", delete=False) as f:
+            hashes.tofile(f)
+        key_set = cls(f.name)
+        weakref.finalize(key_set, os.unlink, f.name)
+        return key_set
+
+    def __contains__(self, key: str) -> bool:
+        h = key_hash(key)
+        hashes = self._hashes
+        i = bisect_left(hashes, h)
+        return i < len(hashes) and hashes[i] == h
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __reduce__(self):
+        return KeySet, (self.path,)
@@ -0,0 +1,216 @@
+import csv
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from utils.core.reader import detect_compression, is_stdio, open_lines, uses_bare_cr
+from utils.core.validator import (
+    ValidationIssue,
+    ValidationProgress,
+    compile_schema,
+    issue_iterator,
+    prepare_plan,
+)
+
+BLOCK_SIZE = 1024 * 1024
+MIN_CHUNK_SIZE = 8 * 1024 * 1024
+CHUNKS_PER_WORKER = 4
+# Chunks submitted ahead of the one being yielded, per worker; finished chunks
+# hold all their issues until the parent gets to them.
+IN_FLIGHT_PER_WORKER = 2
+
+
+def _count_quotes(path: str | Path, start: int, end: int) -> int:
+    count = 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            count += block.count(b'"')
+            remaining -= len(block)
+    return count
+
+
+def _next_record_start(f, offset: int, in_quotes: bool) -> int:
+    """Returns the offset just past the first line break at or after ``offset`` that is outside quotes."""
+    f.seek(offset)
+    pos = offset
+    while True:
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            return pos
+        i = 0
+        while True:
+            n = block.find(b"\n", i)
+            if n == -1:
+                in_quotes ^= bool(block.count(b'"', i) & 1)
+                break
+            in_quotes ^= bool(block.count(b'"', i, n) & 1)
+            if not in_quotes:
+                return pos + n + 1
+            i = n + 1
+        pos += len(block)
+
+
+def split_records(path: str | Path, start: int, end: int, parts: int, executor=None) -> list[tuple[int, int]]:
+    """
+    Splits the byte range ``[start, end)`` of a CSV file into up to ``parts``
+    ranges that each begin and end on a record boundary. ``start`` must itself
+    be a record boundary, e.g. the end of the header.
+
+    A line break only ends a record if it is preceded by an even number of quote
+    characters, so quoted fields containing newlines are never cut in half. The
+    quote counting for each nominal range runs on ``executor`` if one is given.
+    """
+    if parts <= 1 or end - start <= 1:
+        return [(start, end)] if end > start else []
+
+    nominal = [start + (end - start) * k // parts for k in range(parts + 1)]
+    map_fn = executor.map if executor is not None else map
+    counts = list(map_fn(_count_quotes, [path] * parts, nominal[:-1], nominal[1:]))
+
+    bounds = [start]
+    quotes = 0
+    with open(path, "rb") as f:
+        for k in range(1, parts):
+            quotes += counts[k - 1]
+            if nominal[k] <= bounds[-1]:
+                continue
+            boundary = min(_next_record_start(f, nominal[k], bool(quotes & 1)), end)
+            if boundary > bounds[-1]:
+                bounds.append(boundary)
+    if bounds[-1] < end:
+        bounds.append(end)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+_worker_iter_issues = None
+
+
+def _init_worker(schema: dict, engine: str, references: dict | None = None) -> None:
+    global _worker_iter_issues
+    plan = compile_schema(schema)
+    plan.use_references(references or {})
+    _worker_iter_issues = issue_iterator(plan, engine)
+
+
+def _validate_range(path: str | Path, start: int, end: int, header: list[str], max_errors: int | None):
+    progress = ValidationProgress()
+    with open_lines(path, start, end) as lines:
+        issues = list(_worker_iter_issues(lines, max_errors, progress, header))
+    return progress, issues
+
+
+def _has_rows(path: str | Path, start: int) -> bool:
+    """Whether a non-blank row starts at or after record boundary ``start``."""
+    with open_lines(path, start) as lines:
+        return next(filter(None, csv.reader(lines)), None) is not None
+
+
+def iter_validation_errors_parallel(
+    csv_path: str | Path,
+    schema,
+    workers: int,
+    max_errors: int | None = None,
+    progress: ValidationProgress | None = None,
+    min_chunk_size: int = MIN_CHUNK_SIZE,
+    engine: str = "standard",
+):
+    """
+    Like iter_validation_errors, but validates byte-range chunks of the file in
+    a pool of ``workers`` processes. Issues are yielded in file order with
+    global row numbers, so the output matches a sequential run.
+
+    Files smaller than two chunks of ``min_chunk_size`` bytes, compressed
+    files, files with ``\r``-only line endings, standard input and schemas
+    with ``unique``/``primary_key`` columns are validated in this process.
+    At most IN_FLIGHT_PER_WORKER chunks per worker are queued or waiting to
+    be yielded at any time. ``progress`` ends up as in a sequential run.
+    """
+    if progress is None:
+        progress = ValidationProgress()
+    try:
+        plan = prepare_plan(schema, csv_path)
+    except ValueError as e:
+        yield ValidationIssue(None, None, "schema", None, str(e))
+        return
+
+    # Standard input can only be read once, from start to end.
+    if is_stdio(csv_path):
+        with open_lines(csv_path) as lines:
+            yield from issue_iterator(plan, engine)(lines, max_errors, progress)
+        return
+
+    with open_lines(csv_path) as lines:
+        header = next(csv.reader(lines), None)
+        data_start = lines.bytes_read
+    size = os.path.getsize(csv_path)
+    parts = min(workers * CHUNKS_PER_WORKER, (size - data_start) // max(min_chunk_size, 1))
+
+    # Compressed input cannot be split into byte ranges without decompressing it,
+    # ranges are cut on \n line breaks, and unique/primary_key columns need
+    # every key of the file in one index.
+    if (header is None or workers <= 1 or parts < 2 or detect_compression(csv_path)
+            or uses_bare_cr(csv_path) or plan.key_columns):
+        with open_lines(csv_path) as lines:
+            yield from issue_iterator(plan, engine)(lines, max_errors, progress)
+        return
+
+    remaining = max_errors
+    header_issues = plan.check_header(header)
+    if remaining is not None:
+        progress.truncated = len(header_issues) > remaining
+        header_issues = header_issues[:remaining]
+        remaining -= len(header_issues)
+    yield from header_issues
+    progress.bytes_read = data_start
+    if remaining == 0:
+        progress.truncated = progress.truncated or _has_rows(csv_path, data_start)
+        return
+
+    initargs = ({"columns": plan.columns}, engine, plan.references)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as executor:
+        ranges = iter(split_records(csv_path, data_start, size, parts, executor))
+        in_flight = deque()
+
+        def submit():
+            # Each chunk may use what is left of the budget when it is queued.
+            for start, end in ranges:
+                future = executor.submit(_validate_range, csv_path, start, end, header, remaining)
+                in_flight.append((start, end, remaining, future))
+                if len(in_flight) >= workers * IN_FLIGHT_PER_WORKER:
+                    return
+
+        try:
+            row_offset = 0
+            submit()
+            while in_flight:
+                start, end, budget, future = in_flight.popleft()
+                chunk, issues = future.result()
+                if remaining is not None and len(issues) >= remaining:
+                    if budget != remaining:
+                        # The worker stopped later than this run does; redo the chunk with the real budget.
+                        chunk = ValidationProgress()
+                        with open_lines(csv_path, start, end) as lines:
+                            issues = list(issue_iterator(plan, engine)(lines, remaining, chunk, header))
+                    for issue in issues:
+                        yield issue._replace(row=row_offset + issue.row)
+                    progress.rows = row_offset + chunk.rows
+                    progress.bytes_read = start + chunk.bytes_read
+                    progress.truncated = chunk.truncated or _has_rows(csv_path, end)
+                    return
+                for issue in issues:
+                    yield issue._replace(row=row_offset + issue.row)
+                if remaining is not None:
+                    remaining -= len(issues)
+                row_offset += chunk.rows
+                progress.rows = row_offset
+                progress.bytes_read = end
+                submit()
+        finally:
+            for *_, future in in_flight:
+                future.cancel()
@@ -0,0 +1,333 @@
+import bz2
+import csv
+import gzip
+import io
+import lzma
+import mmap
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+from itertools import repeat
+from pathlib import Path
+
+ENCODING = "utf-8"
+BLOCK_SIZE = 1024 * 1024
+
+# Compression formats recognised by their magic bytes, not by file name.
+COMPRESSION_FORMATS = {
+    "gzip": (b"\x1f\x8b", gzip.open),
+    "bz2": (b"BZh", bz2.open),
+    "xz": (b"\xfd7zXZ\x00", lzma.open),
+}
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz")
+CSV_PATTERNS = ("*.csv",) + tuple(f"*.csv{suffix}" for suffix in COMPRESSED_SUFFIXES)
+# A path of "-" stands for standard input (or output).
+STDIO = "-"
+
+
+def is_stdio(path) -> bool:
+    return str(path) == STDIO
+
+
+def _has_bare_cr(head: bytes) -> bool:
+    """
+    Whether ``head``, the start of a CSV, ends its first line with a lone
+    ``\r`` (old Mac line endings) rather than ``\n`` or ``\r\n``.
+    """
+    n = head.find(b"\n")
+    first_line = head if n == -1 else head[:n]
+    return b"\r" in first_line.rstrip(b"\r")
+
+
+def uses_bare_cr(csv_path: str | Path) -> bool:
+    """
+    Whether an uncompressed CSV file ends its lines with a lone ``\r``. Such
+    files are read through a text layer and cannot be split into byte ranges
+    on line breaks.
+    """
+    with open(csv_path, "rb") as f:
+        return _has_bare_cr(f.read(BLOCK_SIZE))
+
+
+def _counted_text_lines(reader, f, encoding: str, limit: int | None):
+    # Only a text layer splits lines on a lone \r; count the bytes each line took.
+    text = io.TextIOWrapper(f, encoding, newline="")
+    try:
+        for line in text:
+            reader._counted += len(line.encode(encoding))
+            yield line
+            if limit is not None and reader._counted >= limit:
+                return
+    finally:
+        # Keep the caller's file open; it may already be closed if the lines were abandoned.
+        if not f.closed:
+            text.detach()
+
+
+def _counted_lines(reader, f, encoding: str, limit: int | None):
+    for line in f:
+        reader._counted += len(line)
+        yield line.decode(encoding)
+        if limit is not None and reader._counted >= limit:
+            return
+
+
+class CountingLineReader:
+    """
+    Iterates over the decoded lines of a file opened in binary mode while
+    keeping track of how many bytes have been consumed.
+
+    ``csv.reader`` pulls lines from it like from a text file opened with
+    ``newline=''``, but unlike a text file the byte position stays known
+    while iterating. With ``limit`` it stops once that many bytes were read,
+    which lets a reader cover one byte range of a file that ends on a line break.
+    Input whose lines end with a lone ``\r`` is decoded through
+    ``io.TextIOWrapper`` instead, as the binary line split only knows ``\n``.
+    """
+
+    def __init__(self, f, encoding: str = ENCODING, limit: int | None = None):
+        self._f = f
+        self.encoding = encoding
+        self.limit = limit
+        self._counted = 0
+        if hasattr(f, "peek") and _has_bare_cr(f.peek(BLOCK_SIZE)):
+            self._start = None
+            self._lines = _counted_text_lines(self, f, encoding, limit)
+            return
+        try:
+            self._start = f.tell() if limit is None else None
+        except OSError:
+            self._start = None
+        if self._start is not None:
+            # Seekable files report their position themselves, so lines can be
+            # decoded without a Python-level step per line.
+            self._lines = map(bytes.decode, f, repeat(encoding))
+        else:
+            self._lines = _counted_lines(self, f, encoding, limit)
+
+    @property
+    def bytes_read(self) -> int:
+        if self._start is not None:
+            return self._f.tell() - self._start
+        return self._counted
+
+    def __iter__(self):
+        return self._lines
+
+
+class MappedLineReader:
+    """
+    Line source backed by a read-only memory map of the byte range
+    ``[start, end)`` of a file.
+
+    Lines are cut straight out of the page cache with ``mmap.readline`` and
+    decoded by ``map``, so there is no intermediate read buffer and no Python
+    code runs per line. Only the requested range is mapped, which makes it a
+    cheap way for parallel workers to read one chunk of a file larger than RAM.
+    Same interface as CountingLineReader.
+
+    Raises:
+        ValueError: If the lines end with a lone ``\r``, which ``mmap.readline``
+            does not split on; read such files with CountingLineReader.
+    """
+
+    def __init__(self, csv_path: str | Path, start: int = 0, end: int | None = None, encoding: str = ENCODING):
+        self.encoding = encoding
+        self._mm = None
+        with open(csv_path, "rb") as f:
+            if end is None:
+                end = os.fstat(f.fileno()).st_size
+            offset = start - start % mmap.ALLOCATIONGRANULARITY
+            if end > start:
+                self._mm = mmap.mmap(f.fileno(), end - offset, access=mmap.ACCESS_READ, offset=offset)
+        self._base = start - offset
+        if self._mm is None:
+            self._lines = iter(())
+            return
+        if _has_bare_cr(self._mm[self._base:self._base + BLOCK_SIZE]):
+            self.close()
+            raise ValueError("lines end with a lone carriage return")
+        if hasattr(self._mm, "madvise"):
+            self._mm.madvise(mmap.MADV_SEQUENTIAL)
+        self._mm.seek(self._base)
+        self._lines = map(bytes.decode, iter(self._mm.readline, b""), repeat(encoding))
+
+    @property
+    def bytes_read(self) -> int:
+        return self._mm.tell() - self._base if self._mm is not None else 0
+
+    def __iter__(self):
+        return self._lines
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+
+
+def _compression_of(head: bytes) -> str | None:
+    for name, (magic, _) in COMPRESSION_FORMATS.items():
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def detect_compression(csv_path: str | Path) -> str | None:
+    """Returns the compression format of a file ("gzip", "bz2" or "xz"), or None."""
+    with open(csv_path, "rb") as f:
+        return _compression_of(f.read(6))
+
+
+def csv_stem(csv_path: str | Path) -> str:
+    """File name without the .csv and compression suffixes: data.csv.gz -> data."""
+    name = Path(csv_path).name
+    for suffix in COMPRESSED_SUFFIXES + (".csv",):
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    return name
+
+
+class PrefetchingReader(io.RawIOBase):
+    """
+    Raw stream whose blocks are read from ``source`` by a background thread.
+
+    Used for decompression: zlib, bz2 and lzma release the GIL, so the next
+    blocks are decompressed while the current ones are being parsed. At most
+    ``depth`` blocks are buffered ahead.
+    """
+
+    def __init__(self, source, block_size: int = BLOCK_SIZE, depth: int = 4):
+        super().__init__()
+        self._source = source
+        self._queue = queue.Queue(depth)
+        self._pending = memoryview(b"")
+        self._eof = False
+        self._pos = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, args=(block_size,), daemon=True)
+        self._thread.start()
+
+    def _fill(self, block_size: int) -> None:
+        try:
+            while not self._stop.is_set():
+                block = self._source.read(block_size)
+                self._put(block)
+                if not block:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item) -> None:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if not self._pending:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._pending = memoryview(item)
+        n = min(len(b), len(self._pending))
+        b[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        self._pos += n
+        return n
+
+    def tell(self) -> int:
+        return self._pos
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+def open_stream(f: io.BufferedReader):
+    """
+    Prepares a buffered binary stream that cannot be rewound, such as standard
+    input or a request body, for CountingLineReader: gzip, bz2 and xz data is
+    recognised by peeking at its magic bytes and decompressed on the fly.
+    """
+    compression = _compression_of(f.peek(6)[:6])
+    if compression is None:
+        return f
+    _, open_compressed = COMPRESSION_FORMATS[compression]
+    return io.BufferedReader(PrefetchingReader(open_compressed(f, "rb")), BLOCK_SIZE)
+
+
+def open_csv(csv_path: str | Path):
+    """
+    Opens a CSV file, or standard input for ``-``, for CountingLineReader,
+    decompressing gzip, bz2 and xz input on the fly in a background thread.
+    The caller closes the file; closing standard input's handle leaves the
+    stream itself open.
+    """
+    if is_stdio(csv_path):
+        return open_stream(open(sys.stdin.fileno(), "rb", closefd=False))
+
+    compression = detect_compression(csv_path)
+    if compression is None:
+        return open(csv_path, "rb")
+    _, open_compressed = COMPRESSION_FORMATS[compression]
+    return io.BufferedReader(PrefetchingReader(open_compressed(csv_path, "rb")), BLOCK_SIZE)
+
+
+@contextmanager
+def open_lines(csv_path: str | Path, start: int = 0, end: int | None = None):
+    """
+    Context manager yielding a line reader (see CountingLineReader) for the
+    byte range ``[start, end)`` of a CSV file, or all of it. ``-`` reads
+    standard input.
+
+    Regular files are memory-mapped; compressed files are decompressed as a
+    stream (byte ranges are then offsets into the decompressed data) and
+    anything else that cannot be mapped, such as a pipe or a file with
+    ``\r``-only line endings, is read through a buffered file.
+    """
+    reader = None
+    if not is_stdio(csv_path) and detect_compression(csv_path) is None:
+        try:
+            reader = MappedLineReader(csv_path, start, end)
+        except (OSError, ValueError):
+            pass
+    if reader is not None:
+        try:
+            yield reader
+        finally:
+            reader.close()
+        return
+
+    with open_csv(csv_path) as f:
+        if f.seekable():
+            f.seek(start)
+        else:
+            remaining = start
+            while remaining > 0 and f.read(min(BLOCK_SIZE, remaining)):
+                remaining -= BLOCK_SIZE
+        yield CountingLineReader(f, limit=None if end is None else end - start)
+
+
+def read_rows(lines: CountingLineReader):
+    """
+    Returns ``(header, rows)``: the first row of the CSV (None for an empty
+    input) and an iterator over the remaining non-blank rows.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    # csv.DictReader skips blank lines; keep the same row numbering.
+    return header, filter(None, reader)
@@ -10,42 +10,429 @@
 #
 # THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND...
 
+import io
+import json
+from contextlib import ExitStack
 from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
 from colorama import init, Fore
+
+from utils.core.cache import TESTFORGE_VERSION
+from utils.core.summary import summarize
+from utils.core.validator import ValidationIssue
+
 init(autoreset=True)
 
 LOG_DIR = Path(__file__).resolve().parent.parent / "reports" / "validation_logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
+BUFFER_SIZE = 1024 * 1024
+
+def describe_truncation(progress) -> str:
+    return (
+        f"Stopped early after {progress.rows} row(s) "
+        f"({progress.bytes_read} bytes read); remaining rows were not validated."
+    )
+
+def _as_issue(err) -> ValidationIssue:
+    if isinstance(err, ValidationIssue):
+        return err
+    return ValidationIssue(None, None, "error", None, str(err))
+
+# Report sinks turn a stream of ValidationIssues into one document. They write
+# to an open text file ``f`` as the issues arrive: start() once, issue() per
+# issue, then finish() with the issue count and the ValidationProgress.
+
+class LogSink:
+    """The plaintext log: a title, then one error message per line."""
+
+    def __init__(self, f, source=None):
+        self._f = f
+
+    def start(self):
+        self._f.write("Validation Report\n")
+        self._f.write("=" * 40 + "\n\n")
+
+    def issue(self, issue: ValidationIssue):
+        self._f.write(f"{issue.message}\n")
+
+    def finish(self, count, progress=None):
+        if not count:
+            self._f.write("No issues found.\n")
+        if progress is not None and progress.truncated:
+            self._f.write(f"\n{describe_truncation(progress)}\n")
+
+class MarkdownSink:
+    """A Markdown report listing the errors as bullet points."""
+
+    def __init__(self, f, source=None):
+        self._f = f
+        self._empty = True
+
+    def start(self):
+        self._f.write("# Validation Report\n\n")
+
+    def issue(self, issue: ValidationIssue):
+        if self._empty:
+            self._f.write("## Errors:\n")
+            self._empty = False
+        self._f.write(f"- {issue.message}\n")
+
+    def finish(self, count, progress=None):
+        if not count:
+            self._f.write("✅ No errors found.\n")
+        if progress is not None and progress.truncated:
+            self._f.write(f"\n_{describe_truncation(progress)}_\n")
+
+class HtmlSink:
+    """An HTML page listing the errors, with every message escaped."""
+
+    def __init__(self, f, source=None):
+        self._f = f
+        self._empty = True
+
+    def start(self):
+        self._f.write(
+            '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Validation Report</title></head><body>\n'
+            "<h1>Validation Report</h1>\n"
+        )
+
+    def issue(self, issue: ValidationIssue):
+        if self._empty:
+            self._f.write("<h2>Errors:</h2>\n<ul>\n")
+            self._empty = False
+        self._f.write(f"<li>{escape(issue.message)}</li>\n")
+
+    def finish(self, count, progress=None):
+        self._f.write("</ul>\n" if count else "<p>✅ No errors found.</p>\n")
+        if progress is not None and progress.truncated:
+            self._f.write(f"<p><em>{escape(describe_truncation(progress))}</em></p>\n")
+        self._f.write("</body></html>\n")
+
+class JsonlSink:
+    """One JSON object per issue and line, with the ValidationIssue fields plus ``message``."""
+
+    def __init__(self, f, source=None):
+        self._f = f
+
+    def start(self):
+        pass
+
+    def issue(self, issue: ValidationIssue):
+        record = issue._asdict()
+        record["message"] = issue.message
+        self._f.write(json.dumps(record, ensure_ascii=False))
+        self._f.write("\n")
+
+    def finish(self, count, progress=None):
+        if progress is not None and progress.truncated:
+            self.issue(ValidationIssue(None, None, "truncated", None, describe_truncation(progress)))
+
+class JUnitSink:
+    """
+    JUnit XML with one failed test case per issue, or a single passing one.
+
+    The test suite carries no totals, as they are not known until the end of
+    the stream; JUnit consumers count the test cases themselves.
+    """
+
+    def __init__(self, f, source=None):
+        self._f = f
+        self._suite = Path(source).name if source is not None else "csv-validation"
+
+    def start(self):
+        self._f.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n')
+        self._f.write(f"  <testsuite name={quoteattr(self._suite)}>\n")
+
+    def issue(self, issue: ValidationIssue):
+        name = issue.code if issue.row is None else f"row {issue.row}: {issue.code}"
+        classname = f"{self._suite}.{issue.column or 'file'}"
+        self._f.write(
+            f"    <testcase classname={quoteattr(classname)} name={quoteattr(name)}>"
+            f"<failure type={quoteattr(issue.code)} message={quoteattr(issue.message)}/></testcase>\n"
+        )
+
+    def finish(self, count, progress=None):
+        if not count:
+            self._f.write(f"    <testcase classname={quoteattr(self._suite)} name=\"validation\"/>\n")
+        if progress is not None and progress.truncated:
+            self._f.write(f"    <system-out>{escape(describe_truncation(progress))}</system-out>\n")
+        self._f.write("  </testsuite>\n</testsuites>\n")
+
+class SarifSink:
+    """
+    A SARIF 2.1.0 log with one result per issue, ``ruleId`` being the issue code.
+
+    Row issues point at line ``row + 1`` of the CSV, which is exact unless the
+    file has blank lines or quoted line breaks; the row, column and value are
+    also given as result properties.
+    """
+
+    def __init__(self, f, source=None):
+        self._f = f
+        self._uri = Path(source).as_posix() if source is not None else None
+
+    def start(self):
+        driver = {"name": "testforge", "version": TESTFORGE_VERSION, "informationUri": "https://github.com/romanvlad95/testforge"}
+        self._f.write(
+            '{"$schema": "https://json.schemastore.org/sarif-2.1.0.json", "version": "2.1.0", '
+            f'"runs": [{{"tool": {{"driver": {json.dumps(driver)}}}, "results": [\n'
+        )
+        self._first = True
+
+    def issue(self, issue: ValidationIssue):
+        location = {"physicalLocation": {"artifactLocation": {"uri": self._uri or "stdin"}}}
+        if issue.row is not None:
+            location["physicalLocation"]["region"] = {"startLine": issue.row + 1}
+        result = {
+            "ruleId": issue.code,
+            "level": "error",
+            "message": {"text": issue.message},
+            "locations": [location],
+            "properties": {"row": issue.row, "column": issue.column, "value": issue.value},
+        }
+        self._f.write(("" if self._first else ",\n") + json.dumps(result, ensure_ascii=False))
+        self._first = False
 
-def write_validation_report(output_file, errors):
+    def finish(self, count, progress=None):
+        truncated = progress is not None and progress.truncated
+        self._f.write(f'\n], "properties": {{"truncated": {json.dumps(truncated)}}}}}]}}\n')
+
+# Report formats: the file suffix and the sink writing them.
+REPORT_FORMATS = {
+    "text": (".log", LogSink),
+    "jsonl": (".jsonl", JsonlSink),
+    "junit": (".xml", JUnitSink),
+    "sarif": (".sarif", SarifSink),
+}
+
+def report_suffix(report_format: str) -> str:
+    return REPORT_FORMATS[report_format][0]
+
+def render_report(errors, sinks, progress=None) -> int:
+    """
+    Passes over ``errors`` once and hands every issue to each of ``sinks``.
+
+    Returns:
+        int: The number of errors rendered.
+    """
+    for sink in sinks:
+        sink.start()
+    count = 0
+    for err in errors:
+        count += 1
+        issue = _as_issue(err)
+        for sink in sinks:
+            sink.issue(issue)
+    for sink in sinks:
+        sink.finish(count, progress)
+    return count
+
+def _open_report(stack: ExitStack, path):
+    return stack.enter_context(open(path, "w", encoding="utf-8", buffering=BUFFER_SIZE))
+
+def write_report(outputs, errors, progress=None, source=None) -> int:
+    """
+    Renders ``errors`` into several report files in a single pass.
+
+    ``outputs`` is a list of ``(path, sink_class)`` pairs; pairs without a path
+    are skipped. Every file is written through its own buffered handle as the
+    errors arrive, so no report is ever held in memory as a whole.
+
+    Returns:
+        int: The number of errors written.
+    """
+    with ExitStack() as stack:
+        sinks = [sink_class(_open_report(stack, path), source) for path, sink_class in outputs if path]
+        return render_report(errors, sinks, progress)
+
+def write_reports(output_file, errors, progress=None, markdown_file=None, html_file=None) -> int:
+    """
+    Writes the plaintext log and, optionally, Markdown and HTML reports in a
+    single pass over ``errors``.
+
+    Returns:
+        int: The number of errors written.
+    """
+    return write_report(
+        [(output_file, LogSink), (markdown_file, MarkdownSink), (html_file, HtmlSink)], errors, progress
+    )
+
+def write_structured_report(output_file, errors, report_format, progress=None, source=None) -> int:
+    """
+    Writes ``errors`` as a JSONL, JUnit XML or SARIF report in one pass,
+    holding no more than one issue in memory.
+
+    ``source`` is the validated CSV, named in JUnit and SARIF reports.
+
+    Returns:
+        int: The number of errors written.
     """
-    Writes validation results to the specified log file.
+    return write_report([(output_file, REPORT_FORMATS[report_format][1])], errors, progress, source)
+
+def _describe_values(group) -> str:
+    values = [f"{value!r} ×{count}" for value, count in group.top_values()]
+    if group.other:
+        values.append(f"other ×{group.other}")
+    return ", ".join(values)
+
+def _describe_rows(group) -> str:
+    if group.first_row is None:
+        return ""
+    if group.first_row == group.last_row:
+        return str(group.first_row)
+    return f"{group.first_row}–{group.last_row}"
+
+def _write_summary_text(summary, progress=None, log=None, md=None, html=None):
+    """Writes the text, Markdown and HTML summaries to whichever of the handles are given."""
+    if log:
+        log.write("Validation Summary\n")
+        log.write("=" * 40 + "\n\n")
+    if md:
+        md.write("# Validation Summary\n\n")
+    if html:
+        html.write(
+            '<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Validation Summary</title></head><body>\n'
+            "<h1>Validation Summary</h1>\n"
+        )
+
+    overview = f"{summary.total} error(s) of {len(summary)} kind(s)."
+    if summary.total:
+        if log:
+            log.write(f"{overview}\n\n")
+        if md:
+            md.write(f"{overview}\n\n")
+            md.write("| Column | Check | Count | Rows | First error | Values |\n")
+            md.write("|---|---|---|---|---|---|\n")
+        if html:
+            html.write(f"<p>{overview}</p>\n<table>\n")
+            html.write("<tr><th>Column</th><th>Check</th><th>Count</th><th>Rows</th>"
+                       "<th>First error</th><th>Values</th></tr>\n")
+    else:
+        if log:
+            log.write("No issues found.\n")
+        if md:
+            md.write("✅ No errors found.\n")
+        if html:
+            html.write("<p>✅ No errors found.</p>\n")
+
+    for group in summary:
+        values = _describe_values(group)
+        if log:
+            log.write(f"[{group.count}] {group.message}\n")
+            if values:
+                log.write(f"    values: {values}\n")
+            if group.samples:
+                log.write("    sample: " + ", ".join(f"row {row} {value!r}" for row, value in group.samples) + "\n")
+        cells = [group.column or "", group.code, str(group.count), _describe_rows(group), group.first.message, values]
+        if md:
+            md.write("| " + " | ".join(cell.replace("|", "\\|") for cell in cells) + " |\n")
+        if html:
+            html.write("<tr>" + "".join(f"<td>{escape(cell)}</td>" for cell in cells) + "</tr>\n")
+
+    if html and summary.total:
+        html.write("</table>\n")
+    if progress is not None and progress.truncated:
+        if log:
+            log.write(f"\n{describe_truncation(progress)}\n")
+        if md:
+            md.write(f"\n_{describe_truncation(progress)}_\n")
+        if html:
+            html.write(f"<p><em>{escape(describe_truncation(progress))}</em></p>\n")
+    if html:
+        html.write("</body></html>\n")
+
+def _write_summary_jsonl(f, summary, progress=None):
+    for group in summary:
+        f.write(json.dumps(group.to_dict(), ensure_ascii=False))
+        f.write("\n")
+    if progress is not None and progress.truncated:
+        f.write(json.dumps({"code": "truncated", "message": describe_truncation(progress)}) + "\n")
+
+def write_summary_report(
+    output_file,
+    summary,
+    report_format="text",
+    progress=None,
+    markdown_file=None,
+    html_file=None,
+    source=None,
+    json_file=None,
+) -> int:
+    """
+    Writes an IssueSummary: one entry per (column, check) group instead of one
+    per issue, so the report's size does not depend on the number of bad rows.
+
+    The text log and the Markdown and HTML reports list each group with its
+    count, row span, most common values and a sample; JSONL writes one object
+    per group; JUnit and SARIF get one failure per group, at its first row.
+
+    Returns:
+        int: The total number of errors summarized.
+    """
+    with ExitStack() as stack:
+        out = _open_report(stack, output_file)
+        md = _open_report(stack, markdown_file) if markdown_file else None
+        html = _open_report(stack, html_file) if html_file else None
+        _write_summary_text(summary, progress, out if report_format == "text" else None, md, html)
+        if report_format == "jsonl":
+            _write_summary_jsonl(out, summary, progress)
+        elif report_format != "text":
+            sink = REPORT_FORMATS[report_format][1](out, source)
+            render_report((group.as_issue() for group in summary), [sink], progress)
+        if json_file and json_file != output_file:
+            _write_summary_jsonl(_open_report(stack, json_file), summary, progress)
+    return summary.total
+
+def write_validation_report(
+    output_file,
+    errors,
+    progress=None,
+    markdown_file=None,
+    html_file=None,
+    report_format="text",
+    source=None,
+    summary=False,
+    json_file=None,
+) -> int:
+    """
+    Writes validation results to the specified log file, and to any extra
+    reports requested, in a single pass over ``errors``.
 
     Parameters:
         output_file (Path): Full path to the output log file.
-        errors (list[str]): List of validation error messages.
-    """
-    with open(output_file, "w") as f:
-        f.write(f"Validation Report\n")
-        f.write("=" * 40 + "\n\n")
-
-        if errors:
-            for err in errors:
-                f.write(f"{err}\n")
-        else:
-            f.write("No issues found.\n")
-    if errors:
-        print(Fore.RED + f"❗ Found {len(errors)} error(s). See report: {output_file}")
-    else:
-        print(Fore.GREEN + f"✅ No issues found. Report saved to: {output_file}")
+        errors (Iterable): Validation error messages or ValidationIssues; consumed once.
+        progress (ValidationProgress, optional): Progress of the run; if it was
+            stopped early, the report says how far it got.
+        markdown_file (Path, optional): Also write a Markdown report here.
+        html_file (Path, optional): Also write an HTML report here.
+        json_file (Path, optional): Also write a JSON Lines report here.
+        report_format (str): ``text`` (the plaintext log) or a structured
+            format from REPORT_FORMATS: ``jsonl``, ``junit`` or ``sarif``.
+        source (Path, optional): The validated CSV, named in structured reports.
+        summary (bool): Aggregate the errors by column and check first, and
+            write one entry per group (see write_summary_report).
 
-def generate_markdown_report(errors: list[str]) -> str:
-    md = "# Validation Report\n\n"
-    if errors:
-        md += "## Errors:\n"
-        for e in errors:
-            md += f"- {e}\n"
+    Returns:
+        int: The number of errors written.
+    """
+    if summary:
+        count = write_summary_report(output_file, summarize(errors), report_format, progress,
+                                     markdown_file, html_file, source, json_file)
     else:
-        md += "✅ No errors found.\n"
-    return md
+        outputs = [(output_file, REPORT_FORMATS[report_format][1]), (markdown_file, MarkdownSink),
+                   (html_file, HtmlSink)]
+        if json_file != output_file:
+            outputs.append((json_file, JsonlSink))
+        count = write_report(outputs, errors, progress, source)
+    if count:
+        print(Fore.RED + f"❗ Found {count} error(s). See report: {output_file}")
+    else:
+        print(Fore.GREEN + f"✅ No issues found. Report saved to: {output_file}")
+    if progress is not None and progress.truncated:
+        print(Fore.YELLOW + f"⏹ {describe_truncation(progress)}")
+    return count
 
+def generate_markdown_report(errors) -> str:
+    md = io.StringIO()
+    render_report(errors, [MarkdownSink(md)])
+    return md.getvalue()
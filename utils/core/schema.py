@@ -12,10 +12,28 @@
 
 import argparse
 import csv
+import hashlib
+import heapq
 import json
+import os
+import random
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice, repeat
 from pathlib import Path
 
+from utils.core.parallel import CHUNKS_PER_WORKER, MIN_CHUNK_SIZE, split_records
+from utils.core.reader import detect_compression, is_stdio, open_lines, read_rows, uses_bare_cr
+
+# int() and float() need at least one decimal digit; float() also takes these words.
+_has_digit = re.compile(r"\d").search
+_FLOAT_WORDS = frozenset({"inf", "infinity", "nan"})
+
 def infer_type(value):
+    if not _has_digit(value) and value.strip().lstrip("+-").lower() not in _FLOAT_WORDS:
+        return "email" if "@" in value else "string"
     try:
         int(value)
         return "int"
@@ -30,25 +48,424 @@ def infer_type(value):
         return "email"
     return "string"
 
-def infer_schema(csv_path: Path, sample_size=10):
-    with open(csv_path, newline='') as f:
-        reader = csv.DictReader(f)
-        headers = reader.fieldnames  # Moved up before reading rows
+_NUMERIC_TYPES = frozenset({"int", "float"})
+
+DISTINCT_SKETCH_SIZE = 256
+
+def _hash64(value: str) -> int:
+    # A stable hash: the builtin hash() differs between worker processes.
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+class DistinctSketch:
+    """
+    Estimates the number of distinct values in bounded memory.
+
+    A k-minimum-values sketch: keeps the ``k`` smallest 64-bit value hashes.
+    Counts are exact up to ``k`` distinct values; beyond that they are
+    estimated from the k-th smallest hash (about 6% error for k=256). Two
+    sketches merge into the sketch of the combined data.
+    """
+
+    def __init__(self, k: int = DISTINCT_SKETCH_SIZE, hashes=()):
+        self.k = k
+        self._heap = []  # negated hashes, so the largest kept hash is on top
+        self._hashes = set()
+        for h in hashes:
+            self._add_hash(h)
+
+    def add(self, value: str) -> None:
+        h = _hash64(value)
+        if len(self._heap) >= self.k and h >= -self._heap[0]:
+            return
+        self._add_hash(h)
+
+    def _add_hash(self, h: int) -> None:
+        if len(self._heap) >= self.k:
+            if h >= -self._heap[0] or h in self._hashes:
+                return
+            self._hashes.discard(-heapq.heapreplace(self._heap, -h))
+        elif h in self._hashes:
+            return
+        else:
+            heapq.heappush(self._heap, -h)
+        self._hashes.add(h)
+
+    def merge(self, other: "DistinctSketch") -> None:
+        for h in other._hashes:
+            self._add_hash(h)
+
+    def estimate(self) -> int:
+        if len(self._heap) < self.k:
+            return len(self._heap)
+        return round((self.k - 1) * 2**64 / (-self._heap[0] + 1))
+
+    def hashes(self) -> list[int]:
+        return sorted(self._hashes)
+
+ENUM_LIMIT = 20
+ENUM_MAX_LENGTH = 64
+SHAPE_LIMIT = 8
+
+_SHAPE_CLASSES = str.maketrans(
+    "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    "9" * 10 + "a" * 26 + "A" * 26,
+)
+_SHAPE_PATTERNS = {"9": "[0-9]", "a": "[a-z]", "A": "[A-Z]"}
+_shape_runs = re.compile(r"(.)\1*", re.DOTALL).finditer
+
+def value_shape(value: str) -> tuple[str, tuple[int, ...]]:
+    """
+    Describes a value by its runs of character classes: ``"AB-123"`` has the
+    classes ``"A-9"`` (upper-case letters, a dash, digits) with run lengths
+    ``(2, 1, 3)``. Only ASCII letters and digits are grouped into classes.
+    """
+    return _class_runs(value.translate(_SHAPE_CLASSES))
+
+@lru_cache(maxsize=4096)
+def _class_runs(translated: str) -> tuple[str, tuple[int, ...]]:
+    # Values of one shape mostly translate to a handful of strings, so this is cached.
+    runs = [(m.group(1), m.end() - m.start()) for m in _shape_runs(translated)]
+    return "".join(c for c, _ in runs), tuple(n for _, n in runs)
+
+def _merge_bounded(counts: dict | None, other: dict | None, limit: int, combine) -> dict | None:
+    # Bounded tallies give up (become None) once they would track more than ``limit`` keys.
+    if counts is None or other is None:
+        return None
+    for key, value in other.items():
+        if key in counts:
+            counts[key] = combine(counts[key], value)
+        elif len(counts) >= limit:
+            return None
+        else:
+            counts[key] = value
+    return counts
+
+def _merge_lengths(ours: list[list[int]], theirs: list[list[int]]) -> list[list[int]]:
+    return [[min(a[0], b[0]), max(a[1], b[1])] for a, b in zip(ours, theirs)]
+
+def _shape_regex(classes: str, lengths: list[list[int]], optional: bool = False) -> str:
+    parts = []
+    for c, (low, high) in zip(classes, lengths):
+        part = _SHAPE_PATTERNS.get(c, re.escape(c))
+        if low == high:
+            quantifier = "" if low == 1 else f"{{{low}}}"
+        else:
+            quantifier = f"{{{low},{high}}}"
+        parts.append(part + quantifier)
+    pattern = "".join(parts)
+    return f"^(?:{pattern})?$" if optional else f"^{pattern}$"
+
+class ColumnProfile:
+    """
+    Running summary of one column, updated one value at a time.
+
+    Keeps a counter per inferred type, the number of empty values, the numeric
+    range, the longest value and a distinct-count sketch, plus an optional
+    reservoir of up to ``examples`` values drawn uniformly from the whole
+    column. Exact value counts are kept for up to ENUM_LIMIT distinct values
+    and value shapes (see value_shape) for up to SHAPE_LIMIT class patterns;
+    past that they are dropped. Memory does not grow with the number of
+    rows, and profiles of different parts of a file can be merged.
+    """
+
+    def __init__(self, name: str, examples: int = 0, rng: random.Random | None = None):
+        self.name = name
+        self.type_counts = {}
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.max_length = 0
+        self.distinct = DistinctSketch()
+        self.values = {}
+        self.shapes = {}
+        self.examples = examples
+        self.samples = []
+        self._seen = 0
+        self._rng = rng or random.Random(0)
+
+    def add(self, value: str) -> None:
+        if not value.strip():
+            self.nulls += 1
+            return
+        value_type = infer_type(value)
+        self.type_counts[value_type] = self.type_counts.get(value_type, 0) + 1
+        if value_type == "int" or value_type == "float":
+            number = int(value) if value_type == "int" else float(value)
+            if number == number:  # skip NaN
+                if self.min is None or number < self.min:
+                    self.min = number
+                if self.max is None or number > self.max:
+                    self.max = number
+        if len(value) > self.max_length:
+            self.max_length = len(value)
+        self.distinct.add(value)
+        if self.values is not None:
+            self._count_value(value)
+        if self.shapes is not None:
+            self._count_shape(value)
+        self._seen += 1
+        if self.examples:
+            self._sample(value)
+
+    def _count_value(self, value: str) -> None:
+        if value in self.values:
+            self.values[value] += 1
+        elif len(self.values) < ENUM_LIMIT and len(value) <= ENUM_MAX_LENGTH:
+            self.values[value] = 1
+        else:
+            self.values = None
+
+    def _count_shape(self, value: str) -> None:
+        classes, lengths = value_shape(value)
+        known = self.shapes.get(classes)
+        if known is not None:
+            known[0] += 1
+            for bounds, n in zip(known[1], lengths):
+                if n < bounds[0]:
+                    bounds[0] = n
+                elif n > bounds[1]:
+                    bounds[1] = n
+        elif len(self.shapes) < SHAPE_LIMIT:
+            self.shapes[classes] = [1, [[n, n] for n in lengths]]
+        else:
+            self.shapes = None
+
+    def _sample(self, value: str) -> None:
+        if len(self.samples) < self.examples:
+            self.samples.append(value)
+        else:
+            slot = self._rng.randrange(self._seen)
+            if slot < self.examples:
+                self.samples[slot] = value
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """Adds ``other``, a profile of the same column over later rows, to this one."""
+        for value_type, count in other.type_counts.items():
+            self.type_counts[value_type] = self.type_counts.get(value_type, 0) + count
+        self.nulls += other.nulls
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        self.max_length = max(self.max_length, other.max_length)
+        self.distinct.merge(other.distinct)
+        self.values = _merge_bounded(self.values, other.values, ENUM_LIMIT, int.__add__)
+        self.shapes = _merge_bounded(
+            self.shapes, other.shapes, SHAPE_LIMIT,
+            lambda a, b: [a[0] + b[0], _merge_lengths(a[1], b[1])],
+        )
+        self.samples = self._merge_samples(other)
+        self._seen += other._seen
+
+    def _merge_samples(self, other: "ColumnProfile") -> list[str]:
+        # Each draw picks a reservoir in proportion to the values it still stands for.
+        ours, theirs = list(self.samples), list(other.samples)
+        ours_left, theirs_left = self._seen, other._seen
+        merged = []
+        while len(merged) < self.examples and (ours or theirs):
+            if theirs and (not ours or self._rng.randrange(ours_left + theirs_left) >= ours_left):
+                merged.append(theirs.pop(self._rng.randrange(len(theirs))))
+                theirs_left -= 1
+            else:
+                merged.append(ours.pop(self._rng.randrange(len(ours))))
+                ours_left -= 1
+        return merged
+
+    @property
+    def type(self) -> str:
+        """
+        The narrowest type that holds every value seen: int, widened to float
+        if there are floats, email if every value is an address, and string
+        once numbers and text mix. Empty columns are strings.
+        """
+        seen = set(self.type_counts)
+        if not seen or not seen <= _NUMERIC_TYPES and seen != {"email"}:
+            return "string"
+        if seen == {"int"}:
+            return "int"
+        return "float" if seen <= _NUMERIC_TYPES else "email"
+
+    @property
+    def majority_type(self) -> str:
+        """The most common type; ties go to the type seen first, empty columns are strings."""
+        if not self.type_counts:
+            return "string"
+        return max(self.type_counts, key=self.type_counts.get)
+
+    def constraints(self, column_type: str | None = None) -> dict:
+        """
+        Suggests the ``constraints`` block for this column, typed as
+        ``column_type`` (its ``type`` by default).
+
+        Numeric columns get ``min``/``max`` from the observed extremes. Text
+        columns get an ``enum`` if they hold few distinct values that repeat,
+        or else a ``regex`` if every value has the same shape. Both also
+        accept an empty cell if the column had any.
+        """
+        column_type = column_type or self.type
+        if column_type in ("int", "float"):
+            constraints = {}
+            if self.min is not None:
+                constraints["min"] = self.min
+                constraints["max"] = self.max
+            return constraints
+
+        filled = sum(self.type_counts.values())
+        if self.values and len(self.values) * 2 <= filled:
+            return {"enum": sorted(self.values) + ([""] if self.nulls else [])}
+        if self.shapes and len(self.shapes) == 1:
+            (classes, (_, lengths)), = self.shapes.items()
+            return {"regex": _shape_regex(classes, lengths, optional=bool(self.nulls))}
+        return {}
+
+    def to_schema(self, constraints: bool = False, majority: bool = False) -> dict:
+        """The column's schema entry; ``majority`` types it by majority_type instead of type."""
+        column_type = self.majority_type if majority else self.type
+        column = {"name": self.name, "type": column_type}
+        if constraints:
+            inferred = self.constraints(column_type)
+            if inferred:
+                column["constraints"] = inferred
+        if self.examples:
+            column["examples"] = self.samples
+        return column
+
+    def to_dict(self) -> dict:
+        """A JSON-serializable summary; ColumnProfile.from_dict restores a mergeable profile."""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "type_counts": self.type_counts,
+            "nulls": self.nulls,
+            "min": self.min,
+            "max": self.max,
+            "max_length": self.max_length,
+            "distinct": self.distinct.estimate(),
+            "distinct_sketch": self.distinct.hashes(),
+            "values": self.values,
+            "shapes": self.shapes,
+            "seen": self._seen,
+            "examples": self.samples,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, examples: int | None = None) -> "ColumnProfile":
+        profile = cls(data["name"], len(data["examples"]) if examples is None else examples)
+        profile.type_counts = dict(data["type_counts"])
+        profile.nulls = data["nulls"]
+        profile.min = data["min"]
+        profile.max = data["max"]
+        profile.max_length = data["max_length"]
+        profile.distinct = DistinctSketch(hashes=data["distinct_sketch"])
+        profile.values = data["values"]
+        profile.shapes = data["shapes"]
+        profile._seen = data["seen"]
+        profile.samples = list(data["examples"])
+        return profile
+
+def _profile_rows(headers: list[str], rows, examples: int, rng: random.Random) -> list[ColumnProfile]:
+    profiles = [ColumnProfile(header, examples, rng) for header in headers]
+    width = len(headers)
+    # Like csv.DictReader, a duplicated header name takes the last column's values.
+    positions = {header: i for i, header in enumerate(headers)}
+    bound = [(positions[header], profile.add) for header, profile in zip(headers, profiles)]
+
+    for row in rows:
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        for index, add in bound:
+            add(row[index])
+    return profiles
+
+def profile_csv(csv_path: Path, sample_size: int | None = None, examples: int = 0) -> list[ColumnProfile]:
+    """
+    Streams the CSV once and returns a ColumnProfile per header column.
+
+    Reads the first ``sample_size`` data rows, or every row if it is None, in
+    constant memory. Cells missing from short rows count as empty.
+    """
+    with open_lines(csv_path) as lines:
+        headers, rows = read_rows(lines)
         if not headers:
             raise ValueError("CSV has no headers.")
-        sample_rows = [row for _, row in zip(range(sample_size), reader)]
+        if sample_size is not None:
+            rows = islice(rows, sample_size)
+        return _profile_rows(headers, rows, examples, random.Random(0))
 
-    schema = []
-    for header in headers:
-        sample_values = [row[header] for row in sample_rows if row[header].strip()]
-        if not sample_values:
-            col_type = "string"
-        else:
-            types = [infer_type(v) for v in sample_values]
-            col_type = max(set(types), key=types.count)
-        schema.append({"name": header, "type": col_type})
+def _profile_range(csv_path: Path, start: int, end: int, headers: list[str], examples: int, seed: int):
+    with open_lines(csv_path, start, end) as lines:
+        return _profile_rows(headers, filter(None, csv.reader(lines)), examples, random.Random(seed))
+
+def profile_csv_parallel(
+    csv_path: Path,
+    workers: int,
+    examples: int = 0,
+    min_chunk_size: int = MIN_CHUNK_SIZE,
+) -> list[ColumnProfile]:
+    """
+    Like profile_csv over the whole file, but profiles byte-range chunks in a
+    pool of ``workers`` processes and merges the chunk profiles in file order.
+
+    Type counts, null counts, ranges, lengths and distinct sketches match a
+    sequential run; example values are an equally uniform but different
+    sample. Small and compressed files, files with ``\r``-only line endings
+    and standard input are profiled in this process.
+    """
+    if is_stdio(csv_path):
+        return profile_csv(csv_path, None, examples)
+
+    with open_lines(csv_path) as lines:
+        headers = next(csv.reader(lines), None)
+        data_start = lines.bytes_read
+    if not headers:
+        raise ValueError("CSV has no headers.")
+    size = os.path.getsize(csv_path)
+    parts = min(workers * CHUNKS_PER_WORKER, (size - data_start) // max(min_chunk_size, 1))
+
+    if workers <= 1 or parts < 2 or detect_compression(csv_path) or uses_bare_cr(csv_path):
+        return profile_csv(csv_path, None, examples)
+
+    with ProcessPoolExecutor(workers) as executor:
+        ranges = split_records(csv_path, data_start, size, parts, executor)
+        chunks = executor.map(
+            _profile_range,
+            repeat(csv_path),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+            repeat(headers),
+            repeat(examples),
+            range(len(ranges)),
+        )
+        profiles = next(chunks)
+        for chunk in chunks:
+            for profile, part in zip(profiles, chunk):
+                profile.merge(part)
+    return profiles
+
+def infer_schema(
+    csv_path: Path,
+    sample_size: int | None = 10,
+    examples: int = 0,
+    workers: int = 1,
+    constraints: bool = False,
+    majority: bool = False,
+):
+    """
+    Infers ``{"name", "type"}`` for each column from the first ``sample_size``
+    rows, or from the whole file if ``sample_size`` is None. Each column gets
+    the narrowest type that holds all of its values (ColumnProfile.type), or
+    with ``majority`` its most common type. With ``examples``, each column
+    also lists up to that many example values. ``workers`` > 1 scans the
+    whole file in parallel, see profile_csv_parallel. With ``constraints``,
+    columns also get the constraints suggested by ColumnProfile.constraints.
+    """
+    profiles = _profiles(csv_path, sample_size, examples, workers)
+    return [profile.to_schema(constraints, majority) for profile in profiles]
 
-    return schema
+def _profiles(csv_path: Path, sample_size: int | None, examples: int, workers: int) -> list[ColumnProfile]:
+    if workers > 1:
+        return profile_csv_parallel(csv_path, workers, examples)
+    return profile_csv(csv_path, sample_size, examples)
 
 def cli():
     parser = argparse.ArgumentParser(
@@ -57,12 +474,12 @@ def cli():
     parser.add_argument(
         "csv_file",
         type=Path,
-        help="Path to the CSV file to infer schema from."
+        help="Path to the CSV file to infer schema from, or - for standard input."
     )
     parser.add_argument(
         "output_file",
         type=Path,
-        help="Path to save the generated schema JSON."
+        help="Path to save the generated schema JSON, or - for standard output."
     )
     parser.add_argument(
         "--rows",
@@ -70,19 +487,73 @@ def cli():
         default=10,
         help="Number of rows to sample (default: 10)."
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Scan every row instead of a sample (one streaming pass, constant memory)."
+    )
+    parser.add_argument(
+        "--examples",
+        type=int,
+        default=0,
+        metavar="K",
+        help="Add up to K randomly sampled example values to each column."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Scan the whole file in N parallel processes (implies --full)."
+    )
+    parser.add_argument(
+        "--constraints",
+        action="store_true",
+        help="Also infer min/max, enum and regex constraints from the data."
+    )
+    parser.add_argument(
+        "--majority-type",
+        action="store_true",
+        help="Type each column by its most common value type instead of one that fits every value."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Also save per-column summaries (types, nulls, range, distinct count) next to the schema."
+    )
     args = parser.parse_args()
 
-    if not args.csv_file.exists():
-        print(f"❌ CSV file not found: {args.csv_file}")
+    # With the schema going to stdout, keep status messages out of the pipe.
+    log = sys.stderr if is_stdio(args.output_file) else sys.stdout
+
+    if not is_stdio(args.csv_file) and not args.csv_file.exists():
+        print(f"❌ CSV file not found: {args.csv_file}", file=log)
+        return
+    if args.profile and is_stdio(args.output_file):
+        print("❌ --profile needs an output file to save the profiles next to", file=log)
         return
 
     try:
-        schema = infer_schema(args.csv_file, args.rows)
+        sample_size = None if args.full or args.workers > 1 else args.rows
+        profiles = _profiles(args.csv_file, sample_size, args.examples, args.workers)
     except Exception as e:
-        print(f"❌ Failed to infer schema: {e}")
+        print(f"❌ Failed to infer schema: {e}", file=log)
         return
 
-    with open(args.output_file, "w") as f:
-        json.dump(schema, f, indent=4)
+    schema = [profile.to_schema(args.constraints, args.majority_type) for profile in profiles]
+    if is_stdio(args.output_file):
+        json.dump(schema, sys.stdout, indent=4)
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+    else:
+        with open(args.output_file, "w") as f:
+            json.dump(schema, f, indent=4)
+
+    destination = "stdout" if is_stdio(args.output_file) else args.output_file
+    print(f"🧬 Schema generated and saved to: {destination}", file=log)
 
-    print(f"🧬 Schema generated and saved to: {args.output_file}")
\ No newline at end of file
+    if args.profile:
+        profile_file = args.output_file.with_suffix(".profile.json")
+        with open(profile_file, "w") as f:
+            json.dump([profile.to_dict() for profile in profiles], f, indent=4)
+        print(f"📊 Column profiles saved to: {profile_file}", file=log)
@@ -0,0 +1,344 @@
+# MIT License
+# Copyright (c) 2025 Vlad
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND...
+
+import csv
+import http.client
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from utils.core.cache import TESTFORGE_VERSION
+from utils.core.reader import BLOCK_SIZE, CountingLineReader, open_stream
+from utils.core.summary import summarize
+from utils.core.validator import ValidationProgress, compile_schema, issue_iterator, load_schema
+
+
+class SchemaRegistry:
+    """
+    Compiled schemas by name, kept warm between requests.
+
+    Each schema is compiled once and compiled again only when its file
+    changes on disk. ``foreign_key`` files are resolved next to the schema.
+    Safe to share between the threads of a server.
+    """
+
+    def __init__(self, schemas: dict[str, str | Path] | None = None):
+        self.paths = {name: Path(path) for name, path in (schemas or {}).items()}
+        self._plans = {}
+        self._lock = threading.Lock()
+
+    def add_directory(self, directory: str | Path) -> None:
+        """Registers every ``*.json`` file in ``directory`` under its stem."""
+        for path in sorted(Path(directory).glob("*.json")):
+            self.paths[path.stem] = path
+
+    def get(self, name: str):
+        """
+        The ValidationPlan of schema ``name``.
+
+        Raises:
+            KeyError: If no schema of that name is registered.
+            ValueError: If the schema does not load or compile.
+        """
+        path = self.paths[name]
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError as e:
+            raise ValueError(f"Schema '{name}' cannot be read: {e}") from None
+        with self._lock:
+            cached = self._plans.get(name)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            try:
+                plan = compile_schema(load_schema(path))
+                plan.load_references(path.parent)
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"Schema '{name}' is invalid: {e}") from None
+            self._plans[name] = mtime, plan
+            return plan
+
+    def warm(self) -> dict[str, str]:
+        """Compiles every registered schema; returns the errors of those that do not compile, by name."""
+        errors = {}
+        for name in self.paths:
+            try:
+                self.get(name)
+            except ValueError as e:
+                errors[name] = str(e)
+        return errors
+
+    def default_name(self) -> str | None:
+        """The schema used when a request names none: the only one registered, if so."""
+        return next(iter(self.paths)) if len(self.paths) == 1 else None
+
+    def describe(self) -> dict:
+        return {name: str(path) for name, path in self.paths.items()}
+
+
+class _LengthReader(io.RawIOBase):
+    """The next ``length`` bytes of a stream, then end of file."""
+
+    def __init__(self, f, length: int):
+        self._f = f
+        self._remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._remaining <= 0:
+            return 0
+        n = self._f.readinto(memoryview(b)[:min(len(b), self._remaining)]) or 0
+        self._remaining -= n
+        return n
+
+
+class _ChunkedReader(io.RawIOBase):
+    """The decoded body of a request sent with ``Transfer-Encoding: chunked``."""
+
+    def __init__(self, f):
+        self._f = f
+        self._remaining = 0
+        self._done = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while self._remaining == 0:
+            if self._done:
+                return 0
+            size = int(self._f.readline().split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                # Skip the trailer section up to the final blank line.
+                while self._f.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+                self._done = True
+                return 0
+            self._remaining = size
+        n = self._f.readinto(memoryview(b)[:min(len(b), self._remaining)]) or 0
+        self._remaining -= n
+        if n == 0:
+            self._done = True
+        elif self._remaining == 0:
+            self._f.readline()
+        return n
+
+
+class ValidationRequestHandler(BaseHTTPRequestHandler):
+    """
+    The HTTP API of ``testforge serve``:
+
+    ``GET /health``
+        Server status and version.
+    ``GET /schemas``
+        The registered schemas, by name.
+    ``POST /validate?schema=NAME[&max_errors=N][&summary=1]``
+        Validates the CSV in the request body (plain, or gzip/bz2/xz
+        compressed) against schema NAME, which may be left out if only one
+        schema is registered, while the body is being received, and
+        returns the result as JSON: ``valid``, ``error_count``, ``rows``,
+        ``bytes``, ``truncated`` and either the ``issues`` or, with
+        ``summary``, the issue ``groups`` (see summary.IssueGroup.to_dict).
+        Bodies can be sent with a Content-Length or chunked.
+    """
+
+    server_version = f"testforge/{TESTFORGE_VERSION}"
+
+    def address_string(self) -> str:
+        # Unix socket clients have no address.
+        return self.client_address[0] if self.client_address else "unix"
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok", "version": TESTFORGE_VERSION, "pid": os.getpid()})
+        elif path == "/schemas":
+            self._send_json(200, {"schemas": self.server.registry.describe()})
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != "/validate":
+            self._send_json(404, {"error": f"Unknown endpoint: {url.path}"})
+            return
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        body = self._body()
+        if body is None:
+            self._send_json(411, {"error": "Send the CSV with a Content-Length or chunked."})
+            return
+        name = query.get("schema") or self.server.registry.default_name()
+        if name is None:
+            self._drain(body)
+            self._send_json(400, {"error": "Name the schema to validate against with ?schema=NAME."})
+            return
+        try:
+            max_errors = int(query["max_errors"]) if "max_errors" in query else None
+            if max_errors is not None and max_errors < 1:
+                raise ValueError("max_errors must be at least 1")
+            plan = self.server.registry.get(name)
+        except KeyError:
+            self._drain(body)
+            self._send_json(404, {"error": f"Unknown schema: {name}"})
+            return
+        except ValueError as e:
+            self._drain(body)
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            result = validate_body(body, plan, max_errors, query.get("summary") in ("1", "true"))
+        except (UnicodeDecodeError, csv.Error, OSError, EOFError) as e:
+            self._send_json(400, {"error": f"Cannot read the request body: {e}"})
+            return
+        except Exception as e:
+            self.log_error("validation failed: %r", e)
+            self._send_json(500, {"error": f"Validation failed: {e}"})
+            return
+        self._drain(body)
+        result["schema"] = name
+        self._send_json(200, result)
+
+    def _body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            raw = _ChunkedReader(self.rfile)
+        elif self.headers.get("Content-Length") is not None:
+            raw = _LengthReader(self.rfile, int(self.headers["Content-Length"]))
+        else:
+            return None
+        return io.BufferedReader(raw, BLOCK_SIZE)
+
+    def _drain(self, body):
+        # Read what is left of the request so the client sees the response.
+        try:
+            while body.read(BLOCK_SIZE):
+                pass
+        except (OSError, EOFError):
+            pass
+
+
+def validate_body(body, plan, max_errors: int | None = None, summary: bool = False) -> dict:
+    """
+    Validates the CSV read from the binary stream ``body`` against ``plan``
+    and returns the result as a JSON-ready dict.
+    """
+    progress = ValidationProgress()
+    lines = CountingLineReader(open_stream(body))
+    issues = issue_iterator(plan)(lines, max_errors, progress)
+    result = {}
+    if summary:
+        groups = summarize(issues)
+        count = groups.total
+        result["groups"] = [group.to_dict() for group in groups]
+    else:
+        result["issues"] = [dict(issue._asdict(), message=issue.message) for issue in issues]
+        count = len(result["issues"])
+    return {
+        "valid": count == 0,
+        "error_count": count,
+        "rows": progress.rows,
+        "bytes": progress.bytes_read,
+        "truncated": progress.truncated,
+        **result,
+    }
+
+
+class ValidationHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ValidationUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(registry: SchemaRegistry, host: str = "127.0.0.1", port: int = 8765, socket_path=None):
+    """
+    Binds a threading server for ValidationRequestHandler, to ``socket_path``
+    (a Unix socket, replacing a stale one) if given, else to ``host``:``port``.
+    """
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ValidationUnixServer(str(socket_path), ValidationRequestHandler)
+    else:
+        server = ValidationHTTPServer((host, port), ValidationRequestHandler)
+    server.registry = registry
+    return server
+
+
+def serve(server, workers: int = 1) -> None:
+    """
+    Serves requests until interrupted or terminated, in ``workers``
+    processes that all accept connections on the server's socket. Every
+    process serves its connections on threads; the schemas compiled before
+    forking are shared with the workers.
+    """
+    children = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+        server.server_close()
+        if isinstance(server, ValidationUnixServer) and os.path.exists(server.server_address):
+            os.unlink(server.server_address)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """An http.client connection to a server listening on a Unix socket."""
+
+    def __init__(self, socket_path: str | Path, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = str(socket_path)
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
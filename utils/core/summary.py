@@ -0,0 +1,140 @@
+# MIT License
+# Copyright (c) 2025 Vlad
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND...
+
+import random
+
+from utils.core.validator import ValidationIssue
+
+# Offending values kept per group, drawn uniformly from all of its rows.
+SAMPLE_SIZE = 5
+# Distinct values counted per group; later values are only counted as "other".
+HISTOGRAM_LIMIT = 10
+
+
+class IssueGroup:
+    """
+    All issues of one kind in one column: how many there were, the first and
+    last row they occurred in, a sample of offending values and a histogram of
+    the most common ones. Memory use is bounded by SAMPLE_SIZE and
+    HISTOGRAM_LIMIT, whatever the number of rows.
+    """
+
+    def __init__(self, first: ValidationIssue, rng: random.Random):
+        self.column = first.column
+        self.code = first.code
+        self.first = first
+        self.count = 0
+        self.first_row = first.row
+        self.last_row = first.row
+        self.samples = []
+        self.histogram = {}
+        self.other = 0
+        self._rng = rng
+
+    def add(self, issue: ValidationIssue):
+        self.count += 1
+        if issue.row is not None:
+            self.last_row = issue.row
+        if issue.value is None:
+            return
+
+        # Reservoir sampling keeps each (row, value) with equal probability.
+        if len(self.samples) < SAMPLE_SIZE:
+            self.samples.append((issue.row, issue.value))
+        else:
+            i = self._rng.randrange(self.count)
+            if i < SAMPLE_SIZE:
+                self.samples[i] = (issue.row, issue.value)
+
+        if issue.value in self.histogram:
+            self.histogram[issue.value] += 1
+        elif len(self.histogram) < HISTOGRAM_LIMIT:
+            self.histogram[issue.value] = 1
+        else:
+            self.other += 1
+
+    def top_values(self) -> list[tuple[str, int]]:
+        """The histogram as (value, count) pairs, most common first."""
+        return sorted(self.histogram.items(), key=lambda item: -item[1])
+
+    def _recurrence(self) -> str:
+        if self.count == 1:
+            return ""
+        if self.first_row is None:
+            return f" (and {self.count - 1} more)"
+        return f" (and {self.count - 1} more, through row {self.last_row})"
+
+    @property
+    def message(self) -> str:
+        """A one-line description: the first issue, then how often it recurred."""
+        return self.first.message + self._recurrence()
+
+    def as_issue(self) -> ValidationIssue:
+        """The group as a ValidationIssue at its first row, for the issue-based report sinks."""
+        first = self.first
+        return first._replace(detail=first.detail + self._recurrence())
+
+    def to_dict(self) -> dict:
+        return {
+            "column": self.column,
+            "code": self.code,
+            "count": self.count,
+            "first_row": self.first_row,
+            "last_row": self.last_row,
+            "message": self.first.message,
+            "samples": [{"row": row, "value": value} for row, value in self.samples],
+            "histogram": dict(self.top_values()),
+            "other": self.other,
+        }
+
+
+class IssueSummary:
+    """
+    ValidationIssues aggregated by (column, code), in order of first occurrence.
+
+    ``total`` counts every issue added; ``groups`` holds one IssueGroup per
+    distinct kind, so a report written from the summary grows with the number
+    of kinds of problems rather than with the number of bad rows.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.groups = {}
+        self.total = 0
+        self._rng = random.Random(seed)
+
+    def add(self, issue: ValidationIssue):
+        key = (issue.column, issue.code)
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = IssueGroup(issue, self._rng)
+        group.add(issue)
+        self.total += 1
+
+    def __iter__(self):
+        return iter(self.groups.values())
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+
+def summarize(issues, seed: int = 0) -> IssueSummary:
+    """
+    Consumes ``issues`` (any iterable of ValidationIssues or error messages)
+    once and returns their IssueSummary. Plain messages are grouped under
+    code ``error`` and no column.
+    """
+    summary = IssueSummary(seed)
+    for issue in issues:
+        if not isinstance(issue, ValidationIssue):
+            issue = ValidationIssue(None, None, "error", None, str(issue))
+        summary.add(issue)
+    return summary
@@ -1,8 +1,22 @@
 import csv
+import hashlib
 import json
 import re
 from pathlib import Path
 from collections.abc import Sequence
+from typing import NamedTuple
+from functools import lru_cache, partial
+
+from utils.core.keyindex import KeyIndex, KeySet
+from utils.core.reader import is_stdio, open_lines, read_rows
+
+# Unlike the re module's own cache, this one is sized for schemas with many
+# regex columns, so patterns are not recompiled as the cache churns.
+_cached_pattern = lru_cache(maxsize=1024)(re.compile)
+
+# Column types whose values are checked as text: "str", and the "string" and
+# "email" types that schema inference emits.
+TEXT_TYPES = ("str", "string", "email")
 
 def load_schema(schema_path: str | Path) -> dict:
     with open(schema_path, "r") as f:
@@ -35,8 +49,8 @@ def parse_constraints(value: str, constraints: dict, expected_type: str, row_num
     if "max" in constraints and val > constraints["max"]:
         errors.append(f"Row {row_num}: Field '{field_name}' above max {constraints['max']}")
 
-    if "regex" in constraints and expected_type == "str":
-        if not re.match(constraints["regex"], value):
+    if "regex" in constraints and expected_type in TEXT_TYPES:
+        if not _cached_pattern(constraints["regex"]).match(value):
             errors.append(f"Row {row_num}: Field '{field_name}' does not match pattern")
 
     if "enum" in constraints and value not in constraints["enum"]:
@@ -46,50 +60,455 @@ def parse_constraints(value: str, constraints: dict, expected_type: str, row_num
 
 
 def validate_header(reader_fields: Sequence[str] | None, expected_fields: list[str]) -> list[str]:
-    errors = []
+    return [issue.message for issue in header_issues(reader_fields, expected_fields)]
+
+
+def header_issues(reader_fields: Sequence[str] | None, expected_fields: list[str]) -> list["ValidationIssue"]:
+    issues = []
 
     if reader_fields is None:
-        errors.append("Header mismatch: None vs expected headers")
+        issues.append(ValidationIssue(None, None, "header_mismatch", None, "Header mismatch: None vs expected headers"))
         for field in expected_fields:
-            errors.append(f"Missing field '{field}'")
-        return errors
+            issues.append(ValidationIssue(None, field, "missing_field", None, f"Missing field '{field}'"))
+        return issues
 
     if reader_fields != expected_fields:
-        errors.append(f"Header mismatch: {reader_fields} vs {expected_fields}")
+        issues.append(ValidationIssue(
+            None, None, "header_mismatch", None, f"Header mismatch: {reader_fields} vs {expected_fields}"
+        ))
 
         missing = [f for f in expected_fields if f not in reader_fields]
         extra = [f for f in reader_fields if f not in expected_fields]
 
         for f in missing:
-            errors.append(f"Missing field '{f}'")
+            issues.append(ValidationIssue(None, f, "missing_field", None, f"Missing field '{f}'"))
         for f in extra:
-            errors.append(f"Unexpected extra field '{f}'")
+            issues.append(ValidationIssue(None, f, "extra_field", None, f"Unexpected extra field '{f}'"))
 
-    return errors
+    return issues
 
 
-def validate_csv(csv_path: str | Path, schema_path: str | Path) -> list[str]:
-    schema = load_schema(schema_path)
-    columns = schema.get("columns")
-    errors = []
+class ValidationIssue(NamedTuple):
+    """
+    A single validation error.
+
+    ``row`` is the 1-based data row number and ``value`` the offending cell; both
+    are None for file-level issues such as header mismatches. ``code`` names the
+    failed check (``type``, ``min``, ``regex``, ``missing_field``, ...) and
+    ``detail`` describes it; ``message`` is the full line used in the text reports.
+    """
+    row: int | None
+    column: str | None
+    code: str
+    value: str | None
+    detail: str
+
+    @property
+    def message(self) -> str:
+        if self.row is None:
+            return self.detail
+        return f"Row {self.row}: Field '{self.column}' {self.detail}"
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class ValidationProgress:
+    """How far a validation run got: data rows checked and bytes consumed."""
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes_read = 0
+        self.truncated = False
+
+
+class ValidationPlan:
+    """
+    A schema compiled into per-column checkers.
+
+    Each column's type and constraint checks are resolved once, so validating a
+    row only runs the checks that the schema actually declares. Plans are not
+    tied to a file and can be reused across many CSVs.
+
+    ``unique`` and ``primary_key`` columns are checked against a KeyIndex that
+    is created afresh for each run; ``key_memory`` caps its size in bytes
+    before it spills to temporary files (None: no cap). ``foreign_key``
+    columns are checked against the KeySets in ``references``, see
+    load_references.
+    """
+
+    def __init__(self, columns: list[dict]):
+        self.columns = columns
+        self.expected_fields = [col["name"] for col in columns]
+        self.checkers = [_compile_column(col) for col in columns]
+        self.key_columns = [col["name"] for col in columns if _is_key_column(col)]
+        self.foreign_keys = {
+            col["name"]: _foreign_key(col) for col in columns if "foreign_key" in col.get("constraints", {})
+        }
+        self.key_memory = None
+        self.references = {}
+        self._schema_digest = hashlib.sha256(json.dumps(columns, sort_keys=True).encode()).hexdigest()
+        self.digest = self._schema_digest
+
+    def load_references(self, base_dir: str | Path | None = None) -> None:
+        """
+        Builds a KeySet for every ``foreign_key`` column that has none yet,
+        from the referenced column of the referenced CSV. Relative file names
+        are resolved against ``base_dir`` (the current directory if None).
+
+        Raises:
+            ValueError: If a referenced file or column does not exist.
+        """
+        loaded = dict(self.references)
+        for name, (file, column) in self.foreign_keys.items():
+            if name not in loaded:
+                loaded[name] = _load_key_set(name, Path(base_dir or ".") / file, column)
+        self.use_references(loaded)
+
+    def use_references(self, references: dict) -> None:
+        """
+        Sets the KeySets of the ``foreign_key`` columns, by column name. The
+        plan's ``digest`` then also covers their content, so cached results
+        are not replayed after a referenced file changed.
+        """
+        self.references = references
+        digests = [self._schema_digest] + [references[name].digest for name in sorted(references)]
+        self.digest = hashlib.sha256(" ".join(digests).encode()).hexdigest() if references else self._schema_digest
+
+    def run_checkers(self) -> list:
+        """
+        The column checkers for one validation run, in schema order. Key
+        columns get a checker with a new, empty KeyIndex and foreign key
+        columns one that probes their KeySet (loaded from the current
+        directory if load_references was not called); all others share the
+        plan's stateless checkers.
+        """
+        if any(name not in self.references for name in self.foreign_keys):
+            self.load_references()
+        checkers = []
+        for col, checker in zip(self.columns, self.checkers):
+            if _is_key_column(col):
+                checker = _with_key_check(col, checker, self.key_memory)
+            if col["name"] in self.foreign_keys:
+                checker = _with_foreign_key_check(col, checker, self.references[col["name"]])
+            checkers.append(checker)
+        return checkers
+
+    def check_header(self, fieldnames: Sequence[str] | None) -> list[ValidationIssue]:
+        return header_issues(fieldnames, self.expected_fields)
+
+    def row_checker(self, fieldnames: Sequence[str] | None):
+        """
+        Binds the plan to a header and returns a ``check(row, row_num)`` function
+        that returns the row's ValidationIssues.
+
+        ``row`` is a list of values as produced by ``csv.reader``; columns are
+        looked up by position. Columns missing from the header, and cells missing
+        from short rows, are checked as empty strings, like ``csv.DictReader`` does.
+        """
+        fieldnames = list(fieldnames or [])
+        width = len(fieldnames)
+        # DictReader keeps the last value for duplicated header names.
+        positions = {name: i for i, name in enumerate(fieldnames)}
+        bound = [
+            (positions.get(name, width), checker)
+            for name, checker in zip(self.expected_fields, self.run_checkers())
+        ]
+        # Missing columns point one past the header, at a cell that is always "".
+        has_missing = any(index == width for index, _ in bound)
+
+        def check(row: list[str], row_num: int) -> list[ValidationIssue]:
+            if len(row) != width:
+                row = row[:width] + [""] * (width - len(row))
+            if has_missing:
+                row = row + [""]
+            issues = []
+            for index, checker in bound:
+                checker(row[index], row_num, issues)
+            return issues
+
+        return check
+
+    def iter_issues(
+        self,
+        lines,
+        max_errors: int | None = None,
+        progress: ValidationProgress | None = None,
+        header: Sequence[str] | None = None,
+    ):
+        """
+        Validates the CSV read from ``lines`` (a CountingLineReader) and yields
+        its ValidationIssues in file order.
+
+        Stops after ``max_errors`` issues. ``progress`` is kept up to date with
+        the rows and bytes read, also when the caller stops iterating early.
+        If ``header`` is given, ``lines`` holds data rows only (one chunk of a
+        larger file) and the header is not checked again.
+        """
+        if progress is None:
+            progress = ValidationProgress()
+        remaining = max_errors
+        row_num = 0
+        stopped_at = None
+
+        def limit(issues: list[ValidationIssue]) -> list[ValidationIssue]:
+            nonlocal remaining
+            if remaining is None:
+                return issues
+            if len(issues) > remaining:
+                progress.truncated = True
+                issues = issues[:remaining]
+            remaining -= len(issues)
+            return issues
+
+        try:
+            if header is None:
+                header, rows = read_rows(lines)
+                yield from limit(self.check_header(header))
+            else:
+                rows = filter(None, csv.reader(lines))
+            if remaining == 0:
+                stopped_at = lines.bytes_read
+                progress.truncated = progress.truncated or next(rows, None) is not None
+                return
+
+            check = self.row_checker(header)
+            for row in rows:
+                row_num += 1
+                issues = check(row, row_num)
+                if issues:
+                    yield from limit(issues)
+                    if remaining == 0:
+                        stopped_at = lines.bytes_read
+                        progress.truncated = progress.truncated or next(rows, None) is not None
+                        return
+        finally:
+            progress.rows = row_num
+            progress.bytes_read = lines.bytes_read if stopped_at is None else stopped_at
+
+
+def _compile_column(col: dict):
+    field_name = col["name"]
+    expected_type = col["type"]
+    constraints = col.get("constraints", {})
+
+    # Checks on the raw value, mirroring validate_field.
+    raw_checks = []
+    if expected_type == "str":
+        raw_checks.append(("empty_string", lambda v: v.strip() == "", lambda v: "is an empty string"))
+    if expected_type == "int":
+        raw_checks.append(("type", lambda v: not v.isdigit(), lambda v: f"expected int but got '{v}'"))
 
+    # Constraint checks, mirroring parse_constraints. They receive the raw value
+    # and the converted one and only run if the conversion succeeded.
+    convert = float if expected_type in ["int", "float"] else None
+    constraint_checks = []
+    if "min" in constraints:
+        low = constraints["min"]
+        constraint_checks.append(("min", lambda v, val: val < low, f"below min {low}"))
+    if "max" in constraints:
+        high = constraints["max"]
+        constraint_checks.append(("max", lambda v, val: val > high, f"above max {high}"))
+    if "regex" in constraints and expected_type in TEXT_TYPES:
+        match = _compile_regex(field_name, constraints["regex"]).match
+        constraint_checks.append(("regex", lambda v, val: match(v) is None, "does not match pattern"))
+    if "enum" in constraints:
+        allowed = constraints["enum"]
+        try:
+            allowed_set = frozenset(allowed)
+        except TypeError:
+            allowed_set = allowed
+        constraint_checks.append(
+            ("enum", lambda v, val: v not in allowed_set, f"not in allowed values: {allowed}")
+        )
+
+    def check(value: str, row_num: int, issues: list[ValidationIssue]) -> None:
+        for code, failed, describe in raw_checks:
+            if failed(value):
+                issues.append(ValidationIssue(row_num, field_name, code, value, describe(value)))
+        if not constraint_checks:
+            return
+        if convert is None:
+            val = value
+        else:
+            try:
+                val = convert(value)
+            except ValueError:
+                return
+        for code, failed, message in constraint_checks:
+            if failed(value, val):
+                issues.append(ValidationIssue(row_num, field_name, code, value, message))
+
+    return check
+
+
+def _is_key_column(col: dict) -> bool:
+    constraints = col.get("constraints", {})
+    return bool(constraints.get("unique") or constraints.get("primary_key"))
+
+
+def _with_key_check(col: dict, checker, memory_limit: int | None = None):
+    """
+    Extends a column checker with the cross-row ``unique``/``primary_key``
+    check, backed by a new KeyIndex. Empty cells are not keys: they are
+    skipped for ``unique`` and reported for ``primary_key``.
+    """
+    field_name = col["name"]
+    primary = bool(col.get("constraints", {}).get("primary_key"))
+    code = "primary_key" if primary else "unique"
+    index = KeyIndex(memory_limit)
+
+    def check(value: str, row_num: int, issues: list[ValidationIssue]) -> None:
+        checker(value, row_num, issues)
+        if value.strip() == "":
+            if primary:
+                issues.append(ValidationIssue(row_num, field_name, code, value, "is an empty primary key"))
+            return
+        first_row = index.add(value, row_num)
+        if first_row is not None:
+            issues.append(ValidationIssue(row_num, field_name, code, value, f"is a duplicate of row {first_row}"))
+
+    return check
+
+
+def _foreign_key(col: dict) -> tuple[str, str]:
+    reference = col["constraints"]["foreign_key"]
+    if not isinstance(reference, dict) or not {"file", "column"} <= reference.keys():
+        raise ValueError(f"Field '{col['name']}' has a foreign_key without 'file' and 'column'")
+    return reference["file"], reference["column"]
+
+
+def _load_key_set(field_name: str, path: Path, column: str) -> KeySet:
+    try:
+        with open_lines(path) as lines:
+            header, rows = read_rows(lines)
+            if header is None or column not in header:
+                raise ValueError(f"Field '{field_name}' references missing column '{column}' in {path}")
+            position = header.index(column)
+            return KeySet.build(row[position] for row in rows if len(row) > position and row[position].strip())
+    except FileNotFoundError:
+        raise ValueError(f"Field '{field_name}' references a missing file: {path}") from None
+
+
+def _with_foreign_key_check(col: dict, checker, key_set: KeySet):
+    """
+    Extends a column checker with the ``foreign_key`` check: every non-empty
+    cell must be a key of ``key_set``.
+    """
+    field_name = col["name"]
+    file, column = _foreign_key(col)
+    message = f"has no match in column '{column}' of {file}"
+
+    def check(value: str, row_num: int, issues: list[ValidationIssue]) -> None:
+        checker(value, row_num, issues)
+        if value.strip() != "" and value not in key_set:
+            issues.append(ValidationIssue(row_num, field_name, "foreign_key", value, message))
+
+    return check
+
+
+def _compile_regex(field_name: str, pattern: str) -> re.Pattern:
+    try:
+        return _cached_pattern(pattern)
+    except (re.error, TypeError) as e:
+        raise ValueError(f"Field '{field_name}' has an invalid regex {pattern!r}: {e}") from e
+
+
+def compile_schema(schema: dict) -> ValidationPlan:
+    """
+    Compiles a loaded schema (a dict with a ``columns`` list) into a ValidationPlan.
+
+    Regex constraints are compiled here, so an invalid pattern is reported once
+    instead of on every row.
+
+    Raises:
+        ValueError: If the schema has no ``columns`` key or a regex does not compile.
+    """
+    columns = schema.get("columns")
     if columns is None:
-        return ["Schema is missing 'columns' key."]
+        raise ValueError("Schema is missing 'columns' key.")
+    return ValidationPlan(columns)
+
+
+def _as_plan(schema) -> ValidationPlan:
+    if isinstance(schema, ValidationPlan):
+        return schema
+    if isinstance(schema, (str, Path)):
+        schema = load_schema(schema)
+    return compile_schema(schema)
+
+
+def reference_dir(csv_path: str | Path) -> Path | None:
+    """The directory ``foreign_key`` files are resolved against for ``csv_path``: its own."""
+    return None if is_stdio(csv_path) else Path(csv_path).parent
 
-    expected_fields = [col["name"] for col in columns]
 
-    with open(csv_path, newline='') as f:
-        reader = csv.DictReader(f)
-        errors += validate_header(reader.fieldnames, expected_fields)
+def prepare_plan(schema, csv_path: str | Path) -> ValidationPlan:
+    """
+    Compiles ``schema`` (see iter_validation_errors) and loads the KeySets of
+    its foreign keys for validating ``csv_path``.
 
-        for i, row in enumerate(reader, start=1):
-            for col in columns:
-                field = col["name"]
-                expected_type = col["type"]
-                constraints = col.get("constraints", {})
-                value = row.get(field, "") or ""
+    Raises:
+        ValueError: If the schema does not compile or a reference cannot be loaded.
+    """
+    plan = _as_plan(schema)
+    plan.load_references(reference_dir(csv_path))
+    return plan
 
-                errors += validate_field(value, expected_type, i, field)
-                errors += parse_constraints(value, constraints, expected_type, i, field)
 
-    return errors
\ No newline at end of file
+def issue_iterator(plan: ValidationPlan, engine: str = "standard"):
+    """
+    Returns the ``iter_issues(lines, max_errors, progress, header)`` function of
+    the given engine: ``standard`` (row by row) or ``vectorized`` (NumPy blocks,
+    falling back to standard without NumPy).
+    """
+    if engine == "vectorized":
+        from utils.core.vectorized import iter_issues_vectorized
+        return partial(iter_issues_vectorized, plan)
+    if engine != "standard":
+        raise ValueError(f"Unknown validation engine: {engine}")
+    return plan.iter_issues
+
+
+def iter_validation_errors(
+    csv_path: str | Path,
+    schema,
+    max_errors: int | None = None,
+    progress: ValidationProgress | None = None,
+    engine: str = "standard",
+):
+    """
+    Validates a CSV file and yields its ValidationIssues one at a time, so memory
+    use does not grow with the number of errors.
+
+    ``schema`` may be a path to a schema file, a loaded schema dict or a
+    ValidationPlan. A schema that does not compile yields a single issue with
+    code ``schema``. See ValidationPlan.iter_issues for ``max_errors`` and
+    ``progress`` and issue_iterator for ``engine``. ``foreign_key`` files are
+    resolved relative to the CSV's directory.
+    """
+    try:
+        plan = prepare_plan(schema, csv_path)
+    except ValueError as e:
+        yield ValidationIssue(None, None, "schema", None, str(e))
+        return
+
+    iter_issues = issue_iterator(plan, engine)
+    with open_lines(csv_path) as lines:
+        yield from iter_issues(lines, max_errors, progress)
+
+
+def validate_csv(
+    csv_path: str | Path,
+    schema_path: str | Path,
+    max_errors: int | None = None,
+    progress: ValidationProgress | None = None,
+    engine: str = "standard",
+) -> list[str]:
+    """
+    Validates a CSV file against a schema file and returns the error messages.
+
+    A list-building wrapper around iter_validation_errors.
+    """
+    schema = load_schema(schema_path)
+    return [issue.message for issue in iter_validation_errors(csv_path, schema, max_errors, progress, engine)]
@@ -11,22 +11,125 @@
 # THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND...
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from colorama import Fore, Style
-from utils.core.validator import validate_csv
-from utils.core.report import write_validation_report
+from utils.core.cache import ValidationCache, default_cache_path
+from utils.core.reader import CSV_PATTERNS, csv_stem
+from utils.core.vectorized import vectorized_available
+from utils.core.validator import ValidationPlan, compile_schema, iter_validation_errors, load_schema
+from utils.core.report import REPORT_FORMATS, report_suffix, write_validation_report
 
-def validate_batch(csv_dir: Path, schema_file: Path, output_dir: Path):
-    csv_files = list(csv_dir.glob("*.csv"))
-    results = []
+_worker_plan = None
+_worker_engine = "standard"
+_worker_cache = None
+_worker_format = "text"
 
-    for csv_file in csv_files:
-        errors = validate_csv(csv_file, schema_file)
-        output_file = output_dir / f"{csv_file.stem}_validation.log"
-        write_validation_report(output_file, errors)
-        results.append((csv_file.name, len(errors)))
+def _compile(schema: dict, csv_dir: Path | None = None, references: dict | None = None):
+    try:
+        plan = compile_schema(schema)
+        if references is not None:
+            plan.use_references(references)
+        else:
+            plan.load_references(csv_dir)
+        return plan
+    except ValueError:
+        # iter_validation_errors reports the broken schema for every file.
+        return schema
+
+def _init_worker(
+    schema: dict, engine: str, cache_path: Path | None = None, report_format: str = "text", references: dict | None = None
+):
+    global _worker_plan, _worker_engine, _worker_cache, _worker_format
+    _worker_plan = _compile(schema, references=references)
+    _worker_engine = engine
+    _worker_format = report_format
+    if cache_path is not None and isinstance(_worker_plan, ValidationPlan):
+        _worker_cache = ValidationCache(cache_path)
+
+def _write_report(csv_file: Path, output_dir: Path, issues, report_format: str) -> int:
+    output_file = output_dir / f"{csv_stem(csv_file)}_validation{report_suffix(report_format)}"
+    return write_validation_report(output_file, issues, report_format=report_format, source=csv_file)
+
+def _validate_file(
+    csv_file: Path, plan, output_dir: Path, engine: str = "standard", cache=None, report_format: str = "text"
+) -> tuple[str, int]:
+    issues = iter_validation_errors(csv_file, plan, engine=engine)
+    if cache is not None:
+        issues = cache.record(cache.key(csv_file, plan), issues)
+    return csv_file.name, _write_report(csv_file, output_dir, issues, report_format)
+
+def _validate_file_in_worker(csv_file: Path, output_dir: Path) -> tuple[str, int]:
+    return _validate_file(csv_file, _worker_plan, output_dir, _worker_engine, _worker_cache, _worker_format)
+
+def validate_batch(
+    csv_dir: Path,
+    schema_file: Path,
+    output_dir: Path,
+    jobs: int = 1,
+    engine: str = "standard",
+    cache_path: Path | None = None,
+    report_format: str = "text",
+):
+    """
+    Validates every CSV in ``csv_dir`` (plain or .csv.gz/.csv.bz2/.csv.xz) and
+    writes one report per file to ``output_dir``, in ``report_format`` (see
+    report.REPORT_FORMATS).
 
-    return results
+    The schema is loaded and compiled once (once per worker process with
+    ``jobs`` > 1). In parallel mode the largest files are scheduled first so a
+    big file picked up last does not hold up the whole batch. Results are
+    returned in the order the files were found, as ``(file name, error count)``.
+    ``engine`` selects the validation engine, see validator.issue_iterator.
+
+    With a ``cache_path``, files whose content and schema are unchanged since
+    an earlier run get their cached report replayed instead of being
+    validated again, see cache.ValidationCache.
+
+    ``foreign_key`` files are resolved in ``csv_dir`` and are not validated
+    against the schema themselves. Their KeySets are built once, here, and
+    shared with the worker processes, which map the same files instead of
+    each loading the referenced CSVs again.
+    """
+    schema = load_schema(schema_file)
+    plan = _compile(schema, csv_dir)
+    referenced = set()
+    if isinstance(plan, ValidationPlan):
+        referenced = {(csv_dir / file).resolve() for file, _ in plan.foreign_keys.values()}
+    csv_files = [
+        csv_file for pattern in CSV_PATTERNS for csv_file in csv_dir.glob(pattern)
+        if csv_file.resolve() not in referenced
+    ]
+
+    cache = None
+    if cache_path is not None and isinstance(plan, ValidationPlan):
+        cache = ValidationCache(cache_path)
+
+    results = {}
+    pending = []
+    try:
+        for csv_file in csv_files:
+            cached = cache.get(cache.key(csv_file, plan)) if cache is not None else None
+            if cached is None:
+                pending.append(csv_file)
+            else:
+                results[csv_file] = csv_file.name, _write_report(csv_file, output_dir, cached, report_format)
+
+        if jobs <= 1 or len(pending) <= 1:
+            for csv_file in pending:
+                results[csv_file] = _validate_file(csv_file, plan, output_dir, engine, cache, report_format)
+        else:
+            by_size = sorted(pending, key=lambda p: p.stat().st_size, reverse=True)
+            references = plan.references if isinstance(plan, ValidationPlan) else None
+            initargs = (schema, engine, cache_path if cache is not None else None, report_format, references)
+            with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=initargs) as executor:
+                futures = {csv_file: executor.submit(_validate_file_in_worker, csv_file, output_dir) for csv_file in by_size}
+                for csv_file, future in futures.items():
+                    results[csv_file] = future.result()
+    finally:
+        if cache is not None:
+            cache.close()
+    return [results[csv_file] for csv_file in csv_files]
 
 def cli():
     parser = argparse.ArgumentParser(
@@ -49,6 +152,30 @@ def cli():
         default=Path(__file__).resolve().parent.parent / "reports" / "validation_logs",
         help="Directory to save validation logs (default: reports/validation_logs/)."
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes validating files in parallel (default: 1)."
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["standard", "vectorized"],
+        default="standard",
+        help="Validation engine; 'vectorized' needs NumPy (default: standard)."
+    )
+    parser.add_argument(
+        "--format",
+        choices=list(REPORT_FORMATS),
+        default="text",
+        dest="report_format",
+        help="Report format: plaintext log, JSON Lines, JUnit XML or SARIF (default: text)."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Validate every file, ignoring and not updating the result cache."
+    )
 
     args = parser.parse_args()
     args.output.mkdir(parents=True, exist_ok=True)
@@ -60,8 +187,13 @@ def cli():
         print(Fore.RED + f"❌ Schema file not found: {args.schema}")
         return
 
+    if args.engine == "vectorized" and not vectorized_available():
+        print(Fore.YELLOW + "⚠️ NumPy is not installed; using the standard engine.")
+
     print(f"📂 Validating all CSVs in: {args.csv_dir}")
-    results = validate_batch(args.csv_dir, args.schema, args.output)
+    cache_path = None if args.no_cache else default_cache_path()
+    results = validate_batch(args.csv_dir, args.schema, args.output, args.jobs, args.engine, cache_path,
+                             args.report_format)
 
     print("\n🧪 Validation Summary:")
     for name, error_count in results:
@@ -12,62 +12,339 @@
 
 import argparse
 import csv
+import hashlib
+import io
+import json
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from itertools import repeat
 from pathlib import Path
 import random
 import string
 
-def generate_row(headers):
+from utils.core.reader import is_stdio
+from utils.devtools.generators.values import BlockRandom, column_generator
+
+BLOCK_ROWS = 65536
+ENCODING = "utf-8"
+
+def generate_row(headers, rng=random):
     row = []
     for header in headers:
         if "id" in header.lower():
-            row.append(str(random.randint(1000, 9999)))
+            row.append(str(rng.randint(1000, 9999)))
         elif "email" in header.lower():
-            row.append(f"user{random.randint(1, 100)}@example.com")
+            row.append(f"user{rng.randint(1, 100)}@example.com")
         elif "name" in header.lower():
-            row.append("".join(random.choices(string.ascii_letters, k=6)))
+            row.append("".join(rng.choices(string.ascii_letters, k=6)))
         elif "age" in header.lower():
-            row.append(str(random.randint(18, 99)))
+            row.append(str(rng.randint(18, 99)))
         else:
             row.append("dummy")
     return row
 
-def generate_csv(template_path: Path, output_path: Path, rows: int):
-    with open(template_path, newline='') as f:
-        reader = csv.reader(f)
-        headers = next(reader)
+def load_columns(schema_path: Path) -> list[dict]:
+    """Reads the columns of a schema file: a ``{"columns": [...]}`` schema or a schema-generator list."""
+    with open(schema_path) as f:
+        schema = json.load(f)
+    columns = schema.get("columns") if isinstance(schema, dict) else schema
+    if columns is None:
+        raise ValueError("Schema is missing 'columns' key.")
+    return columns
+
+def _block_sizes(rows: int | None, block_rows: int):
+    if rows is None:
+        yield from repeat(block_rows)
+        return
+    for done in range(0, rows, block_rows):
+        yield min(block_rows, rows - done)
+
+def generate_blocks(columns: list[dict], rows: int | None, seed: int | None = None, block_rows: int = BLOCK_ROWS):
+    """
+    Yields ``rows`` rows (endlessly if None) of values honoring the schema
+    ``columns``, in blocks of up to ``block_rows`` rows. Each block is generated
+    column by column, see values.column_generator; the same ``seed`` gives the
+    same rows.
+    """
+    generators = [column_generator(col) for col in columns]
+    rng = BlockRandom(seed)
+    for n in _block_sizes(rows, block_rows):
+        yield list(zip(*[generate(n, rng) for generate in generators]))
+
+def template_blocks(headers: list[str], rows: int | None, seed: int | None = None, block_rows: int = BLOCK_ROWS):
+    """Like generate_blocks, but with generate_row's header-based guesses."""
+    rng = random.Random(seed)
+    for n in _block_sizes(rows, block_rows):
+        yield [generate_row(headers, rng) for _ in range(n)]
+
+def _open_source(source_path: Path):
+    """
+    Returns the headers and a ``blocks(rows, seed)`` function for a .json
+    schema or a CSV template.
+    """
+    if source_path.suffix == ".json":
+        columns = load_columns(source_path)
+        for col in columns:
+            column_generator(col)  # report unusable columns before writing anything
+        return [col["name"] for col in columns], partial(generate_blocks, columns)
+    with open(source_path, newline='') as f:
+        headers = next(csv.reader(f))
+    return headers, partial(template_blocks, headers)
+
+def shard_seed(seed: int, shard: int) -> int:
+    """The seed of one shard, derived from the run's seed and the shard number only."""
+    digest = hashlib.blake2b(f"{seed}/{shard}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+def shard_rows(rows: int, shards: int) -> list[int]:
+    """Splits ``rows`` over ``shards`` as evenly as possible, larger shards first."""
+    return [rows // shards + (k < rows % shards) for k in range(shards)]
+
+def shard_path(output_path: Path, shard: int) -> Path:
+    return output_path.with_name(f"{output_path.stem}-{shard:05d}{output_path.suffix}")
+
+def parse_size(text: str) -> int:
+    """Parses a byte size such as ``500MB``, ``10GB`` or ``1.5G`` (powers of 1024) into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:I?B)?\s*", text.upper())
+    if not match:
+        raise ValueError(f"invalid size: {text!r}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMGT".index(unit or " "))
+
+def _split_budget(size: int | None, shards: int) -> list[int | None]:
+    if size is None:
+        return [None] * shards
+    return shard_rows(size, shards)
+
+def _write_blocks(out, blocks, budget: int | None = None) -> tuple[int, int]:
+    """
+    Writes row blocks to the binary file ``out``, each formatted into one
+    buffer first. Stops before the bytes written would pass ``budget``.
+    Returns the rows and bytes written.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    rows = written = 0
+    for block in blocks:
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(block)
+        data = buf.getvalue().encode(ENCODING)
+        if budget is not None and written + len(data) > budget:
+            # The block overshoots: keep the rows that still fit.
+            for row in block:
+                buf.seek(0)
+                buf.truncate()
+                writer.writerow(row)
+                line = buf.getvalue().encode(ENCODING)
+                if written + len(line) > budget:
+                    return rows, written
+                out.write(line)
+                written += len(line)
+                rows += 1
+            return rows, written
+        out.write(data)
+        written += len(data)
+        rows += len(block)
+    return rows, written
+
+def _row_limit(rows: int | None, budget: int | None) -> int | None:
+    # Every row takes at least its 2-byte line break, so a budget also caps the rows.
+    if budget is None:
+        return rows
+    return budget // 2 if rows is None else min(rows, budget // 2)
+
+def _header_bytes(headers: list[str]) -> bytes:
+    buf = io.StringIO()
+    csv.writer(buf).writerow(headers)
+    return buf.getvalue().encode(ENCODING)
+
+def _write_shard(
+    source_path: Path, output_path: Path, rows: int | None, seed: int, header: bool, budget: int | None = None
+) -> int:
+    headers, blocks = _open_source(source_path)
+    with open(output_path, "wb") as f:
+        if header:
+            head = _header_bytes(headers)
+            f.write(head)
+            if budget is not None:
+                budget -= len(head)
+        written, _ = _write_blocks(f, blocks(_row_limit(rows, budget), seed), budget)
+    return written
+
+def generate_csv(
+    template_path: Path,
+    output_path: Path,
+    rows: int | None,
+    seed: int | None = None,
+    shards: int = 1,
+    workers: int = 1,
+    concat: bool = False,
+    size: int | None = None,
+) -> list[Path]:
+    """
+    Generates ``rows`` rows from a CSV template (header-based guesses) or from
+    a .json schema (values honoring its types and constraints).
+
+    The rows are split into ``shards`` parts, each generated from its own seed
+    derived from ``seed``, so the output is identical for any number of
+    ``workers`` processes. Shards are written to numbered files next to
+    ``output_path`` (see shard_path), or joined into ``output_path`` with
+    ``concat``. An ``output_path`` of ``-`` writes to standard output, which
+    takes a single shard or ``concat``. Returns the files written.
+
+    With ``size``, generation stops before the output would grow past
+    ``size`` bytes in total (split evenly over the shards), and ``rows`` may
+    be None for no row limit.
+
+    Raises:
+        ValueError: If the schema cannot be generated from, see values.column_generator.
+    """
+    headers, blocks = _open_source(template_path)
+    if rows is None and size is None:
+        raise ValueError("Either rows or size must be given.")
+    if seed is None:
+        seed = random.randrange(2**63)
+    counts = shard_rows(rows, shards) if rows is not None else [None] * shards
+    seeds = [shard_seed(seed, k) for k in range(shards)]
 
-    with open(output_path, "w", newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(headers)
-        for _ in range(rows):
-            writer.writerow(generate_row(headers))
+    to_stdout = is_stdio(output_path)
+    if to_stdout and shards > 1 and not concat:
+        raise ValueError("Shards can only be written to standard output with concat.")
 
-    print(f"✅ Generated CSV at: {output_path} with {rows} rows.")
+    if shards == 1 or concat:
+        paths = [output_path]
+        head = _header_bytes(headers)
+        budgets = _split_budget(None if size is None else max(size - len(head), 0), shards)
+        with _open_output(output_path) as out:
+            out.write(head)
+            if workers <= 1 or shards == 1:
+                written = 0
+                for count, shard, budget in zip(counts, seeds, budgets):
+                    written += _write_blocks(out, blocks(_row_limit(count, budget), shard), budget)[0]
+            else:
+                with tempfile.TemporaryDirectory() if to_stdout else nullcontext(output_path.parent) as parts_dir:
+                    name = "stdout.csv" if to_stdout else output_path.name
+                    parts = [Path(parts_dir) / f"{name}.part{k}" for k in range(shards)]
+                    with ProcessPoolExecutor(min(workers, shards)) as executor:
+                        futures = [
+                            executor.submit(_write_shard, template_path, part, count, shard, False, budget)
+                            for part, count, shard, budget in zip(parts, counts, seeds, budgets)
+                        ]
+                        written = 0
+                        for part, future in zip(parts, futures):
+                            written += future.result()
+                            with open(part, "rb") as f:
+                                shutil.copyfileobj(f, out)
+                            part.unlink()
+    else:
+        paths = [shard_path(output_path, k) for k in range(shards)]
+        jobs = list(zip(paths, counts, seeds, _split_budget(size, shards)))
+        if workers <= 1:
+            written = sum(_write_shard(template_path, path, count, shard, True, budget)
+                          for path, count, shard, budget in jobs)
+        else:
+            with ProcessPoolExecutor(min(workers, shards)) as executor:
+                futures = [
+                    executor.submit(_write_shard, template_path, path, count, shard, True, budget)
+                    for path, count, shard, budget in jobs
+                ]
+                written = sum(future.result() for future in futures)
+
+    # With the data going to stdout, keep status messages out of the pipe.
+    log = sys.stderr if to_stdout else sys.stdout
+    if to_stdout:
+        print(f"✅ Generated CSV on stdout with {written} rows.", file=log)
+    elif len(paths) == 1:
+        print(f"✅ Generated CSV at: {output_path} with {written} rows.", file=log)
+    else:
+        print(f"✅ Generated {len(paths)} CSV shards at: {paths[0]} ... {paths[-1]} with {written} rows.", file=log)
+    return paths
+
+@contextmanager
+def _open_output(output_path: Path):
+    """Opens ``output_path`` for writing bytes; ``-`` is standard output, which is flushed but left open."""
+    if is_stdio(output_path):
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+    else:
+        with open(output_path, "wb") as f:
+            yield f
 
 def cli():
     parser = argparse.ArgumentParser(
-        description="🛠 Generate dummy CSV data from a template file with headers."
+        description="🛠 Generate dummy CSV data from a template file with headers, or from a JSON schema."
     )
     parser.add_argument(
         "template",
         type=Path,
-        help="Path to the CSV template with headers."
+        help="Path to the CSV template with headers, or to a .json schema whose types and constraints the data should honor."
     )
     parser.add_argument(
         "output",
         type=Path,
-        help="Output path for the generated CSV."
+        help="Output path for the generated CSV, or - for standard output."
     )
     parser.add_argument(
         "--rows",
         type=int,
-        default=10,
+        default=None,
         help="Number of rows to generate (default: 10)."
     )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for reproducible output."
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="Split the rows into K shards, each with its own seed derived from --seed (default: 1)."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes generating shards in parallel (default: 1)."
+    )
+    parser.add_argument(
+        "--concat",
+        action="store_true",
+        help="Join the shards into the output file instead of writing one numbered file per shard."
+    )
+    parser.add_argument(
+        "--size",
+        type=parse_size,
+        default=None,
+        help="Stop before the output passes this many bytes in total, e.g. 500MB or 10GB "
+             "(no row limit unless --rows is also given)."
+    )
     args = parser.parse_args()
+    log = sys.stderr if is_stdio(args.output) else sys.stdout
 
     if not args.template.exists():
-        print(f"❌ Template file not found: {args.template}")
+        print(f"❌ Template file not found: {args.template}", file=log)
+        return
+
+    if args.shards < 1:
+        print("❌ --shards must be at least 1", file=log)
         return
+    if is_stdio(args.output) and args.shards > 1 and not args.concat:
+        print("❌ Shards can only be written to stdout with --concat", file=log)
+        return
+
+    rows = args.rows
+    if rows is None and args.size is None:
+        rows = 10
 
-    generate_csv(args.template, args.output, args.rows)
\ No newline at end of file
+    try:
+        generate_csv(args.template, args.output, rows, args.seed, args.shards, args.workers, args.concat, args.size)
+    except ValueError as e:
+        print(f"❌ Cannot generate data from schema: {e}", file=log)
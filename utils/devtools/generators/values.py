@@ -0,0 +1,274 @@
+# MIT License
+# Copyright (c) 2025 Vlad
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND...
+
+import math
+import random
+import string
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, see the "vectorized" extra
+    np = None
+
+INT_RANGE = (0, 9999)
+FLOAT_RANGE = (0.0, 1000.0)
+WORD_LENGTH = (5, 10)
+# Unbounded repeats (*, +, {n,}) generate at most this many extra items.
+REPEAT_SPREAD = 8
+# Character ranges wider than this (e.g. large Unicode ranges) are truncated.
+MAX_RANGE_CHARS = 256
+
+PRINTABLE = string.ascii_letters + string.digits + string.punctuation + " "
+_WORD = string.ascii_letters + string.digits + "_"
+_CATEGORIES = {
+    sre_parse.CATEGORY_DIGIT: string.digits,
+    sre_parse.CATEGORY_NOT_DIGIT: "".join(c for c in PRINTABLE if c not in string.digits),
+    sre_parse.CATEGORY_SPACE: " ",
+    sre_parse.CATEGORY_NOT_SPACE: PRINTABLE.replace(" ", ""),
+    sre_parse.CATEGORY_WORD: _WORD,
+    sre_parse.CATEGORY_NOT_WORD: "".join(c for c in PRINTABLE if c not in _WORD),
+}
+_REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", None)}
+
+
+class BlockRandom:
+    """
+    Draws random numbers and strings a block at a time.
+
+    Uses a NumPy Generator when NumPy is installed and ``random.Random``
+    otherwise; both are seeded with ``seed``, but they produce different
+    sequences for the same seed.
+    """
+
+    def __init__(self, seed: int | None = None):
+        self._np = np.random.default_rng(seed) if np is not None else None
+        self._py = random.Random(seed)
+
+    def integers(self, low: int, high: int, n: int) -> list[int]:
+        """``n`` integers between ``low`` and ``high``, both inclusive."""
+        if self._np is not None and -2**63 <= low and high < 2**63:
+            return self._np.integers(low, high, size=n, endpoint=True).tolist()
+        randint = self._py.randint
+        return [randint(low, high) for _ in range(n)]
+
+    def uniform(self, low: float, high: float, n: int) -> list[float]:
+        if self._np is not None:
+            return self._np.uniform(low, high, size=n).tolist()
+        uniform = self._py.uniform
+        return [uniform(low, high) for _ in range(n)]
+
+    def strings(self, alphabet: str, lengths: list[int]) -> list[str]:
+        """One string of characters from ``alphabet`` per entry of ``lengths``."""
+        if not lengths:
+            return []
+        if self._np is None:
+            choices = self._py.choices
+            return ["".join(choices(alphabet, k=length)) for length in lengths]
+
+        width = max(lengths)
+        if width == 0:
+            return [""] * len(lengths)
+        chars = np.array(list(alphabet))[self._np.integers(0, len(alphabet), size=(len(lengths), width))]
+        if min(lengths) != width:
+            # Blank out the tail of shorter strings; the fixed-width view drops trailing blanks.
+            chars[np.arange(width) >= np.array(lengths)[:, None]] = ""
+        return chars.view(f"<U{width}").ravel().tolist()
+
+
+def _join(parts: list[list[str]], n: int) -> list[str]:
+    if not parts:
+        return [""] * n
+    if len(parts) == 1:
+        return parts[0]
+    return ["".join(items) for items in zip(*parts)]
+
+
+def _alphabet(items) -> str:
+    chars = []
+    negate = False
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            chars.append(chr(av))
+        elif op is sre_parse.RANGE:
+            low, high = av
+            chars.extend(map(chr, range(low, min(high, low + MAX_RANGE_CHARS - 1) + 1)))
+        elif op is sre_parse.CATEGORY and av in _CATEGORIES:
+            chars.append(_CATEGORIES[av])
+        else:
+            raise ValueError(f"unsupported character class item {op}")
+    alphabet = "".join(dict.fromkeys("".join(chars)))
+    if negate:
+        alphabet = "".join(c for c in PRINTABLE if c not in alphabet)
+    if not alphabet:
+        raise ValueError("character class matches nothing printable")
+    return alphabet
+
+
+def _single_char_alphabet(op, av) -> str | None:
+    if op is sre_parse.LITERAL:
+        return chr(av)
+    if op is sre_parse.NOT_LITERAL:
+        return PRINTABLE.replace(chr(av), "")
+    if op is sre_parse.ANY:
+        return PRINTABLE
+    if op is sre_parse.IN:
+        return _alphabet(av)
+    return None
+
+
+def _compile_sequence(tokens):
+    """Turns parsed regex tokens into a ``generate(n, rng)`` function returning ``n`` matching strings."""
+    pieces = [_compile_token(op, av) for op, av in tokens]
+    pieces = [piece for piece in pieces if piece is not None]
+
+    def generate(n: int, rng: BlockRandom) -> list[str]:
+        return _join([piece(n, rng) for piece in pieces], n)
+
+    return generate
+
+
+def _compile_token(op, av):
+    alphabet = _single_char_alphabet(op, av)
+    if alphabet is not None:
+        return lambda n, rng: rng.strings(alphabet, [1] * n)
+
+    if op in _REPEATS:
+        low, high, sub = av
+        high = min(high, low + REPEAT_SPREAD)
+        if len(sub) == 1:
+            (sub_op, sub_av), = sub
+            alphabet = _single_char_alphabet(sub_op, sub_av)
+            if alphabet is not None:
+                return lambda n, rng: rng.strings(alphabet, rng.integers(low, high, n))
+        generate_sub = _compile_sequence(sub)
+
+        def repeat(n: int, rng: BlockRandom) -> list[str]:
+            # Generate all repetitions for the block at once, then regroup them per value.
+            counts = rng.integers(low, high, n)
+            items = iter(generate_sub(sum(counts), rng))
+            return ["".join(next(items) for _ in range(count)) for count in counts]
+
+        return repeat
+
+    if op is sre_parse.SUBPATTERN:
+        return _compile_sequence(av[-1])
+    if op is getattr(sre_parse, "ATOMIC_GROUP", None):
+        return _compile_sequence(av)
+
+    if op is sre_parse.BRANCH:
+        branches = [_compile_sequence(branch) for branch in av[1]]
+
+        def branch(n: int, rng: BlockRandom) -> list[str]:
+            picks = rng.integers(0, len(branches) - 1, n)
+            generated = [iter(generate(picks.count(i), rng)) for i, generate in enumerate(branches)]
+            return [next(generated[pick]) for pick in picks]
+
+        return branch
+
+    if op is sre_parse.AT:
+        return None
+    raise ValueError(f"unsupported regex construct {op}")
+
+
+def regex_generator(pattern: str):
+    """
+    Compiles ``pattern`` into a ``generate(n, rng)`` function that returns ``n``
+    random strings the pattern matches.
+
+    Works from the ``sre_parse`` tree of the pattern. Anchors are ignored,
+    unbounded repeats are capped at REPEAT_SPREAD extra items, and character
+    classes are drawn from printable ASCII. Back-references and lookaround
+    assertions are not supported.
+
+    Raises:
+        ValueError: If the pattern does not compile or uses an unsupported construct.
+    """
+    try:
+        tokens = sre_parse.parse(pattern)
+    except Exception as e:
+        raise ValueError(f"invalid regex {pattern!r}: {e}") from e
+    return _compile_sequence(tokens)
+
+
+def _number_range(constraints: dict, default: tuple, integer: bool) -> tuple:
+    low, high = constraints.get("min"), constraints.get("max")
+    span = default[1] - default[0]
+    if low is None and high is None:
+        low, high = default
+    elif low is None:
+        low = min(default[0], high - span)
+    elif high is None:
+        high = max(default[1], low + span)
+    if integer:
+        low, high = math.ceil(low), math.floor(high)
+        # "int" cells must be all digits, so no minus sign.
+        if high < 0:
+            raise ValueError(f"no non-negative int up to max {constraints.get('max')}")
+        low = max(low, 0)
+    if low > high:
+        raise ValueError(f"empty range: min {constraints.get('min')} > max {constraints.get('max')}")
+    return low, high
+
+
+def column_generator(col: dict):
+    """
+    Compiles a schema column into a ``generate(n, rng)`` function returning
+    ``n`` cell values that pass the column's checks.
+
+    ``enum`` wins over everything else; ``int`` and ``float`` columns honor
+    ``min``/``max``; text columns (``str``, ``string``, ``email``, ...) honor
+    ``regex``. Unconstrained text is a random lower-case word, or an address
+    for ``email`` columns.
+
+    Raises:
+        ValueError: If the constraints cannot be satisfied or the regex is not supported.
+    """
+    name = col["name"]
+    col_type = col.get("type", "str")
+    constraints = col.get("constraints", {})
+
+    try:
+        if "enum" in constraints:
+            choices = [str(value) for value in constraints["enum"]]
+            if not choices:
+                raise ValueError("empty enum")
+            return lambda n, rng: [choices[i] for i in rng.integers(0, len(choices) - 1, n)]
+
+        if col_type == "int":
+            low, high = _number_range(constraints, INT_RANGE, integer=True)
+            return lambda n, rng: list(map(str, rng.integers(low, high, n)))
+
+        if col_type == "float":
+            low, high = _number_range(constraints, FLOAT_RANGE, integer=False)
+
+            def floats(n: int, rng: BlockRandom) -> list[str]:
+                # Rounding may step past a bound, so clamp afterwards.
+                return [repr(min(max(round(v, 2), low), high)) for v in rng.uniform(low, high, n)]
+
+            return floats
+
+        if "regex" in constraints:
+            return regex_generator(constraints["regex"])
+
+        if col_type == "email":
+            return lambda n, rng: [f"user{i}@example.com" for i in rng.integers(*INT_RANGE, n)]
+
+        return lambda n, rng: rng.strings(string.ascii_lowercase, rng.integers(*WORD_LENGTH, n))
+    except ValueError as e:
+        raise ValueError(f"Field '{name}': {e}") from e